@@ -2,7 +2,8 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from .models import (
-    Brand, WatchModel, Vendor, WatchVariant, WatchPrice, WatchTransaction, Country , ExchangeRate
+    Brand, WatchModel, Vendor, WatchVariant, WatchPrice, WatchTransaction, Country , ExchangeRate,
+    WatchTransactionDaily, LatestExchangeRate,
 )
 
 # 공용 썸네일 미리보기 (image / logo / flag 모두 대응)
@@ -98,4 +99,28 @@ class ExchangeRateAdmin(admin.ModelAdmin):
     list_filter  = ("base", "quote", "source", "date")
     search_fields = ("base", "quote", "source")
     date_hierarchy = "date"
-    ordering = ("-date", "base", "quote")
\ No newline at end of file
+    ordering = ("-date", "base", "quote")
+
+
+@admin.register(WatchTransactionDaily)
+class WatchTransactionDailyAdmin(admin.ModelAdmin):
+    list_display = ("day", "watch_variant", "country", "transaction_type", "currency", "count",
+                    "min_low", "max_high", "quote", "quote_min_low", "quote_max_high")
+    list_filter = ("transaction_type", "country", "currency")
+    search_fields = ("watch_variant__model_number",)
+    date_hierarchy = "day"
+    raw_id_fields = ("watch_variant",)
+
+
+@admin.register(LatestExchangeRate)
+class LatestExchangeRateAdmin(admin.ModelAdmin):
+    # ExchangeRate 저장/삭제 시 자동 갱신되는 사본이므로 조회 전용
+    list_display = ("quote", "base", "rate", "date", "source", "updated_at")
+    list_filter = ("quote",)
+    search_fields = ("base", "quote")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,185 @@
+# api/cache.py
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+
+_MISSING = object()
+
+
+class TwoTierCache:
+    """
+    프로세스 내 LRU(1차) + 공유 캐시 백엔드(2차, settings.CACHES["shared"]).
+
+    - 무효화: 공유 캐시의 세대(generation) 값을 새 값으로 교체. 키에 세대가 들어가므로 이전 값은 자동으로 버려지고,
+      다른 워커도 gen_check_interval 초 안에 새 세대를 보고 자기 LRU 를 비운다.
+    - 스탬피드 방지: 같은 키의 동시 미스는 프로세스 안에서는 키별 Lock, 프로세스 간에는
+      공유 캐시 add() 락으로 묶어 로더(DB 조회)를 한 번만 실행.
+    - stats(): 적중/미스 카운터.
+    """
+
+    def __init__(self, namespace: str, alias: str = "shared", ttl: int = 300,
+                 local_size: int = 256, gen_check_interval: float = 1.0,
+                 lock_timeout: float = 10.0):
+        self.namespace = namespace
+        self.alias = alias
+        self.ttl = ttl
+        self.local_size = local_size
+        self.gen_check_interval = gen_check_interval
+        self.lock_timeout = lock_timeout
+
+        self._local: OrderedDict[str, tuple[float, object, object]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: dict[str, list] = {}  # key → [Lock, 대기/실행 중인 스레드 수]
+        self._generation = None
+        self._gen_checked_at = 0.0
+        self._stats = {"local_hits": 0, "shared_hits": 0, "misses": 0, "loads": 0,
+                       "waits": 0, "invalidations": 0}
+
+    # ---- backend ----
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    def _gen_key(self) -> str:
+        return f"{self.namespace}:gen"
+
+    def _current_generation(self) -> int:
+        now = time.monotonic()
+        if self._generation is not None and now - self._gen_checked_at < self.gen_check_interval:
+            return self._generation
+        gen = self.shared.get(self._gen_key()) or 0
+        with self._lock:
+            if gen != self._generation:
+                self._local.clear()
+                self._generation = gen
+            self._gen_checked_at = now
+        return gen
+
+    def _shared_key(self, key: str, gen: int) -> str:
+        return f"{self.namespace}:{gen}:{key}"
+
+    # ---- local LRU ----
+    def _local_get(self, key):
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, gen, value = entry
+            if gen != self._generation or expires_at < time.monotonic():
+                del self._local[key]
+                return _MISSING
+            self._local.move_to_end(key)
+            return value
+
+    def _local_set(self, key, value, gen):
+        with self._lock:
+            # 로딩 도중 무효화됐다면 이전 세대 값이므로 로컬에 남기지 않는다
+            if gen != self._generation:
+                return
+            self._local[key] = (time.monotonic() + self.ttl, gen, value)
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    # ---- public ----
+    def get_or_set(self, key: str, loader):
+        gen = self._current_generation()
+
+        value = self._local_get(key)
+        if value is not _MISSING:
+            self._count("local_hits")
+            return value
+
+        key_lock = self._acquire_key_lock(key)
+        try:
+            with key_lock:  # 같은 프로세스의 동시 미스는 여기서 줄을 선다
+                value = self._local_get(key)
+                if value is not _MISSING:
+                    self._count("local_hits")
+                    return value
+
+                skey = self._shared_key(key, gen)
+                value = self.shared.get(skey, _MISSING)
+                if value is not _MISSING:
+                    self._count("shared_hits")
+                    self._local_set(key, value, gen)
+                    return value
+
+                self._count("misses")
+                value = self._load_once(skey, loader)
+                self._local_set(key, value, gen)
+                return value
+        finally:
+            self._release_key_lock(key)
+
+    def _acquire_key_lock(self, key: str) -> threading.Lock:
+        # 키별 락은 참조 수로 관리: 마지막 스레드가 나가면 지운다 (키가 무한히 늘어도 락은 동시 미스 수만큼만)
+        with self._lock:
+            entry = self._key_locks.get(key)
+            if entry is None:
+                entry = self._key_locks[key] = [threading.Lock(), 0]
+            entry[1] += 1
+            return entry[0]
+
+    def _release_key_lock(self, key: str) -> None:
+        with self._lock:
+            entry = self._key_locks[key]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._key_locks[key]
+
+    def _load_once(self, skey, loader):
+        lock_key = f"{skey}:lock"
+        if self.shared.add(lock_key, 1, timeout=self.lock_timeout):
+            try:
+                return self._load(skey, loader)
+            finally:
+                self.shared.delete(lock_key)
+
+        # 다른 프로세스가 로딩 중 → 결과가 공유 캐시에 올라올 때까지 대기
+        self._count("waits")
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            value = self.shared.get(skey, _MISSING)
+            if value is not _MISSING:
+                return value
+            if self.shared.get(lock_key) is None:
+                # 보유자가 값을 남기지 않고 끝남(로더 예외 등) → 기다리지 않고 직접 로드
+                value = self.shared.get(skey, _MISSING)
+                if value is not _MISSING:
+                    return value
+                break
+        return self._load(skey, loader)  # 락 보유자가 죽었거나 값 없이 끝난 경우
+
+    def _load(self, skey, loader):
+        self._count("loads")
+        value = loader()
+        self.shared.set(skey, value, self.ttl)
+        return value
+
+    def invalidate(self) -> None:
+        # incr 은 백엔드에 따라 원자적이지 않고 TTL 이 초기화될 수 있어, 단조 증가하는 새 값으로 덮어쓴다
+        gen = time.time_ns()
+        self.shared.set(self._gen_key(), gen, None)
+        with self._lock:
+            self._local.clear()
+            self._generation = gen
+            self._gen_checked_at = time.monotonic()
+            self._stats["invalidations"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            data = dict(self._stats)
+            data.update(local_size=len(self._local), generation=self._generation)
+        lookups = data["local_hits"] + data["shared_hits"] + data["misses"]
+        data["hit_ratio"] = round((data["local_hits"] + data["shared_hits"]) / lookups, 4) if lookups else None
+        return data
@@ -0,0 +1,24 @@
+# api/checks.py
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+# 워커 간에 공유되지 않거나 add() 가 프로세스 간 원자적이지 않은 백엔드 (TwoTierCache 2차 캐시로 부적합)
+DEV_ONLY_CACHE_BACKENDS = {
+    "django.core.cache.backends.filebased.FileBasedCache",
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """manage.py check --deploy: CACHES["shared"] 가 개발용 백엔드면 경고."""
+    backend = settings.CACHES.get("shared", {}).get("BACKEND", "")
+    if backend in DEV_ONLY_CACHE_BACKENDS:
+        return [Warning(
+            f"CACHES['shared'] 가 개발용 백엔드({backend})입니다.",
+            hint="SHARED_CACHE_BACKEND=django.core.cache.backends.redis.RedisCache 와 "
+                 "SHARED_CACHE_LOCATION 을 지정하세요 (응답 캐시 무효화·단일 실행 락이 워커 간에 동작하지 않음).",
+            id="api.W001",
+        )]
+    return []
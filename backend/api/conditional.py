@@ -0,0 +1,74 @@
+# api/conditional.py
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+from . import versioning
+
+
+def etag_matches(etag: str, if_none_match: str | None) -> bool:
+    """If-None-Match 약한 비교 (압축 미들웨어가 ETag 를 W/ 로 바꿔 보내므로 W/ 는 무시)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag.removeprefix("W/") in {e.removeprefix("W/") for e in parse_etags(if_none_match)}
+
+
+class ConditionalGetMixin:
+    """
+    목록/단건 조회에 ETag / Last-Modified 부여.
+    - version_models 에 선언한 모델들의 버전 스탬프(api.ModelVersion)로 ETag 를 만든다
+    - If-None-Match(우선) 또는 If-Modified-Since 가 일치하면
+      본 쿼리·직렬화 없이 304 반환 (버전 테이블 조회 1회)
+    - version_models 가 비어 있으면 아무것도 하지 않음
+    """
+    version_models = ()
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional(request, super().retrieve, *args, **kwargs)
+
+    def versions(self) -> dict:
+        """version_models 의 {label: (version, updated_at)} — 요청(뷰 인스턴스)당 한 번만 조회."""
+        if getattr(self, "_versions", None) is None:
+            self._versions = versioning.get_versions(*self.version_models)
+        return self._versions
+
+    def version_stamp(self) -> str:
+        return ".".join(str(v) for v, _ in self.versions().values())
+
+    def _validators(self, request):
+        versions = self.versions()
+        stamp = self.version_stamp()
+        fmt = getattr(request.accepted_renderer, "format", "") or ""
+        etag = f'"{self.basename}-{stamp}-{fmt}"'
+        modified = [ts for _, ts in versions.values() if ts is not None]
+        return etag, (max(modified) if modified else None)
+
+    def _conditional(self, request, handler, *args, **kwargs):
+        if not self.version_models:
+            return handler(request, *args, **kwargs)
+
+        etag, last_modified = self._validators(request)
+        headers = {"ETag": etag}
+        if last_modified:
+            headers["Last-Modified"] = http_date(last_modified.timestamp())
+
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match:
+            not_modified = etag_matches(etag, if_none_match)
+        else:
+            since = parse_http_date_safe(request.headers.get("If-Modified-Since", ""))
+            not_modified = bool(since and last_modified and int(last_modified.timestamp()) <= since)
+        if not_modified:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            for k, v in headers.items():
+                response[k] = v
+            response["Cache-Control"] = "no-cache"
+        return response
@@ -0,0 +1,113 @@
+# api/fastread.py
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import fields as drf_fields
+from rest_framework import relations, serializers
+from rest_framework.response import Response
+
+# to_representation 이 DB 값을 그대로 돌려주는 필드 (CharField=str(), IntegerField=int() 는 values() 값과 같다)
+_IDENTITY = (drf_fields.IntegerField, drf_fields.CharField, drf_fields.BooleanField, drf_fields.ReadOnlyField)
+
+
+class Unsupported(Exception):
+    """values() 행으로 만들 수 없는 필드 (중첩 시리얼라이저, 메서드 필드, 역참조 등)."""
+
+
+class RowSerializer:
+    """
+    필드가 바인딩된 DRF 시리얼라이저 → values() 행(dict)을 응답 dict 로 바꾸는 매퍼를 미리 만든다.
+    - source="watch_model.brand.name_en" 같은 경로는 values("watch_model__brand__name_en") 조인 컬럼으로
+    - 변환은 필드별로 한 번 고른 함수(그대로 / DRF 필드의 to_representation)만 호출
+    - 출력(키 순서, None, Decimal/날짜/파일 URL 표현)은 serializer.data 와 같다 (manage.py bench_serializers 로 확인)
+    """
+
+    def __init__(self, serializer):
+        model = serializer.Meta.model
+        self.columns = []
+        self.mappers = []  # (출력 키, 컬럼, 변환 함수 또는 None)
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            column, model_field = self._column(model, field)
+            self.columns.append(column)
+            self.mappers.append((name, column, self._converter(field, model_field)))
+
+    @classmethod
+    def compile(cls, serializer) -> "RowSerializer | None":
+        try:
+            return cls(serializer)
+        except Unsupported:
+            return None
+
+    @staticmethod
+    def _column(model, field):
+        if isinstance(field, (serializers.BaseSerializer, relations.ManyRelatedField)):
+            raise Unsupported(field.field_name)
+        attrs = field.source_attrs
+        if not attrs:  # source="*" (SerializerMethodField 등)
+            raise Unsupported(field.field_name)
+        current = model
+        for i, attr in enumerate(attrs):
+            try:
+                model_field = current._meta.get_field(attr)
+            except FieldDoesNotExist:
+                raise Unsupported(field.field_name)
+            if not model_field.concrete or model_field.many_to_many:
+                raise Unsupported(field.field_name)
+            if i < len(attrs) - 1:
+                # 중간 경로는 NOT NULL 정방향 FK 만 (NULL 이면 DRF 는 필드를 건너뛰거나 기본값을 쓴다)
+                if not model_field.is_relation or model_field.null:
+                    raise Unsupported(field.field_name)
+                current = model_field.related_model
+        return "__".join(attrs), model_field
+
+    @staticmethod
+    def _converter(field, model_field):
+        if isinstance(field, relations.PrimaryKeyRelatedField):
+            # values("fk") 는 pk 값
+            return field.pk_field.to_representation if field.pk_field is not None else None
+        if isinstance(field, relations.RelatedField):
+            raise Unsupported(field.field_name)
+        if isinstance(field, drf_fields.FileField):
+            # values() 는 파일 이름(str) → FieldFile 로 감싸 DRF 와 같은 URL 규칙 적용
+            return lambda name: field.to_representation(model_field.attr_class(None, model_field, name))
+        if isinstance(field, _IDENTITY):
+            return None
+        return field.to_representation
+
+    def __call__(self, row: dict) -> dict:
+        out = {}
+        for name, column, convert in self.mappers:
+            value = row[column]
+            out[name] = value if value is None or convert is None else convert(value)
+        return out
+
+    def many(self, rows) -> list[dict]:
+        return [self(row) for row in rows]
+
+
+class FastListMixin:
+    """
+    fast_list=True 인 뷰셋의 목록(GET list)을 모델 인스턴스/ModelSerializer 없이 직렬화.
+    - 목록과 같은 filter_queryset() → values(매퍼 컬럼 + 정렬 컬럼) → 커서 페이지네이션 → RowSerializer
+    - 매퍼로 만들 수 없는 필드가 있으면(?expand= 등) 기존 경로
+    """
+    fast_list = False
+
+    def list(self, request, *args, **kwargs):
+        row_serializer = RowSerializer.compile(self.get_serializer()) if self.fast_list else None
+        if row_serializer is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        columns = list(row_serializer.columns)
+        paginator = self.paginator
+        if paginator is not None and hasattr(paginator, "get_ordering"):
+            # 커서 위치는 행 dict 의 정렬 컬럼에서 읽는다
+            ordering = paginator.get_ordering(request, queryset, self)
+            columns += [o.lstrip("-") for o in ordering]
+        rows = queryset.values(*dict.fromkeys(columns))
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(row_serializer.many(page))
+        return Response(row_serializer.many(rows))
@@ -0,0 +1,138 @@
+# api/filters.py
+import datetime
+from decimal import Decimal, InvalidOperation
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+
+def _to_int(raw: str) -> int:
+    return int(raw)
+
+
+def _to_upper(raw: str) -> str:
+    return raw.strip().upper()
+
+
+def _to_datetime(raw: str) -> datetime.datetime:
+    """'YYYY-MM-DD' 또는 ISO datetime 을 aware datetime 으로 변환."""
+    dt = parse_datetime(raw)
+    if dt is None:
+        d = parse_date(raw)
+        if d is None:
+            raise ValueError(raw)
+        dt = datetime.datetime.combine(d, datetime.time.min)
+    if timezone.is_naive(dt):
+        dt = timezone.make_aware(dt)
+    return dt
+
+
+def _to_decimal(raw: str) -> Decimal:
+    try:
+        d = Decimal(raw.replace(",", ""))
+    except InvalidOperation:
+        raise ValueError(raw)
+    if not d.is_finite():
+        raise ValueError(raw)
+    return d
+
+
+def _to_date(raw: str) -> datetime.date:
+    d = parse_date(raw)
+    if d is None:
+        raise ValueError(raw)
+    return d
+
+
+CASTS = {
+    "int": _to_int,
+    "decimal": _to_decimal,
+    "str": str,
+    "upper": _to_upper,
+    "date": _to_date,
+    "datetime": _to_datetime,
+}
+
+RANGE_LOOKUPS = ("gte", "lte", "gt", "lt")
+
+
+class FieldFilterBackend(BaseFilterBackend):
+    """
+    ViewSet의 filter_fields 선언을 기반으로 쿼리파라미터 → ORM 필터 적용.
+
+        filter_fields = {
+            # 파라미터명: (ORM lookup, cast, range 허용 여부)
+            "watch_variant": ("watch_variant_id", "int", False),
+            "created_at":    ("created_at", "datetime", True),
+        }
+
+    지원 형태
+      ?name=1           → exact
+      ?name=1,2,3       → __in (쉼표 구분)
+      ?name__gte=...    → 범위 (range 허용 필드만; gte/lte/gt/lt)
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        spec = getattr(view, "filter_fields", None) or {}
+        if not spec:
+            return queryset
+
+        params = request.query_params
+        conditions = {}
+        for name, (lookup, cast_name, allow_range) in spec.items():
+            cast = CASTS[cast_name]
+
+            raw = params.get(name)
+            if raw not in (None, ""):
+                values = [v for v in raw.split(",") if v.strip()]
+                parsed = [self._cast(name, cast, v.strip()) for v in values]
+                if len(parsed) == 1:
+                    conditions[lookup] = parsed[0]
+                elif parsed:
+                    conditions[f"{lookup}__in"] = parsed
+
+            if not allow_range:
+                continue
+            for op in RANGE_LOOKUPS:
+                key = f"{name}__{op}"
+                raw = params.get(key)
+                if raw not in (None, ""):
+                    conditions[f"{lookup}__{op}"] = self._cast(key, cast, raw.strip())
+
+        return queryset.filter(**conditions) if conditions else queryset
+
+    @staticmethod
+    def _cast(param, cast, raw):
+        try:
+            return cast(raw)
+        except (TypeError, ValueError):
+            raise ValidationError({param: f"잘못된 값입니다: {raw}"})
+
+
+class KeysetOrderingFilter(OrderingFilter):
+    """
+    ?ordering= 정렬 + 키셋(커서) 페이지네이션 호환.
+    - 커서 위치는 첫 정렬 필드 값이므로 NULL 행은 제외 (예: ordering=price_krw → 판매만, price_min_krw → 매입만)
+    - 동점 정렬을 고정하기 위해 id 를 마지막 정렬 키로 덧붙임
+    ordering 파라미터가 없으면 뷰/페이지네이션 기본 정렬 그대로.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering and request.query_params.get(self.ordering_param):
+            ordering = list(ordering)
+            if ordering[-1].lstrip("-") != "id":
+                ordering.append("-id" if ordering[0].startswith("-") else "id")
+        return ordering
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params.get(self.ordering_param)
+        if not params:
+            return queryset
+        ordering = self.get_ordering(request, queryset, view)
+        if ordering:
+            queryset = queryset.filter(**{f"{ordering[0].lstrip('-')}__isnull": False})
+            return queryset.order_by(*ordering)
+        return queryset
@@ -0,0 +1,59 @@
+# api/management/commands/bench_renderers.py
+import itertools
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils.text import compress_string
+from rest_framework.renderers import JSONRenderer
+
+from api.middleware import brotli
+from api.renderers import FastJSONRenderer
+from api.serializers import WatchTransactionSerializer
+from api.services.catalog import build_tree
+from api.views_watches import WatchTransactionViewSet
+
+
+class Command(BaseCommand):
+    help = "JSON 렌더러(DRF JSONRenderer vs orjson FastJSONRenderer) 인코딩 시간과 전송 크기(gzip/brotli) 비교"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000, help="거래 목록 행 수 (DB 행이 적으면 반복해서 채움)")
+        parser.add_argument("--repeat", type=int, default=5, help="측정 반복 횟수 (최솟값 사용)")
+
+    def handle(self, *args, **options):
+        rows, repeat = options["rows"], max(1, options["repeat"])
+        instances = list(WatchTransactionViewSet.queryset[:rows])
+        data = WatchTransactionSerializer(instances, many=True).data
+        payloads = {
+            f"transactions x{rows}": {"next": None, "previous": None,
+                                      "results": list(itertools.islice(itertools.cycle(data), rows)) if data else []},
+            "catalog tree": {"version": "bench", "brands": build_tree()},
+        }
+
+        for name, payload in payloads.items():
+            drf_body = JSONRenderer().render(payload)
+            fast_body = FastJSONRenderer().render(payload)
+            drf_t = self._best(lambda: JSONRenderer().render(payload), repeat)
+            fast_t = self._best(lambda: FastJSONRenderer().render(payload), repeat)
+            same = "일치" if drf_body == fast_body else "불일치"
+            self.stdout.write(f"[{name}] 출력 {same}")
+            self.stdout.write(f"  인코딩: JSONRenderer {drf_t * 1000:.1f}ms → FastJSONRenderer {fast_t * 1000:.1f}ms"
+                              f" (x{drf_t / fast_t:.1f})")
+
+            gzip_t = self._best(lambda: compress_string(fast_body), repeat)
+            sizes = [f"원본 {len(fast_body):,}B", f"gzip {len(compress_string(fast_body)):,}B ({gzip_t * 1000:.1f}ms)"]
+            if brotli is not None:
+                br_t = self._best(lambda: brotli.compress(fast_body, quality=5), repeat)
+                sizes.append(f"br {len(brotli.compress(fast_body, quality=5)):,}B ({br_t * 1000:.1f}ms)")
+            else:
+                sizes.append("br 미설치")
+            self.stdout.write("  전송 크기: " + " / ".join(sizes))
+
+    @staticmethod
+    def _best(fn, repeat) -> float:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+        return best
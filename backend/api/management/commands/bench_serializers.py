@@ -0,0 +1,87 @@
+# api/management/commands/bench_serializers.py
+import itertools
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.fastread import RowSerializer
+from api.views_watches import WatchPriceViewSet, WatchTransactionViewSet, WatchVariantViewSet
+
+VIEWSETS = {
+    "transactions": WatchTransactionViewSet,
+    "watch-variants": WatchVariantViewSet,
+    "watch-prices": WatchPriceViewSet,
+}
+
+
+class Command(BaseCommand):
+    help = "목록 고속 직렬화(api/fastread.py)와 ModelSerializer 출력 일치 확인 + 속도 비교"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000, help="측정 행 수 (DB 행이 적으면 반복해서 채움)")
+        parser.add_argument("--only", type=str, help=f"쉼표로 구분: {', '.join(VIEWSETS)}")
+        parser.add_argument("--repeat", type=int, default=3, help="측정 반복 횟수 (최솟값 사용)")
+
+    def handle(self, *args, **options):
+        names = [n.strip() for n in (options.get("only") or "").split(",") if n.strip()] or list(VIEWSETS)
+        unknown = set(names) - set(VIEWSETS)
+        if unknown:
+            raise CommandError(f"알 수 없는 대상: {', '.join(sorted(unknown))}")
+
+        failed = False
+        for name in names:
+            failed |= not self._run(name, VIEWSETS[name], options["rows"], max(1, options["repeat"]))
+        if failed:
+            raise CommandError("출력 불일치가 있습니다.")
+        self.stdout.write(self.style.SUCCESS("완료: 모든 출력 일치"))
+
+    def _run(self, name, viewset, rows, repeat) -> bool:
+        serializer_class = viewset.serializer_class
+        queryset = viewset.queryset.all()
+        row_serializer = RowSerializer.compile(serializer_class())
+        if row_serializer is None:
+            self.stdout.write(self.style.WARNING(f"[{name}] 고속 직렬화 불가 (지원하지 않는 필드)"))
+            return True
+
+        # 1) 일치 확인: 같은 행을 두 경로로 직렬화해 pk 별 비교
+        pk = queryset.model._meta.pk.name
+        instances = list(queryset[:rows])
+        by_pk = {r[pk]: r for r in queryset.values(*dict.fromkeys([*row_serializer.columns, pk]))[:rows]}
+        expected = serializer_class(instances, many=True).data
+        mismatches = []
+        for obj, data in zip(instances, expected):
+            fast = row_serializer(by_pk[getattr(obj, pk)])
+            if fast != dict(data) or list(fast) != list(data):
+                mismatches.append((getattr(obj, pk), dict(data), fast))
+        for key, want, got in mismatches[:3]:
+            self.stdout.write(self.style.ERROR(f"[{name}] pk={key}\n  serializer: {want}\n  fast:       {got}"))
+
+        if not instances:
+            self.stdout.write(self.style.WARNING(f"[{name}] 행이 없어 속도 측정을 건너뜀"))
+            return not mismatches
+
+        # 2) 속도: 직렬화만 (rows 행이 되도록 반복)
+        sample_objs = list(itertools.islice(itertools.cycle(instances), rows))
+        sample_rows = [by_pk[getattr(o, pk)] for o in sample_objs]
+        slow = self._best(lambda: serializer_class(sample_objs, many=True).data, repeat)
+        fast = self._best(lambda: row_serializer.many(sample_rows), repeat)
+
+        # 3) 속도: 조회 포함 (실제 DB 행, 최대 rows)
+        slow_q = self._best(lambda: serializer_class(list(queryset[:rows]), many=True).data, repeat)
+        fast_q = self._best(lambda: row_serializer.many(queryset.values(*row_serializer.columns)[:rows]), repeat)
+
+        self.stdout.write(
+            f"[{name}] 일치 {len(instances) - len(mismatches)}/{len(instances)} | "
+            f"직렬화 {rows}행: {slow * 1000:.1f}ms → {fast * 1000:.1f}ms (x{slow / fast:.1f}) | "
+            f"조회 포함 {len(instances)}행: {slow_q * 1000:.1f}ms → {fast_q * 1000:.1f}ms (x{slow_q / fast_q:.1f})"
+        )
+        return not mismatches
+
+    @staticmethod
+    def _best(fn, repeat) -> float:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+        return best
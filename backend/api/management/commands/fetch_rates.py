@@ -1,38 +1,113 @@
 # api/management/commands/fetch_rates.py
-from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
 from django.db.models import Q
 import datetime
+import os
+import tempfile
 from api.models import Country
-from api.services.exchange import get_or_fetch_rate
+from api.services.exchange import fetch_rates, upsert_rates
+from api.services import normalize
+from api.services.fx_backfill import CHUNK_DAYS, RateBackfill
 
 class Command(BaseCommand):
-    help = "국가 default_currency -> 지정 quote(KRW 기본) 환율 저장"
+    help = (
+        "국가 default_currency -> 지정 quote(KRW 기본) 환율 일괄 수집/저장 (프로바이더 호출은 날짜당 1회). "
+        "--from/--to 로 기간 백필 (시계열 프로바이더, 이어서 실행 가능)"
+    )
 
     def add_arguments(self, parser):
         parser.add_argument("--date", type=str, help="YYYY-MM-DD (기본: 오늘)")
-        parser.add_argument("--quote", type=str, default="KRW", help="기준 통화 (기본: KRW)")
+        parser.add_argument("--from", dest="date_from", type=str, help="백필 시작일 YYYY-MM-DD")
+        parser.add_argument("--to", dest="date_to", type=str, help="백필 종료일 YYYY-MM-DD (기본: 오늘)")
+        parser.add_argument("--rate-limit", type=float, default=5.0, help="백필: 초당 최대 호출 수 (0=제한 없음)")
+        parser.add_argument("--chunk-days", type=int, default=CHUNK_DAYS, help="백필: 호출 한 번에 요청할 최대 일수")
+        parser.add_argument("--checkpoint", type=str, help="백필: 체크포인트 파일 경로 (기본: 임시 디렉터리)")
+        parser.add_argument("--quote", type=str, default="KRW", help="기준 통화, 쉼표로 여러 개 가능 (기본: KRW)")
         parser.add_argument("--bases", type=str, help="쉼표로 구분된 통화코드 목록")
+        parser.add_argument("--workers", type=int, help="동시 호출 스레드 수 (기본: settings.FX_FETCH_WORKERS)")
+        parser.add_argument("--dry-run", action="store_true", help="수집만 하고 저장하지 않음")
         parser.add_argument("--verbose", action="store_true")
 
+    @staticmethod
+    def _date(value, name):
+        try:
+            return datetime.date.fromisoformat(value) if value else datetime.date.today()
+        except ValueError:
+            raise CommandError(f"{name} 는 YYYY-MM-DD 형식이어야 합니다.")
+
     def handle(self, *args, **options):
-        date_val = datetime.date.fromisoformat(options["date"]) if options.get("date") else datetime.date.today()
-        quote = (options.get("quote") or "KRW").upper()
+        date_val = self._date(options.get("date"), "--date")
+        quotes = [q.strip().upper() for q in (options.get("quote") or "KRW").split(",") if q.strip()]
 
         if options.get("bases"):
             bases = [c.strip().upper() for c in options["bases"].split(",") if c.strip()]
         else:
             qs = Country.objects.exclude(Q(default_currency__isnull=True) | Q(default_currency=""))
-            bases = sorted(set((c.default_currency or "").upper() for c in qs if c.default_currency))
-
-        ok, fail = 0, 0
-        for base in bases:
-            obj = get_or_fetch_rate(base, quote, on_date=date_val, allow_fetch=True)
-            if obj:
-                ok += 1
-                if options["verbose"]:
-                    self.stdout.write(self.style.SUCCESS(f"{date_val} 1 {obj.base} = {obj.rate} {obj.quote} [{obj.source}]"))
-            else:
-                fail += 1
-                self.stdout.write(self.style.WARNING(f"{date_val} {base}->{quote} 가져오기 실패"))
-
-        self.stdout.write(self.style.SUCCESS(f"완료: 성공 {ok}, 실패 {fail}"))
+            bases = sorted(set(c.upper() for c in qs.values_list("default_currency", flat=True)))
+
+        if options.get("date_from"):
+            return self._backfill(bases, quotes, options)
+
+        result = fetch_rates(bases, quotes, [date_val], workers=options.get("workers"))
+        if options["verbose"]:
+            for obj in result.rates:
+                self.stdout.write(self.style.SUCCESS(f"{obj.date} 1 {obj.base} = {obj.rate} {obj.quote} [{obj.source}]"))
+        for day, base, quote in result.missing:
+            self.stdout.write(self.style.WARNING(f"{day} {base}->{quote} 가져오기 실패"))
+
+        created = updated = 0
+        before = None
+        if not options["dry_run"]:
+            before = normalize.current_rates()
+            created, updated = upsert_rates(result.rates)
+        self.stdout.write(self.style.SUCCESS(
+            f"완료: 성공 {len(result.rates)} (신규 {created}, 갱신 {updated}), 실패 {len(result.missing)}, "
+            f"API 호출 {result.calls}"
+        ))
+        if created or updated:
+            self._recompute_normalized(before)
+
+    def _recompute_normalized(self, before):
+        # 최신 KRW 환율이 실제로 바뀐 통화의 거래만 정규화 가격을 다시 계산 (전체 UPDATE·버전 bump 없음)
+        changed = normalize.changed_currencies(before)
+        if not changed:
+            self.stdout.write("KRW 정규화 가격 재계산: 최신 환율 변경 없음")
+            return
+        n = sum(normalize.recompute(changed).values())
+        self.stdout.write(f"KRW 정규화 가격 재계산: {n}건 ({', '.join(changed)})")
+
+    def _backfill(self, bases, quotes, options):
+        if options.get("date"):
+            raise CommandError("--date 와 --from/--to 는 함께 쓸 수 없습니다.")
+        start = self._date(options["date_from"], "--from")
+        end = self._date(options.get("date_to"), "--to")
+        if start > end:
+            raise CommandError("--from 은 --to 보다 이후일 수 없습니다.")
+        checkpoint = options.get("checkpoint") or os.path.join(
+            tempfile.gettempdir(), f"fetch_rates_{start}_{end}_{'-'.join(sorted(quotes))}.json"
+        )
+
+        def progress(s, e, n):
+            if options["verbose"]:
+                self.stdout.write(f"{s} ~ {e}: {n}건 저장")
+
+        before = None if options["dry_run"] else normalize.current_rates()
+        result = RateBackfill(
+            bases, quotes, start, end,
+            workers=options.get("workers") or getattr(settings, "FX_FETCH_WORKERS", 4),
+            rate_limit=options["rate_limit"], chunk_days=options["chunk_days"], checkpoint=checkpoint,
+            dry_run=options["dry_run"],
+        ).run(progress=progress)
+
+        for s, e, error in result.failed:
+            self.stdout.write(self.style.WARNING(f"{s} ~ {e} 가져오기 실패: {error}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"백필 완료: 신규 {result.created}, 건너뛴 날짜 {result.skipped_days}, "
+            f"API 호출 {result.calls}, 실패 구간 {len(result.failed)}, 환율 없음 {len(result.missing)} "
+            f"(체크포인트: {checkpoint})"
+        ))
+        if result.created:
+            self._recompute_normalized(before)
+        if result.failed:
+            self.stdout.write("같은 명령을 다시 실행하면 실패한 구간부터 이어서 진행합니다.")
@@ -0,0 +1,31 @@
+# api/management/commands/import_transactions.py
+from django.core.management.base import BaseCommand, CommandError
+from api.services.importer import (
+    CHUNK_SIZE, FORMATS, TransactionImporter, detect_format, iter_records,
+)
+
+
+class Command(BaseCommand):
+    help = "CSV/JSONL 거래 대량 적재 (청크 단위 스트리밍 + bulk_create)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", type=str, help="CSV 또는 JSONL 파일 경로")
+        parser.add_argument("--format", dest="fmt", choices=FORMATS, help="기본: 확장자로 판단")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="검증만 하고 저장하지 않음")
+        parser.add_argument("--verbose", action="store_true")
+
+    def handle(self, *args, **options):
+        fmt = options.get("fmt") or detect_format(options["path"])
+        importer = TransactionImporter(chunk_size=options["chunk_size"], dry_run=options["dry_run"])
+        try:
+            with open(options["path"], encoding="utf-8-sig", newline="") as f:
+                result = importer.run(iter_records(f, fmt))
+        except OSError as e:
+            raise CommandError(str(e))
+
+        if options["verbose"]:
+            for err in result.errors:
+                self.stdout.write(self.style.WARNING(f"{err['row']}행: {err['errors']}"))
+        label = "검증" if options["dry_run"] else "저장"
+        self.stdout.write(self.style.SUCCESS(f"완료: {label} {result.created}, 실패 {result.failed}"))
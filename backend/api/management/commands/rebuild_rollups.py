@@ -0,0 +1,19 @@
+# api/management/commands/rebuild_rollups.py
+import datetime
+from django.core.management.base import BaseCommand
+from api.services.rollup import rebuild
+
+
+class Command(BaseCommand):
+    help = "거래 일별 롤업(WatchTransactionDaily) 재구축 (기간 지정 없으면 전체)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--from", dest="date_from", type=str, help="YYYY-MM-DD (포함)")
+        parser.add_argument("--to", dest="date_to", type=str, help="YYYY-MM-DD (포함)")
+
+    def handle(self, *args, **options):
+        date_from = datetime.date.fromisoformat(options["date_from"]) if options.get("date_from") else None
+        date_to = datetime.date.fromisoformat(options["date_to"]) if options.get("date_to") else None
+
+        n = rebuild(date_from, date_to)
+        self.stdout.write(self.style.SUCCESS(f"완료: 롤업 {n}건 ({date_from or '처음'} ~ {date_to or '끝'})"))
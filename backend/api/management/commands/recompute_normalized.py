@@ -0,0 +1,18 @@
+# api/management/commands/recompute_normalized.py
+from django.core.management.base import BaseCommand
+
+from api.services import normalize
+
+
+class Command(BaseCommand):
+    help = "거래 KRW 정규화 가격(price_krw 등)을 현재 최신 환율로 일괄 재계산 (환율 갱신 후 실행)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--currency", type=str, help="쉼표로 구분된 통화코드 (기본: 전체)")
+
+    def handle(self, *args, **options):
+        currencies = [c.strip().upper() for c in (options.get("currency") or "").split(",") if c.strip()]
+        updated = normalize.recompute(currencies or None)
+        for code, n in updated.items():
+            self.stdout.write(f"{code or '(없음)'}: {n}건")
+        self.stdout.write(self.style.SUCCESS(f"완료: {sum(updated.values())}건 재계산"))
@@ -0,0 +1,112 @@
+# api/middleware.py
+import re
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence, compress_string
+
+try:
+    import brotli  # 선택 의존성: 없으면 gzip 만 협상
+except ImportError:
+    brotli = None
+
+# text/html(브라우저블 API)은 폼에 CSRF 토큰이 실리므로 압축하지 않는다 (BREACH)
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/csv", "text/plain")
+# gzip 헤더에 넣는 임의 길이 패딩 상한 (BREACH 완화, django GZipMiddleware 와 같은 값)
+GZIP_MAX_RANDOM_BYTES = 100
+_ACCEPT_RE = re.compile(r"\s*([^\s;,]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?")
+
+
+def negotiate(accept_encoding: str, allow_brotli: bool = True) -> str | None:
+    """Accept-Encoding → 사용할 인코딩 ('br' | 'gzip' | None). q 값이 같으면 br 우선, q=0 은 거부."""
+    weights = {}
+    for part in (accept_encoding or "").split(","):
+        m = _ACCEPT_RE.match(part)
+        if not m:
+            continue
+        try:
+            weights[m.group(1).lower()] = float(m.group(2)) if m.group(2) else 1.0
+        except ValueError:
+            continue
+    candidates = (["br"] if brotli is not None and allow_brotli else []) + ["gzip"]
+    best, best_q = None, 0.0
+    for coding in candidates:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class CompressionMiddleware:
+    """
+    API 응답 압축 (정적 파일은 whitenoise 가 따로 처리).
+    - settings.API_COMPRESS_PATHS 로 시작하는 경로의 JSON/NDJSON/CSV 응답만
+      (토큰이 응답 본문에 실리는 settings.API_COMPRESS_EXCLUDE_PATHS 는 압축하지 않는다: BREACH)
+    - Accept-Encoding 협상으로 brotli(설치된 경우) 또는 gzip
+    - 일반 응답은 settings.API_COMPRESS_MIN_BYTES 이상일 때만, 스트리밍(내보내기)은 항상 청크 단위로
+    - gzip 은 응답마다 임의 길이 패딩(GZIP_MAX_RANDOM_BYTES)을 넣어 압축 길이로 본문을 추측하기 어렵게 한다.
+      brotli 는 패딩을 넣을 수 없으므로 자격 증명(Authorization 헤더/쿠키)이 없는 요청에만 쓴다
+      (사용자별 비밀값이 없는 공개 응답). 자격 증명이 있으면 gzip
+    - 인코딩별로 본문이 다르므로 Vary: Accept-Encoding, ETag 는 약한 ETag(W/) 로 바꾼다
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.paths = tuple(getattr(settings, "API_COMPRESS_PATHS", ("/api/",)))
+        self.exclude_paths = tuple(getattr(settings, "API_COMPRESS_EXCLUDE_PATHS", ("/api/auth/",)))
+        self.min_bytes = getattr(settings, "API_COMPRESS_MIN_BYTES", 1024)
+        self.brotli_quality = getattr(settings, "API_COMPRESS_BROTLI_QUALITY", 5)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.path.startswith(self.paths) and not request.path.startswith(self.exclude_paths):
+            self.compress(request, response)
+        return response
+
+    def compress(self, request, response):
+        if response.has_header("Content-Encoding") or response.status_code in (204, 304):
+            return
+        content_type = response.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type not in COMPRESSIBLE_TYPES:
+            return
+        if not response.streaming and len(response.content) < self.min_bytes:
+            return
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        anonymous = not self._carries_credentials(request)
+        if brotli is not None:
+            patch_vary_headers(response, ("Authorization", "Cookie"))  # br 사용 여부가 자격 증명에 따라 다르다
+        coding = negotiate(request.headers.get("Accept-Encoding", ""), allow_brotli=anonymous)
+        if coding is None:
+            return
+
+        if response.streaming:
+            response.streaming_content = (
+                self._brotli_stream(response.streaming_content) if coding == "br"
+                else compress_sequence(response.streaming_content, max_random_bytes=GZIP_MAX_RANDOM_BYTES)
+            )
+            del response["Content-Length"]
+        else:
+            body = (brotli.compress(response.content, quality=self.brotli_quality) if coding == "br"
+                    else compress_string(response.content, max_random_bytes=GZIP_MAX_RANDOM_BYTES))
+            if len(body) >= len(response.content):
+                return
+            response.content = body
+            response["Content-Length"] = str(len(body))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        response["Content-Encoding"] = coding
+
+    @staticmethod
+    def _carries_credentials(request) -> bool:
+        return bool(request.headers.get("Authorization") or request.COOKIES)
+
+    def _brotli_stream(self, chunks):
+        compressor = brotli.Compressor(quality=self.brotli_quality)
+        for chunk in chunks:
+            out = compressor.process(chunk.encode() if isinstance(chunk, str) else chunk)
+            if out:
+                yield out
+        yield compressor.finish()
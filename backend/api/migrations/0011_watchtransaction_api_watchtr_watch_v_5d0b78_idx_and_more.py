@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-17 19:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_watchtransaction_note'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='watchtransaction',
+            index=models.Index(fields=['watch_variant', 'created_at'], name='api_watchtr_watch_v_5d0b78_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='watchtransaction',
+            index=models.Index(fields=['watch_variant', 'transaction_type'], name='api_watchtr_watch_v_f8e66d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='watchtransaction',
+            index=models.Index(fields=['country', 'created_at'], name='api_watchtr_country_7ea5a3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='watchtransaction',
+            index=models.Index(fields=['transaction_type', 'created_at'], name='api_watchtr_transac_ff43d1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='watchtransaction',
+            index=models.Index(fields=['created_at'], name='api_watchtr_created_724524_idx'),
+        ),
+    ]
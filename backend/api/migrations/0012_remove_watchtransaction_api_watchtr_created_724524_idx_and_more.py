@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-17 19:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_watchtransaction_api_watchtr_watch_v_5d0b78_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='watchtransaction',
+            name='api_watchtr_created_724524_idx',
+        ),
+        migrations.AddIndex(
+            model_name='exchangerate',
+            index=models.Index(fields=['date', 'id'], name='api_exchang_date_5bcc00_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='watchprice',
+            index=models.Index(fields=['created_at', 'id'], name='api_watchpr_created_d37f66_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='watchtransaction',
+            index=models.Index(fields=['created_at', 'id'], name='api_watchtr_created_5a721a_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.6 on 2026-10-17 19:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_remove_watchtransaction_api_watchtr_created_724524_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WatchTransactionDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('transaction_type', models.CharField(choices=[('sell', '판매'), ('buy', '매입')], max_length=10)),
+                ('day', models.DateField()),
+                ('currency', models.CharField(blank=True, max_length=3)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('sum_low', models.DecimalField(decimal_places=2, default=0, max_digits=20)),
+                ('sum_high', models.DecimalField(decimal_places=2, default=0, max_digits=20)),
+                ('min_low', models.DecimalField(blank=True, decimal_places=2, max_digits=15, null=True)),
+                ('max_high', models.DecimalField(blank=True, decimal_places=2, max_digits=15, null=True)),
+                ('quote', models.CharField(max_length=3)),
+                ('quote_rate', models.DecimalField(blank=True, decimal_places=8, max_digits=18, null=True)),
+                ('quote_sum_low', models.DecimalField(blank=True, decimal_places=2, max_digits=24, null=True)),
+                ('quote_sum_high', models.DecimalField(blank=True, decimal_places=2, max_digits=24, null=True)),
+                ('quote_min_low', models.DecimalField(blank=True, decimal_places=2, max_digits=20, null=True)),
+                ('quote_max_high', models.DecimalField(blank=True, decimal_places=2, max_digits=20, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('country', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='api.country')),
+                ('watch_variant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='api.watchvariant')),
+            ],
+            options={
+                'ordering': ['-day'],
+                'indexes': [models.Index(fields=['watch_variant', 'day'], name='api_watchtr_watch_v_73207b_idx'), models.Index(fields=['day'], name='api_watchtr_day_3552a8_idx')],
+                'unique_together': {('watch_variant', 'country', 'transaction_type', 'day', 'currency')},
+            },
+        ),
+    ]
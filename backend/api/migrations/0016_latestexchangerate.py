@@ -0,0 +1,52 @@
+# Generated by Django 5.2.6 on 2026-10-17 19:53
+
+from django.db import migrations, models
+
+
+def forwards(apps, schema_editor):
+    ExchangeRate = apps.get_model("api", "ExchangeRate")
+    LatestExchangeRate = apps.get_model("api", "LatestExchangeRate")
+
+    # (base, quote) 별 첫 행(= 가장 최신)만 채택
+    latest = {}
+    rows = ExchangeRate.objects.order_by("base", "quote", "-date", "-id").values_list(
+        "id", "base", "quote", "date", "rate", "source"
+    )
+    for rid, base, quote, date, rate, source in rows.iterator(chunk_size=5000):
+        key = (base.upper(), quote.upper())
+        if key not in latest:
+            latest[key] = LatestExchangeRate(base=key[0], quote=key[1], date=date, rate=rate,
+                                             source=source, row_id=rid)
+    LatestExchangeRate.objects.bulk_create(latest.values(), batch_size=1000)
+
+
+def backwards(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_brand_updated_at_country_updated_at_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LatestExchangeRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('base', models.CharField(max_length=3)),
+                ('quote', models.CharField(db_index=True, max_length=3)),
+                ('date', models.DateField()),
+                ('rate', models.DecimalField(decimal_places=8, max_digits=18)),
+                ('source', models.CharField(default='manual', max_length=50)),
+                ('row_id', models.BigIntegerField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['quote', 'base'],
+                'unique_together': {('base', 'quote')},
+            },
+        ),
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.6 on 2026-10-17 19:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_latestexchangerate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='watchtransaction',
+            name='krw_rate',
+            field=models.DecimalField(blank=True, decimal_places=8, editable=False, max_digits=18, null=True),
+        ),
+        migrations.AddField(
+            model_name='watchtransaction',
+            name='krw_rate_date',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='watchtransaction',
+            name='price_krw',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='watchtransaction',
+            name='price_max_krw',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='watchtransaction',
+            name='price_min_krw',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=20, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='watchtransaction',
+            index=models.Index(fields=['watch_variant', 'price_krw'], name='api_watchtr_watch_v_da7faa_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='watchtransaction',
+            index=models.Index(fields=['watch_variant', 'price_min_krw'], name='api_watchtr_watch_v_12d3b3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='watchtransaction',
+            index=models.Index(fields=['price_krw', 'id'], name='api_watchtr_price_k_149fc9_idx'),
+        ),
+    ]
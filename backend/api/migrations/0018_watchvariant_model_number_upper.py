@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:20
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0017_watchtransaction_krw_rate_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='watchvariant',
+            index=models.Index(django.db.models.functions.text.Upper('model_number'), name='api_variant_model_number_upper'),
+        ),
+    ]
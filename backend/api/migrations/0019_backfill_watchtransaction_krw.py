@@ -0,0 +1,52 @@
+from decimal import Decimal
+
+from django.db import migrations
+from django.db.models import DecimalField, F, Value
+from django.db.models.functions import Round
+
+QUOTE = "KRW"
+RATE_QUANT = Decimal("0.00000001")
+COLUMNS = (("price", "price_krw"), ("price_min", "price_min_krw"), ("price_max", "price_max_krw"))
+
+
+def backfill_normalized(apps, schema_editor):
+    """
+    0017 에서 추가한 KRW 정규화 컬럼을 기존 거래에 채운다 (통화마다 UPDATE 한 번).
+    환율은 LatestExchangeRate 의 통화→KRW (없으면 KRW→통화 역수, 소수 8자리), KRW 는 1.
+    금액은 normalize.recompute() 와 같은 규칙: 원 금액 × 환율 → 소수 2자리 반올림 한 번.
+    피벗 통화를 거쳐야 하는 통화는 비워 두며, manage.py recompute_normalized 가 채운다.
+    """
+    WatchTransaction = apps.get_model("api", "WatchTransaction")
+    LatestExchangeRate = apps.get_model("api", "LatestExchangeRate")
+
+    rates = {QUOTE: (Decimal(1), None)}
+    for base, quote, rate, day in LatestExchangeRate.objects.values_list("base", "quote", "rate", "date"):
+        base, quote = base.upper(), quote.upper()
+        if quote == QUOTE:
+            rates[base] = (rate, day)
+        elif base == QUOTE and quote not in rates:
+            rates[quote] = ((1 / rate).quantize(RATE_QUANT), day)
+
+    pending = WatchTransaction.objects.filter(krw_rate__isnull=True).order_by()
+    for code in set(pending.values_list("currency", flat=True).distinct()):
+        detail = rates.get((code or "").upper())
+        if detail is None:
+            continue
+        rate, day = detail
+        rate_value = Value(rate, output_field=DecimalField(max_digits=18, decimal_places=8))
+        pending.filter(currency=code).update(
+            krw_rate=rate, krw_rate_date=day,
+            **{dst: Round(F(src) * rate_value, 2, output_field=DecimalField(max_digits=20, decimal_places=2))
+               for src, dst in COLUMNS},
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0018_watchvariant_model_number_upper'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_normalized, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+def backfill_rollups(apps, schema_editor):
+    """
+    0013 에서 만든 일별 롤업(WatchTransactionDaily)을 기존 거래로 채운다.
+    집계 규칙(현지 날짜 버킷, 통화별 합계/최솟값/최댓값, KRW 환산)이 서비스 코드와 어긋나지 않도록
+    manage.py rebuild_rollups 와 같은 rollup.rebuild() 를 그대로 호출한다.
+    거래가 없는 새 DB 에서는 아무것도 하지 않는다 (이후 스키마가 바뀌어도 현재 모델을 건드리지 않음).
+    """
+    WatchTransaction = apps.get_model("api", "WatchTransaction")
+    if not WatchTransaction.objects.exists():
+        return
+    from api.services import rollup
+
+    rollup.rebuild()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0019_backfill_watchtransaction_krw'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
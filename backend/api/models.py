@@ -1,5 +1,6 @@
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Upper
 from django.core.validators import RegexValidator
 from django.core.exceptions import ValidationError
 
@@ -11,6 +12,7 @@ class Brand(models.Model):
         blank=True,
         null=True
     )
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name_en
@@ -20,6 +22,7 @@ class WatchModel(models.Model):
     brand = models.ForeignKey(Brand, on_delete=models.CASCADE, related_name="models")
     nickname = models.CharField(max_length=100, blank=True, null=True)
     image = models.ImageField(upload_to="watch_models/", blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ("brand", "nickname")
@@ -36,6 +39,7 @@ class WatchModel(models.Model):
 class Vendor(models.Model):
     name = models.CharField(max_length=100, unique=True)  # 예: "공식 부티크", "병행 수입", "리셀 마켓"
     website = models.URLField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
@@ -50,6 +54,7 @@ class WatchVariant(models.Model):
     color = models.CharField(max_length=50, blank=True, null=True)         # 선택(없어도 됨)
     color_code = models.CharField(max_length=20, blank=True, null=True)
     image = models.ImageField(upload_to="watch_variants/", blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = (
@@ -57,6 +62,10 @@ class WatchVariant(models.Model):
             # 필요하면 색상도 중복 금지:
             # ("watch_model", "color"),
         )
+        indexes = [
+            # 대량 등록의 모델번호 조회 (대소문자 무시: Upper(model_number) IN (...))
+            models.Index(Upper("model_number"), name="api_variant_model_number_upper"),
+        ]
 
     def __str__(self):
         brand = self.watch_model.brand.name_en
@@ -75,7 +84,11 @@ class WatchPrice(models.Model):
 
     class Meta:
         unique_together = ("watch_variant", "vendor", "year")
-        indexes = [models.Index(fields=["year"]), models.Index(fields=["vendor"])]
+        indexes = [
+            models.Index(fields=["year"]),
+            models.Index(fields=["vendor"]),
+            models.Index(fields=["created_at", "id"]),  # 커서 페이지네이션
+        ]
 
     def __str__(self):
         return f"{self.watch_variant} - {self.vendor} ({self.year}): {self.price}"
@@ -92,6 +105,7 @@ class Country(models.Model):
         max_length=3, blank=True, null=True,
         validators=[RegexValidator(r"^[A-Za-z]{3}$", "통화코드 (예: KRW, USD)")]
     )
+    updated_at = models.DateTimeField(auto_now=True)
 
     def save(self, *args, **kwargs):
         if self.iso2: self.iso2 = self.iso2.upper()
@@ -121,6 +135,27 @@ class WatchTransaction(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # KRW 정규화 가격 (저장 시 최신 환율로 자동 계산, 환율 갱신 후 manage.py recompute_normalized 로 일괄 재계산)
+    price_krw = models.DecimalField(max_digits=20, decimal_places=2, blank=True, null=True, editable=False)
+    price_min_krw = models.DecimalField(max_digits=20, decimal_places=2, blank=True, null=True, editable=False)
+    price_max_krw = models.DecimalField(max_digits=20, decimal_places=2, blank=True, null=True, editable=False)
+    krw_rate = models.DecimalField(max_digits=18, decimal_places=8, blank=True, null=True, editable=False)
+    krw_rate_date = models.DateField(blank=True, null=True, editable=False)  # 적용 환율 기준일 (유도 환율은 가장 오래된 구성 환율 날짜)
+
+    class Meta:
+        indexes = [
+            # 변형별 목록/기간 조회 (?watch_variant=&created_at__gte=)
+            models.Index(fields=["watch_variant", "created_at"]),
+            models.Index(fields=["watch_variant", "transaction_type"]),
+            models.Index(fields=["country", "created_at"]),
+            models.Index(fields=["transaction_type", "created_at"]),
+            models.Index(fields=["created_at", "id"]),  # 커서 페이지네이션
+            # 통화 무관 가격 정렬/범위 (?ordering=price_krw&watch_variant=, ?price_krw__lte=)
+            models.Index(fields=["watch_variant", "price_krw"]),
+            models.Index(fields=["watch_variant", "price_min_krw"]),
+            models.Index(fields=["price_krw", "id"]),
+        ]
+
     def clean(self):
         if not self.country:
             from django.core.exceptions import ValidationError
@@ -147,6 +182,22 @@ class WatchTransaction(models.Model):
                 raise ValidationError({"price_max": "최대값은 최소값보다 크거나 같아야 합니다."})
             self.price = None
 
+    # 롤업 버킷을 정하는 필드: 로드 시점 값을 보관해 두면 수정 저장 때 이전 버킷을 SELECT 없이 알 수 있다 (api/signals.py)
+    ROLLUP_FIELDS = ("watch_variant_id", "country_id", "transaction_type", "created_at")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_rollup_fields()
+        return instance
+
+    def remember_rollup_fields(self):
+        # only()/defer() 로 빠진 필드가 있으면 보관하지 않는다 (signals 가 DB 에서 읽음)
+        loaded = self.__dict__
+        self._rollup_loaded = (
+            tuple(loaded[f] for f in self.ROLLUP_FIELDS) if all(f in loaded for f in self.ROLLUP_FIELDS) else None
+        )
+
     def save(self, *args, **kwargs):
         # ✅ clean()이 항상 돌도록 보장
         self.full_clean()
@@ -185,8 +236,90 @@ class ExchangeRate(models.Model):
         unique_together = ("base", "quote", "date")
         indexes = [
             models.Index(fields=["date", "base", "quote"]),
+            models.Index(fields=["date", "id"]),  # 커서 페이지네이션
         ]
         ordering = ["-date", "base", "quote"]
 
+    def save(self, *args, **kwargs):
+        # post_save 의 LatestExchangeRate 갱신(api/signals.py)이 같은 트랜잭션에 들어가도록
+        with transaction.atomic():
+            return super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.date} 1 {self.base} = {self.rate} {self.quote} ({self.source})"
+
+
+class LatestExchangeRate(models.Model):
+    """
+    (base, quote) 별 최신 환율 1건 — ExchangeRate 의 비정규화 사본.
+    ExchangeRate 저장/삭제와 같은 트랜잭션에서 갱신되므로, 최신 환율 조회는 이력 길이와 무관하게 통화쌍 수만큼만 읽는다.
+    """
+    base = models.CharField(max_length=3)
+    quote = models.CharField(max_length=3, db_index=True)
+    date = models.DateField()
+    rate = models.DecimalField(max_digits=18, decimal_places=8)
+    source = models.CharField(max_length=50, default="manual")
+    row_id = models.BigIntegerField()  # 원본 ExchangeRate.id
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("base", "quote")
+        ordering = ["quote", "base"]
+
+    def __str__(self):
+        return f"{self.date} 1 {self.base} = {self.rate} {self.quote} (latest)"
+
+
+class WatchTransactionDaily(models.Model):
+    """
+    거래 일별 롤업(집계) 테이블: (variant, country, type, day[, currency]) 단위.
+    - low/high: 판매는 price, 매입은 price_min/price_max
+    - native(거래 통화)와 quote(정규화 통화, 기본 KRW) 두 벌을 저장
+    - WatchTransaction 저장/삭제 시 해당 버킷만 재계산 (api/signals.py)
+    - 읽기: GET /api/watch-variants/{id}/history/?bucket=day (api/services/history.py daily_history)
+    - 기간 재구축: manage.py rebuild_rollups --from --to
+    """
+    watch_variant = models.ForeignKey("WatchVariant", on_delete=models.CASCADE, related_name="daily_rollups")
+    country = models.ForeignKey("Country", on_delete=models.CASCADE, related_name="daily_rollups")
+    transaction_type = models.CharField(max_length=10, choices=WatchTransaction.TRANSACTION_TYPE_CHOICES)
+    day = models.DateField()
+    currency = models.CharField(max_length=3, blank=True)  # 국가 기본 통화 (보통 버킷당 1개)
+
+    count = models.PositiveIntegerField(default=0)
+    sum_low = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    sum_high = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    min_low = models.DecimalField(max_digits=15, decimal_places=2, blank=True, null=True)
+    max_high = models.DecimalField(max_digits=15, decimal_places=2, blank=True, null=True)
+
+    quote = models.CharField(max_length=3)
+    quote_rate = models.DecimalField(max_digits=18, decimal_places=8, blank=True, null=True)  # 환율 없으면 null
+    quote_sum_low = models.DecimalField(max_digits=24, decimal_places=2, blank=True, null=True)
+    quote_sum_high = models.DecimalField(max_digits=24, decimal_places=2, blank=True, null=True)
+    quote_min_low = models.DecimalField(max_digits=20, decimal_places=2, blank=True, null=True)
+    quote_max_high = models.DecimalField(max_digits=20, decimal_places=2, blank=True, null=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("watch_variant", "country", "transaction_type", "day", "currency")
+        indexes = [
+            models.Index(fields=["watch_variant", "day"]),
+            models.Index(fields=["day"]),
+        ]
+        ordering = ["-day"]
+
+    def __str__(self):
+        return f"{self.day} {self.watch_variant_id}/{self.country_id}/{self.transaction_type}: {self.count}"
+
+
+class ModelVersion(models.Model):
+    """
+    테이블(모델)별 변경 버전 스탬프. 저장/삭제 시그널에서 +1 (api/versioning.py).
+    캐시 키/ETag 를 버전으로 만들어 TTL 없이 정확하게 무효화하는 데 사용.
+    """
+    label = models.CharField(max_length=100, unique=True)  # 예: "api.brand"
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField()
+
     def __str__(self):
-        return f"{self.date} 1 {self.base} = {self.rate} {self.quote} ({self.source})"
\ No newline at end of file
+        return f"{self.label} v{self.version}"
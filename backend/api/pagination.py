@@ -0,0 +1,114 @@
+# api/pagination.py
+import json
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, _reverse_ordering
+
+
+class KeysetPagination(CursorPagination):
+    """
+    키셋(커서) 페이지네이션.
+    - COUNT(*) 없이 정렬 인덱스를 따라 다음 페이지를 읽으므로 테이블이 커져도 응답시간이 일정.
+    - ?page_size= 지원 (max_page_size 상한).
+    - 응답 형태: {"next": url|null, "previous": url|null, "results": [...]}
+    - 커서 위치는 정렬 필드 전체 값 (마지막은 id): DRF 기본(첫 정렬 필드 + offset)은 created_at 이 같은 행이
+      한 페이지를 넘으면 offset 으로 넘기므로, 페이지 사이에 행이 추가되면 중복/누락이 생긴다.
+    """
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    ordering = ("-created_at", "-id")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+
+        ordering = _reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if current_position is not None:
+            queryset = queryset.filter(self._after(ordering, current_position))
+
+        # 다음 페이지 유무 확인용으로 한 건 더 읽는다
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = list(results[:self.page_size])
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def _after(self, ordering, position) -> Q:
+        """
+        (f1, f2, …, id) 가 커서 위치 뒤에 오는 행: f1 > v1 OR (f1 = v1 AND f2 > v2) OR … (내림차순 필드는 <).
+        첫 필드 범위 조건을 따로 AND 해 (created_at, id) 인덱스 범위 스캔을 쓰게 한다.
+        """
+        try:
+            values = json.loads(position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        fields = [(o.lstrip("-"), "lt" if o.startswith("-") else "gt") for o in ordering]
+        branches = []
+        for i, (name, op) in enumerate(fields):
+            equal = {f: v for (f, _), v in zip(fields[:i], values)}
+            branches.append(Q(**equal, **{f"{name}__{op}": values[i]}))
+        first, op = fields[0]
+        return Q(**{f"{first}__{op}e": values[0]}) & reduce(or_, branches)
+
+    def _get_position_from_instance(self, instance, ordering):
+        if isinstance(instance, dict):
+            values = [instance[o.lstrip("-")] for o in ordering]
+        else:
+            values = [getattr(instance, o.lstrip("-")) for o in ordering]
+        return json.dumps([str(v) for v in values], separators=(",", ":"))
+
+
+class TransactionPagination(KeysetPagination):
+    ordering = ("-created_at", "-id")
+
+
+class WatchPricePagination(KeysetPagination):
+    ordering = ("-created_at", "-id")
+
+
+class ExchangeRatePagination(KeysetPagination):
+    ordering = ("-date", "-id")
@@ -0,0 +1,113 @@
+# api/renderers.py
+import csv
+import io
+import json
+
+import orjson
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders
+
+
+def _rows(data):
+    # 페이지네이션 응답({"results": [...]}) / 리스트 / 단일 객체 모두 행 리스트로
+    if isinstance(data, dict) and isinstance(data.get("results"), list):
+        return data["results"]
+    if isinstance(data, list):
+        return data
+    return [data] if data is not None else []
+
+
+# orjson 이 직접 다루지 않는 타입(Decimal, timedelta, 지연 번역 문자열 등)은 DRF 인코더와 같은 표현으로
+_fallback = encoders.JSONEncoder().default
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    기본 JSON 렌더러 (settings.REST_FRAMEWORK DEFAULT_RENDERER_CLASSES).
+    orjson 으로 인코딩 — dict/list/str/숫자/datetime/date/UUID/NumPy 배열은 네이티브, 그 밖은 _fallback.
+    출력은 DRF JSONRenderer(압축 형식, UTF-8, UTC 는 Z) 와 같고,
+    들여쓰기 요청(브라우저블 API, Accept: application/json; indent=4)만 DRF 인코더로 처리.
+    """
+    options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if self.get_indent(accepted_media_type or "", renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson.dumps(data, default=_fallback, option=self.options)
+
+
+class ColumnarRenderer(FastJSONRenderer):
+    """
+    ?format=columnar — 행 객체 대신 열 배열 (차트/pandas/NumPy 용).
+    {"columns": [...], "data": {열: [...]}, "dictionaries": {열: [고유값...]}, "next", "previous"}
+    - 뷰의 columnar_dictionary 에 있는 반복 값 열(currency, country 등)은 사전 인코딩:
+      data 에는 dictionaries[열] 의 인덱스(없으면 null)
+    - 오류 응답은 일반 JSON
+    """
+    format = "columnar"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        renderer_context = renderer_context or {}
+        response = renderer_context.get("response")
+        if data is None or (response is not None and response.status_code >= 400):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        rows = _rows(data)
+        columns = list(dict.fromkeys(k for r in rows if isinstance(r, dict) for k in r))
+        encode = set(getattr(renderer_context.get("view"), "columnar_dictionary", ()))
+        out = {"columns": columns, "data": {}, "dictionaries": {}}
+        for col in columns:
+            values = [r.get(col) if isinstance(r, dict) else None for r in rows]
+            if col in encode:
+                encoded = self._dictionary(values)
+                if encoded is not None:
+                    out["dictionaries"][col], values = encoded
+            out["data"][col] = values
+        if isinstance(data, dict) and "results" in data:
+            out.update({k: v for k, v in data.items() if k != "results"})  # next/previous
+        return super().render(out, accepted_media_type, renderer_context)
+
+    @staticmethod
+    def _dictionary(values):
+        index = {}
+        try:
+            codes = [None if v is None else index.setdefault(v, len(index)) for v in values]
+        except TypeError:  # 펼친(expand) 객체 등 해시 불가 값은 그대로
+            return None
+        return list(index), codes
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    ?format=csv
+    목록 내보내기는 뷰에서 StreamingHttpResponse 로 직접 처리하고(api/exports.py),
+    이 렌더러는 그 외 응답(오류, 단건 조회 등)을 CSV 로 그리는 용도.
+    """
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = [r if isinstance(r, dict) else {"value": r} for r in _rows(data)]
+        if not rows:
+            return b""
+        header = list(dict.fromkeys(k for r in rows for k in r))
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, fieldnames=header)
+        writer.writeheader()
+        writer.writerows(rows)
+        return buf.getvalue().encode(self.charset)
+
+
+class NDJSONRenderer(BaseRenderer):
+    """?format=ndjson (한 줄에 JSON 객체 하나)"""
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        lines = (json.dumps(r, cls=DjangoJSONEncoder, ensure_ascii=False) for r in _rows(data))
+        return "".join(f"{line}\n" for line in lines).encode(self.charset)
@@ -0,0 +1,86 @@
+# api/response_cache.py
+import hashlib
+from urllib.parse import urlencode
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.response import Response
+
+from .cache import TwoTierCache
+
+# 키에 모델 버전이 들어가므로 무효화는 버전 증가로 정확하게 이뤄지고, TTL 은 오래된 항목 정리용
+response_cache = TwoTierCache(
+    "api_response",
+    ttl=getattr(settings, "RESPONSE_CACHE_TTL", 600),
+    local_size=512,
+)
+
+
+class _Uncacheable(Exception):
+    """200 이 아닌 응답: 캐시에 넣지 않고 그대로 돌려준다."""
+
+    def __init__(self, response):
+        self.response = response
+
+
+def _copy(data):
+    # 캐시(로컬 LRU)의 객체를 요청마다 얕게 복사 → 뷰의 후처리(convert= 환산 등)가 캐시 값을 바꾸지 않도록
+    def rows(items):
+        return [dict(r) if isinstance(r, dict) else r for r in items]
+    if isinstance(data, dict):
+        out = dict(data)
+        if isinstance(out.get("results"), list):
+            out["results"] = rows(out["results"])
+        return out
+    if isinstance(data, list):
+        return rows(data)
+    return data
+
+
+class ResponseCacheMixin:
+    """
+    익명 GET 목록/단건 응답(data) 캐시.
+    - 키: 뷰셋 + 동작 + pk + 렌더러/미디어 타입 + 호스트 + 정렬된 쿼리스트링 + version_models 버전 스탬프
+      → post_save/post_delete(api/signals.py) 와 대량 쓰기 경로가 버전을 올리면 다음 요청부터 새 키 (TTL 무효화 없음)
+    - 같은 키의 동시 미스는 TwoTierCache 가 프로세스 안(키별 락)·워커 간(공유 캐시 add 락)으로 묶어 한 번만 계산
+    - version_models 가 없거나, 로그인 사용자이거나, 스트리밍(csv/ndjson 내보내기) 형식이면 캐시하지 않음
+    """
+    response_cache_formats = ("json", "columnar")
+
+    def list(self, request, *args, **kwargs):
+        return self._cached(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached(request, super().retrieve, *args, **kwargs)
+
+    def _cache_key(self, request, stamp) -> str:
+        params = sorted((k, v) for k, values in request.query_params.lists() for v in values)
+        raw = "|".join([
+            self.basename or type(self).__name__, self.action or "", str(self.kwargs.get(self.lookup_field, "")),
+            request.accepted_media_type or "", request.get_host(), stamp, urlencode(params),
+        ])
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def _cacheable(self, request) -> bool:
+        if not getattr(settings, "RESPONSE_CACHE_ENABLED", True) or not self.version_models:
+            return False
+        if request.user and request.user.is_authenticated:
+            return False
+        return getattr(request.accepted_renderer, "format", None) in self.response_cache_formats
+
+    def _cached(self, request, handler, *args, **kwargs):
+        if not self._cacheable(request):
+            return handler(request, *args, **kwargs)
+
+        def load():
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK or getattr(response, "streaming", False):
+                raise _Uncacheable(response)
+            return response.data
+
+        key = self._cache_key(request, self.version_stamp())
+        try:
+            data = response_cache.get_or_set(key, load)
+        except _Uncacheable as e:
+            return e.response
+        return Response(_copy(data))
@@ -1,50 +1,129 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
+
+from api.sparse import SparseSerializerMixin
 from api.models import (  # ← models 위치에 맞게 수정
     Brand, WatchModel, Vendor, WatchVariant, WatchPrice,
     Country, WatchTransaction, ExchangeRate
 )
 
-class BrandSerializer(serializers.ModelSerializer):
+class BrandSerializer(SparseSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Brand
         fields = "__all__"
 
-class WatchModelSerializer(serializers.ModelSerializer):
+class WatchModelSerializer(SparseSerializerMixin, serializers.ModelSerializer):
     brand_name = serializers.CharField(source="brand.name_en", read_only=True)
     class Meta:
         model = WatchModel
         fields = "__all__"
+        expandable = {"brand": (BrandSerializer, "brand", "brand")}
 
-class VendorSerializer(serializers.ModelSerializer):
+class VendorSerializer(SparseSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Vendor
         fields = "__all__"
 
-class WatchVariantSerializer(serializers.ModelSerializer):
+class WatchVariantSerializer(SparseSerializerMixin, serializers.ModelSerializer):
     brand = serializers.CharField(source="watch_model.brand.name_en", read_only=True)
     model_nickname = serializers.CharField(source="watch_model.nickname", read_only=True)
     class Meta:
         model = WatchVariant
         fields = "__all__"
+        expandable = {
+            "watch_model": (WatchModelSerializer, "watch_model", "watch_model__brand"),
+            "brand": (BrandSerializer, "watch_model.brand", "watch_model__brand"),
+        }
 
-class WatchPriceSerializer(serializers.ModelSerializer):
+class WatchPriceSerializer(SparseSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = WatchPrice
         fields = "__all__"
+        expandable = {
+            "watch_variant": (WatchVariantSerializer, "watch_variant", "watch_variant__watch_model__brand"),
+            "vendor": (VendorSerializer, "vendor", "vendor"),
+            "brand": (BrandSerializer, "watch_variant.watch_model.brand", "watch_variant__watch_model__brand"),
+        }
 
-class CountrySerializer(serializers.ModelSerializer):
+class CountrySerializer(SparseSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Country
         fields = "__all__"
 
-class WatchTransactionSerializer(serializers.ModelSerializer):
+class PreloadedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """context["preloaded"][모델] 에 미리 읽어 둔 {pk: 객체} 가 있으면 항목마다 조회하지 않는다 (여러 건 생성용)."""
+
+    def to_internal_value(self, data):
+        preloaded = self.context.get("preloaded", {}).get(self.queryset.model)
+        if preloaded is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        if pk not in preloaded:
+            self.fail("does_not_exist", pk_value=data)
+        return preloaded[pk]
+
+
+class WatchTransactionListSerializer(serializers.ListSerializer):
+    """
+    거래 여러 건 생성 (POST /api/transactions/ 에 배열 본문).
+    - 변형/국가(기본 통화 포함)는 배치 전체에서 한 번씩만 조회
+    - 항목별로 검증(시리얼라이저 + 모델 clean) → 유효한 항목만 저장, 오류는 항목 번호와 함께 보고
+    """
+    max_items = 1000
+    related = {"watch_variant": WatchVariant, "country": Country}
+
+    def preload(self, items) -> None:
+        preloaded = {}
+        for name, model in self.related.items():
+            ids = set()
+            for item in items:
+                value = item.get(name) if isinstance(item, dict) else None
+                if isinstance(value, (int, str)) and not isinstance(value, bool) and str(value).strip().isdigit():
+                    ids.add(int(value))
+            preloaded[model] = model.objects.in_bulk(ids) if ids else {}
+        self._context["preloaded"] = preloaded
+
+    def validate_items(self, items) -> list[tuple[WatchTransaction | None, dict]]:
+        """항목마다 (미저장 WatchTransaction, 오류 dict) — 둘 중 하나만 채워진다."""
+        if len(items) > self.max_items:
+            raise serializers.ValidationError({"detail": f"한 번에 최대 {self.max_items}건까지 생성할 수 있습니다."})
+        self.preload(items)
+        out = []
+        for item in items:
+            try:
+                obj = WatchTransaction(**self.child.run_validation(item))
+                # FK 존재 확인은 preload 로 끝났으므로 제외 (행마다 조회 방지), clean() 이 국가 기본 통화를 고정
+                obj.full_clean(exclude=list(self.related))
+            except serializers.ValidationError as e:
+                out.append((None, e.detail))
+            except DjangoValidationError as e:
+                out.append((None, e.message_dict))
+            else:
+                out.append((obj, {}))
+        return out
+
+
+class WatchTransactionSerializer(SparseSerializerMixin, serializers.ModelSerializer):
     currency = serializers.CharField(read_only=True)   # ✅ 읽기전용
+    serializer_related_field = PreloadedPrimaryKeyRelatedField
 
     class Meta:
         model = WatchTransaction
+        list_serializer_class = WatchTransactionListSerializer
+        expandable = {
+            "watch_variant": (WatchVariantSerializer, "watch_variant", "watch_variant__watch_model__brand"),
+            "country": (CountrySerializer, "country", "country"),
+            "brand": (BrandSerializer, "watch_variant.watch_model.brand", "watch_variant__watch_model__brand"),
+        }
         fields = [
             "id","watch_variant","year","transaction_type","country","currency",
-            "price","price_min","price_max","note","url","created_at"
+            "price","price_min","price_max","note","url","created_at",
+            "price_krw","price_min_krw","price_max_krw","krw_rate","krw_rate_date",
         ]
 
     def validate(self, data):
@@ -65,7 +144,7 @@ class WatchTransactionSerializer(serializers.ModelSerializer):
             data["price"] = None
         return data
 
-class ExchangeRateSerializer(serializers.ModelSerializer):
+class ExchangeRateSerializer(SparseSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = ExchangeRate
         fields = "__all__"
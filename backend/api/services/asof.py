@@ -0,0 +1,121 @@
+# api/services/asof.py
+from __future__ import annotations
+
+import datetime
+from decimal import Decimal
+
+import numpy as np
+
+from api.models import ExchangeRate
+from api.services import money
+from api.services.fx_engine import rate_engine
+
+# 환산 기준 시점: latest = 최신 환율(환율 엔진), transaction = 거래일 기준 as-of 환율
+CONVERT_AT = ("latest", "transaction")
+
+
+class AsOfRates:
+    """
+    특정 quote 에 대한 통화별 환율 이력 (정렬된 날짜/환율 배열).
+    - 생성 시 DB 한 번 조회: base/quote 가 모두 (요청 통화 ∪ quote ∪ 피벗 통화) 인 환율 이력
+    - 통화마다 환율 엔진(fx_engine)과 같은 우선순위로 날짜별 환율 시계열을 만든다:
+      직접(base→quote) → 역수(quote→base) → 피벗(settings.FX_PIVOTS) 경유 (다리는 직접 또는 역수)
+      계산은 Decimal 로 하고 최종 환율만 소수 8자리로 반올림
+    - 각 날짜에 대해 "그 날짜 이전(포함) 가장 최근" 환율을 searchsorted 로 조회
+      (단건: rate() → Decimal, 행 배열: convert_int() → 소수 8자리 고정소수점 정수)
+    """
+
+    def __init__(self, quote: str, bases):
+        self.quote = (quote or "").upper()
+        self._series: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+
+        bases = {(b or "").upper() for b in bases if b} - {self.quote}
+        if not bases:
+            return
+        pivots = [p for p in rate_engine.pivots if p != self.quote]
+        codes = bases | set(pivots) | {self.quote}
+
+        rows = (
+            ExchangeRate.objects
+            .filter(base__in=codes, quote__in=codes)
+            .order_by("base", "quote", "date")
+            .values_list("base", "quote", "date", "rate")
+        )
+        legs: dict[tuple[str, str], tuple[list, list]] = {}
+        for base, quote, day, rate in rows:
+            dates, rates = legs.setdefault((base.upper(), quote.upper()), ([], []))
+            dates.append(day)
+            rates.append(Decimal(rate))
+        self._legs = {pair: (np.array(d, dtype="datetime64[D]"), r) for pair, (d, r) in legs.items()}
+
+        for code in bases:
+            series = self._resolve(code, [p for p in pivots if p != code])
+            if series is not None:
+                self._series[code] = series
+        del self._legs
+
+    def _leg(self, base: str, quote: str, day) -> Decimal | None:
+        """day 시점의 base→quote 직접 환율, 없으면 quote→base 역수 (반올림 없음)."""
+        for pair, inverse in (((base, quote), False), ((quote, base), True)):
+            leg = self._legs.get(pair)
+            if leg is None:
+                continue
+            idx = int(np.searchsorted(leg[0], day, side="right")) - 1
+            if idx >= 0:
+                return 1 / leg[1][idx] if inverse else leg[1][idx]
+        return None
+
+    def _resolve(self, code: str, pivots: list[str]):
+        """통화 하나의 (변경 날짜 배열, 고정소수점 정수 환율 배열). 어떤 경로로도 구할 수 없으면 None."""
+        related = [(code, self.quote), (self.quote, code)]
+        for p in pivots:
+            related += [(code, p), (p, code), (p, self.quote), (self.quote, p)]
+        dates = [self._legs[pair][0] for pair in related if pair in self._legs]
+        if not dates:
+            return None
+        out_dates, out_rates = [], []
+        for day in np.unique(np.concatenate(dates)):
+            rate = self._leg(code, self.quote, day)
+            for p in pivots if rate is None else ():
+                first, second = self._leg(code, p, day), self._leg(p, self.quote, day)
+                if first is not None and second is not None:
+                    rate = first * second
+                    break
+            if rate is not None:
+                out_dates.append(day)
+                out_rates.append(money.rate_to_int(rate))  # 최종 환율만 소수 8자리 half-up
+        if not out_dates:
+            return None
+        return np.array(out_dates, dtype="datetime64[D]"), np.array(out_rates, dtype=np.int64)
+
+    def rate(self, base: str, day: datetime.date) -> Decimal | None:
+        """단건 as-of 환율 (정렬된 날짜 배열에서 이진 탐색, 소수 8자리 Decimal). 없으면 None."""
+        base = (base or "").upper()
+        if base == self.quote:
+            return Decimal(1)
+        series = self._series.get(base)
+        if series is None or day is None:
+            return None
+        dates, rate_int = series
+        idx = int(np.searchsorted(dates, np.datetime64(day, "D"), side="right")) - 1
+        return money.rate_from_int(rate_int[idx]) if idx >= 0 else None
+
+    def convert_int(self, currencies: np.ndarray, days: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """행별 (통화, 날짜) → (고정소수점 정수 환율 배열, 환율 있음 마스크)."""
+        days = np.asarray(days, dtype="datetime64[D]")
+        out = np.zeros(len(currencies), dtype=np.int64)
+        ok = np.zeros(len(currencies), dtype=bool)
+        for code in np.unique(currencies):
+            mask = currencies == code
+            code = str(code).upper()
+            if code == self.quote:
+                out[mask], ok[mask] = money.RATE_SCALE, True
+                continue
+            series = self._series.get(code)
+            if series is None:
+                continue
+            dates, rate_int = series
+            idx = np.searchsorted(dates, days[mask], side="right") - 1
+            out[mask] = rate_int[np.clip(idx, 0, None)]
+            ok[mask] = idx >= 0
+        return out, ok
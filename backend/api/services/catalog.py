@@ -0,0 +1,44 @@
+# api/services/catalog.py
+from django.core.files.storage import default_storage
+
+from api.models import Brand, WatchModel, WatchVariant
+
+CATALOG_MODELS = (Brand, WatchModel, WatchVariant)
+
+
+def _media_url(name):
+    return default_storage.url(name) if name else None
+
+
+def build_tree() -> list[dict]:
+    """
+    브랜드 → 모델 → 변형 트리.
+    평평한 values() 조회 3번 후 메모리에서 id 로 조립 (N+1 없음).
+    """
+    brands = {}
+    for b in Brand.objects.order_by("name_en").values("id", "name_en", "name_ko", "logo"):
+        b["logo"] = _media_url(b["logo"])
+        b["models"] = []
+        brands[b["id"]] = b
+
+    models = {}
+    for m in WatchModel.objects.order_by("nickname", "id").values("id", "brand_id", "nickname", "image"):
+        brand = brands.get(m.pop("brand_id"))
+        if brand is None:
+            continue
+        m["image"] = _media_url(m["image"])
+        m["variants"] = []
+        models[m["id"]] = m
+        brand["models"].append(m)
+
+    variants = WatchVariant.objects.order_by("model_number").values(
+        "id", "watch_model_id", "model_number", "color", "color_code", "image"
+    )
+    for v in variants:
+        model = models.get(v.pop("watch_model_id"))
+        if model is None:
+            continue
+        v["image"] = _media_url(v["image"])
+        model["variants"].append(v)
+
+    return list(brands.values())
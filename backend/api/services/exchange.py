@@ -1,93 +1,270 @@
 # api/services/exchange.py
 from __future__ import annotations
 import datetime
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from decimal import Decimal
 import requests
-from django.db import transaction
-from api.models import ExchangeRate
+from django.conf import settings
+from django.db import connection, transaction
+from requests.adapters import HTTPAdapter
+from api import versioning
+from api.cache import TwoTierCache
+from api.models import ExchangeRate, LatestExchangeRate
+from api.services import fx_engine
+from api.services.fx_providers import ProviderManager
 
 TIMEOUT = 10
+RATE_QUANT = Decimal("0.00000001")  # ExchangeRate.rate decimal_places=8
+UPSERT_BATCH_SIZE = 1000
+
+# 프로바이더 호출용 공유 세션: 호스트별 커넥션을 재사용 (스레드 수만큼 풀 유지)
+_http = requests.Session()
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(getattr(settings, "FX_FETCH_WORKERS", 4), 1))
+_http.mount("https://", _adapter)
+_http.mount("http://", _adapter)
 
 def _as_decimal(x) -> Decimal:
     return Decimal(str(x))
 
-# --- Provider 1: exchangerate.host ---
-def _fetch_exchangerate_host(base: str, quote: str, on_date: datetime.date | None):
-    base, quote = base.upper(), quote.upper()
-    url = f"https://api.exchangerate.host/{on_date.isoformat()}" if on_date else "https://api.exchangerate.host/latest"
-    r = requests.get(url, params={"base": base, "symbols": quote}, timeout=TIMEOUT)
-    r.raise_for_status()
-    data = r.json()
-    # 일부 플랜/정책에 따라 base 변경이 막히면 rates가 비어있습니다.
-    rate = (data.get("rates") or {}).get(quote)
-    return _as_decimal(rate) if rate is not None else None
-
-# --- Provider 2: frankfurter.app (ECB) ---
-def _fetch_frankfurter(base: str, quote: str, on_date: datetime.date | None):
-    base, quote = base.upper(), quote.upper()
-    # frankfurter는 EUR 기준이 기본. base→quote 를 직접 요청하되, 일부 통화 미지원이면 None
-    url = f"https://api.frankfurter.app/{on_date.isoformat()}" if on_date else "https://api.frankfurter.app/latest"
-    r = requests.get(url, params={"from": base, "to": quote}, timeout=TIMEOUT)
-    r.raise_for_status()
-    data = r.json()
-    rate = (data.get("rates") or {}).get(quote)
-    return _as_decimal(rate) if rate is not None else None
-
-# --- Provider 3: open.er-api.com ---
-def _fetch_erapi(base: str, quote: str, on_date: datetime.date | None):
-    # open.er-api는 과거 데이터가 없어 latest만 제공하므로 on_date는 무시
-    base, quote = base.upper(), quote.upper()
-    r = requests.get(f"https://open.er-api.com/v6/latest/{base}", timeout=TIMEOUT)
+def _url(provider: str) -> str:
+    return settings.FX_PROVIDER_URLS[provider].rstrip("/")
+
+def _get_json(url: str, params: dict | None = None) -> dict:
+    r = _http.get(url, params=params, timeout=TIMEOUT)
     r.raise_for_status()
-    data = r.json()
-    if data.get("result") != "success":
-        return None
-    rates = data.get("rates") or {}
-    rate = rates.get(quote)
-    return _as_decimal(rate) if rate is not None else None
-
-PROVIDERS = [
-    ("exchangerate.host", _fetch_exchangerate_host),
-    ("frankfurter.app",  _fetch_frankfurter),
-    ("open.er-api.com",  _fetch_erapi),
-]
+    return r.json()
 
-@transaction.atomic
-def get_or_fetch_rate(base: str, quote: str, on_date: datetime.date | None = None, allow_fetch: bool = True) -> ExchangeRate | None:
-    base = (base or "").upper()
-    quote = (quote or "").upper()
-
-    # 1) 자기자신 환율은 1.0
-    if base and quote and base == quote:
-        date_val = on_date or datetime.date.today()
-        obj, _ = ExchangeRate.objects.get_or_create(
-            base=base, quote=quote, date=date_val,
-            defaults={"rate": Decimal("1.0"), "source": "identity"}
+def sync_latest_rates(pairs) -> None:
+    """
+    (base, quote) 쌍들의 LatestExchangeRate 를 ExchangeRate 최신 행에 맞춘다 (추가/수정/삭제 공통).
+    쌍마다 unique (base, quote, date) 인덱스를 역순으로 한 행만 읽으므로 이력 길이와 무관.
+    ExchangeRate 를 쓴 트랜잭션 안에서 호출해야 두 테이블이 함께 커밋된다.
+    """
+    for base, quote in set(pairs):
+        row = (
+            ExchangeRate.objects.filter(base=base, quote=quote)
+            .order_by("-date", "-id")
+            .values_list("id", "date", "rate", "source")
+            .first()
         )
-        return obj
-
-    # 2) DB에서 먼저 조회
-    qs = ExchangeRate.objects.filter(base=base, quote=quote)
-    if on_date:
-        qs = qs.filter(date=on_date)
-    obj = qs.order_by("-date").first()
-    if obj:
-        return obj
-
-    if not allow_fetch:
-        return None
-
-    # 3) 외부 API 폴백 시도
-    for src, fn in PROVIDERS:
-        try:
-            rate = fn(base, quote, on_date)
-            if rate is not None:
-                date_val = on_date or datetime.date.today()
-                return ExchangeRate.objects.create(
-                    base=base, quote=quote, date=date_val, rate=rate, source=src
-                )
-        except Exception:
-            # 다음 프로바이더로 폴백
+        key = {"base": base.upper(), "quote": quote.upper()}
+        if row is None:
+            LatestExchangeRate.objects.filter(**key).delete()
             continue
+        rid, date, rate, source = row
+        LatestExchangeRate.objects.update_or_create(
+            **key, defaults={"row_id": rid, "date": date, "rate": rate, "source": source}
+        )
+
+def notify_rates_changed() -> None:
+    """
+    ExchangeRate 변경 알림: 환율 엔진 버전 bump + 커밋 후 이 워커의 엔진 스냅샷 무효화
+    (다른 워커는 버전 비교로 감지). 시그널(단건 저장/삭제)과 bulk upsert(시그널 없음) 양쪽에서 호출.
+    """
+    versioning.bump_label(fx_engine.VERSION_LABEL)
+    # 커밋 후에 무효화해야 커밋 전 상태로 다시 스냅샷을 만들지 않는다
+    transaction.on_commit(fx_engine.rate_engine.mark_stale)
+
+# --- 일괄 수집: 프로바이더 호출 한 번에 anchor 기준 여러 통화 → {통화: 환율(1 anchor = x 통화)} ---
+def _fetch_many_exchangerate_host(anchor: str, symbols: list[str], on_date: datetime.date | None):
+    url = f"{_url('exchangerate.host')}/{on_date.isoformat() if on_date else 'latest'}"
+    data = _get_json(url, params={"base": anchor, "symbols": ",".join(symbols)})
+    return data.get("rates") or {}
+
+def _fetch_many_frankfurter(anchor: str, symbols: list[str], on_date: datetime.date | None):
+    url = f"{_url('frankfurter.app')}/{on_date.isoformat() if on_date else 'latest'}"
+    data = _get_json(url, params={"from": anchor, "to": ",".join(symbols)})
+    return data.get("rates") or {}
+
+def _fetch_many_erapi(anchor: str, symbols: list[str], on_date: datetime.date | None):
+    # 과거 데이터가 없으므로 오늘(또는 날짜 미지정) 요청에만 사용 → 과거 날짜에 최신 환율이 저장되지 않도록
+    if on_date and on_date != datetime.date.today():
+        return {}
+    data = _get_json(f"{_url('open.er-api.com')}/latest/{anchor}")
+    if data.get("result") != "success":
+        return {}
+    return data.get("rates") or {}
+
+BATCH_PROVIDERS = [
+    ("exchangerate.host", _fetch_many_exchangerate_host),
+    ("frankfurter.app",  _fetch_many_frankfurter),
+    ("open.er-api.com",  _fetch_many_erapi),
+]
+batch_providers = ProviderManager(BATCH_PROVIDERS)
+
+# --- 기간 수집: 호출 한 번에 [start, end] 전체 → {"YYYY-MM-DD": {통화: 환율(1 anchor = x 통화)}} ---
+def _fetch_series_frankfurter(anchor: str, symbols: list[str], start: datetime.date, end: datetime.date):
+    data = _get_json(f"{_url('frankfurter.app')}/{start.isoformat()}..{end.isoformat()}",
+                     params={"from": anchor, "to": ",".join(symbols)})
+    rates = data.get("rates")
+    return rates if isinstance(rates, dict) else None
+
+def _fetch_series_exchangerate_host(anchor: str, symbols: list[str], start: datetime.date, end: datetime.date):
+    data = _get_json(f"{_url('exchangerate.host')}/timeseries", params={
+        "start_date": start.isoformat(), "end_date": end.isoformat(), "base": anchor, "symbols": ",".join(symbols),
+    })
+    rates = data.get("rates")
+    return rates if isinstance(rates, dict) else None
+
+# open.er-api 는 과거 데이터가 없어 제외. 빈 응답({})도 정상(기간이 모두 휴일)이므로 None 만 실패로 본다
+SERIES_PROVIDERS = [
+    ("frankfurter.app",  _fetch_series_frankfurter),
+    ("exchangerate.host", _fetch_series_exchangerate_host),
+]
+series_providers = ProviderManager(SERIES_PROVIDERS)
+
+class SeriesUnavailable(Exception):
+    """모든 시계열 프로바이더가 실패 (서킷 OPEN 포함). 백필은 해당 구간을 실패로 남기고 재실행 때 다시 시도."""
+
+# 외부 조회 결과 캐시: 같은 (anchor, 통화들, 날짜/기간) 을 동시에 수집하는 실행(예약 작업과 수동 실행, 겹치는 백필)은
+# 프로바이더 호출 한 번을 공유(single-flight)하고, 빈 결과/전체 실패도 잠깐 캐시(negative cache)해
+# 재시도가 매번 모든 프로바이더를 다시 두드리지 않게 한다. 수집은 DB 트랜잭션 밖에서만 일어난다 (저장은 upsert_rates).
+# lock_timeout 은 프로바이더 전체 타임아웃보다 길어야 대기자가 중복 조회를 시작하지 않는다.
+FETCH_CACHE_TTL = 60
+fetch_cache = TwoTierCache(
+    "fx_fetch", ttl=FETCH_CACHE_TTL,
+    lock_timeout=TIMEOUT * max(len(BATCH_PROVIDERS), len(SERIES_PROVIDERS)) + 5,
+)
+
+def _shared_fetch(kind: str, parts, load):
+    """fetch_cache 를 거친 수집 → (결과, 이 호출이 보낸 요청 수). 캐시/다른 실행에서 받은 결과면 요청 수 0."""
+    calls = 0
+
+    def loader():
+        nonlocal calls
+        value, calls = load()
+        return value
+
+    key = hashlib.sha1("|".join([kind, *map(str, parts)]).encode()).hexdigest()
+    return fetch_cache.get_or_set(key, loader), calls
+
+@dataclass
+class FetchResult:
+    rates: list = field(default_factory=list)    # 미저장 ExchangeRate
+    missing: list = field(default_factory=list)  # (date, base, quote)
+    calls: int = 0                               # 프로바이더 HTTP 호출 수
+
+def _fetch_anchor_rates(anchor: str, codes: set[str], on_date: datetime.date | None) -> tuple[dict, int]:
+    """
+    anchor 기준 환율 ({통화: (Decimal, source)}, 호출 수).
+    앞 프로바이더(상태 순)에 없는 통화만 다음 프로바이더에 요청.
+    """
+    found, calls, used = {anchor: (Decimal(1), None)}, 0, set()
+    while missing := sorted(codes - found.keys()):
+        outcome = batch_providers.call(anchor, missing, on_date, accept=bool, exclude=used)
+        calls += outcome.attempts
+        if outcome.provider is None:
+            break
+        used.add(outcome.provider)
+        for code in missing:
+            value = outcome.result.get(code)
+            if value:
+                found[code] = (_as_decimal(value), outcome.provider)
+    return found, calls
+
+def _pairs(bases, quotes) -> list[tuple[str, str]]:
+    bases = {b.upper() for b in bases if b}
+    quotes = {q.upper() for q in quotes if q}
+    return sorted((b, q) for b in bases for q in quotes if b != q)
+
+def _cross_rates(found: dict, pairs, on_date: datetime.date) -> tuple[list, list]:
+    """anchor 기준 환율 → (ExchangeRate 목록, 누락 (date, base, quote) 목록)."""
+    rows, missing = [], []
+    for b, q in pairs:
+        if b in found and q in found:
+            (rb, sb), (rq, sq) = found[b], found[q]
+            source = "+".join(sorted({s for s in (sb, sq) if s})) or "identity"
+            rows.append(ExchangeRate(base=b, quote=q, date=on_date,
+                                     rate=(rq / rb).quantize(RATE_QUANT), source=source[:50]))
+        else:
+            missing.append((on_date, b, q))
+    return rows, missing
+
+def fetch_rates(bases, quotes, dates, workers: int | None = None) -> FetchResult:
+    """
+    (bases × quotes × dates) 환율을 일괄 수집 (DB 저장은 하지 않음 → upsert_rates).
+    - 날짜마다 프로바이더 호출 한 번으로 anchor(settings.FX_FETCH_ANCHOR) 기준 모든 통화를 받아
+      base→quote = rate(quote) / rate(base) 로 교차 계산 (quote 수와 무관)
+    - 여러 날짜는 스레드 풀(workers)에서 공유 세션으로 병렬 호출
+    - 같은 날짜를 동시에 수집하는 다른 실행과는 호출을 공유 (fetch_cache)
+    """
+    anchor = getattr(settings, "FX_FETCH_ANCHOR", "USD").upper()
+    pairs = _pairs(bases, quotes)
+    codes = {c for pair in pairs for c in pair}
+    result = FetchResult()
+
+    def one(on_date):
+        found, calls = _shared_fetch("batch", (anchor, ",".join(sorted(codes)), on_date or "latest"),
+                                     lambda: _fetch_anchor_rates(anchor, codes, on_date))
+        return (*_cross_rates(found, pairs, on_date), calls)
+
+    workers = workers or getattr(settings, "FX_FETCH_WORKERS", 4)
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(dates) or 1))) as pool:
+        for rows, missing, calls in pool.map(one, dates):
+            result.rates.extend(rows)
+            result.missing.extend(missing)
+            result.calls += calls
+    return result
+
+def fetch_rate_series(bases, quotes, start: datetime.date, end: datetime.date) -> FetchResult:
+    """
+    기간 환율: 시계열 프로바이더(SERIES_PROVIDERS, 상태 순·서킷 브레이커) 호출 한 번으로 기간 전체를 받는다.
+    고시일(영업일)만 응답에 포함되므로 주말/휴일은 missing 으로 남는다. 모두 실패하면 SeriesUnavailable.
+    """
+    anchor = getattr(settings, "FX_FETCH_ANCHOR", "USD").upper()
+    pairs = _pairs(bases, quotes)
+    symbols = sorted({c for pair in pairs for c in pair} - {anchor})
+
+    def load():
+        outcome = series_providers.call(anchor, symbols, start, end)
+        return (None if outcome.provider is None else (outcome.result, outcome.provider)), outcome.attempts
+
+    fetched, calls = _shared_fetch("series", (anchor, ",".join(symbols), start, end), load)
+    if fetched is None:
+        raise SeriesUnavailable(f"{start} ~ {end}: 시계열 프로바이더 호출 실패")
+    series, provider = fetched
+
+    by_day = {}
+    for day, rates in series.items():
+        day = datetime.date.fromisoformat(day)
+        if start <= day <= end:  # 시작일이 휴일이면 직전 영업일부터 응답하므로 잘라낸다
+            by_day[day] = rates or {}
+
+    result = FetchResult(calls=calls)
+    day = start
+    while day <= end:
+        found = {anchor: (Decimal(1), None)}
+        for code, value in by_day.get(day, {}).items():
+            if value:
+                found[code.upper()] = (_as_decimal(value), provider)
+        rows, missing = _cross_rates(found, pairs, day)
+        result.rates.extend(rows)
+        result.missing.extend(missing)
+        day += datetime.timedelta(days=1)
+    return result
+
+def upsert_rates(objs) -> tuple[int, int]:
+    """
+    ExchangeRate 일괄 upsert: (base, quote, date) 충돌 시 rate/source 갱신. → (생성 수, 갱신 수)
+    bulk_create 는 시그널을 보내지 않으므로 최신 환율 테이블 갱신과 엔진 버전/캐시 무효화를 직접 호출한다.
+    """
+    if not objs:
+        return 0, 0
+    keys = {(o.base, o.quote, o.date) for o in objs}
+    existing = set(
+        ExchangeRate.objects
+        .filter(base__in={k[0] for k in keys}, quote__in={k[1] for k in keys}, date__in={k[2] for k in keys})
+        .values_list("base", "quote", "date")
+    ) & keys
 
-    return None
+    options = {"update_conflicts": True, "update_fields": ["rate", "source"]}
+    # MySQL(ON DUPLICATE KEY)은 충돌 대상 컬럼 지정을 지원하지 않는다
+    if connection.features.supports_update_conflicts_with_target:
+        options["unique_fields"] = ["base", "quote", "date"]
+    with transaction.atomic():
+        ExchangeRate.objects.bulk_create(objs, batch_size=UPSERT_BATCH_SIZE, **options)
+        sync_latest_rates({(o.base, o.quote) for o in objs})
+        notify_rates_changed()
+    return len(keys) - len(existing), len(existing)
@@ -0,0 +1,163 @@
+# api/services/fx_backfill.py
+from __future__ import annotations
+
+import datetime
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+import requests
+
+from api.models import ExchangeRate
+from api.services.exchange import SeriesUnavailable, _pairs, fetch_rate_series, upsert_rates
+
+CHUNK_DAYS = 90  # 시계열 호출 한 번에 요청할 최대 일수
+
+
+class RateLimiter:
+    """초당 호출 수 제한 (스레드 간 공유). per_second 가 0/None 이면 제한 없음."""
+
+    def __init__(self, per_second: float | None):
+        self.interval = 1.0 / per_second if per_second else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            at = max(now, self._next)
+            self._next = at + self.interval
+        if at > now:
+            time.sleep(at - now)
+
+
+@dataclass
+class BackfillResult:
+    created: int = 0
+    updated: int = 0
+    calls: int = 0
+    skipped_days: int = 0                          # 이미 저장됐거나 체크포인트에 완료로 남은 날짜
+    missing: list = field(default_factory=list)   # 프로바이더에 없는 (date, base, quote)
+    failed: list = field(default_factory=list)    # 호출 실패 구간 (start, end, error)
+
+
+class RateBackfill:
+    """
+    기간 환율 백필.
+    - 필요한 (base, quote, date) 중 이미 저장된 것을 조회 한 번으로 빼고(차집합), 남은 날짜만 연속 구간으로 묶는다
+    - 구간마다 시계열 프로바이더 호출 한 번 (최대 chunk_days 일), 스레드 풀 + 초당 호출 제한
+    - 구간이 끝날 때마다 bulk upsert 후 체크포인트 파일에 완료 날짜 기록 → 중단 후 재실행 시 이어서 진행
+      (DB 에 저장된 날짜는 차집합으로, 휴일처럼 응답이 없는 날짜는 체크포인트로 건너뜀.
+       완료 후에도 체크포인트를 남겨 같은 기간 재실행 시 휴일을 다시 요청하지 않는다)
+    """
+
+    def __init__(self, bases, quotes, start: datetime.date, end: datetime.date, *,
+                 workers: int = 4, rate_limit: float | None = None, chunk_days: int = CHUNK_DAYS,
+                 checkpoint: str | None = None, dry_run: bool = False):
+        self.pairs = _pairs(bases, quotes)
+        self.start, self.end = start, end
+        self.workers = max(1, workers)
+        self.chunk_days = max(1, chunk_days)
+        self.limiter = RateLimiter(rate_limit)
+        self.checkpoint = checkpoint
+        self.dry_run = dry_run
+        self._existing: set = set()
+
+    # ---- planning ----
+    def _signature(self) -> dict:
+        return {"pairs": [list(p) for p in self.pairs], "from": self.start.isoformat(), "to": self.end.isoformat()}
+
+    def _load_checkpoint(self) -> set[datetime.date]:
+        if not self.checkpoint or not os.path.exists(self.checkpoint):
+            return set()
+        try:
+            with open(self.checkpoint, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return set()
+        if data.get("signature") != self._signature():  # 다른 인자로 만든 체크포인트는 무시
+            return set()
+        return {datetime.date.fromisoformat(d) for d in data.get("done", [])}
+
+    def _save_checkpoint(self, done: set[datetime.date]) -> None:
+        if not self.checkpoint:
+            return
+        tmp = f"{self.checkpoint}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"signature": self._signature(), "done": sorted(d.isoformat() for d in done)}, f)
+        os.replace(tmp, self.checkpoint)  # 중간에 죽어도 파일이 깨지지 않도록
+
+    def pending_days(self) -> list[datetime.date]:
+        """기간 내 저장되지 않은 (base, quote, date) 가 하나라도 있는 날짜 (DB 조회 한 번)."""
+        if not self.pairs:
+            return []
+        self._existing = existing = set(
+            ExchangeRate.objects
+            .filter(date__range=(self.start, self.end),
+                    base__in={b for b, _ in self.pairs}, quote__in={q for _, q in self.pairs})
+            .values_list("base", "quote", "date")
+        )
+        days, day = [], self.start
+        while day <= self.end:
+            if any((b, q, day) not in existing for b, q in self.pairs):
+                days.append(day)
+            day += datetime.timedelta(days=1)
+        return days
+
+    def ranges(self, days: list[datetime.date]) -> list[tuple[datetime.date, datetime.date]]:
+        """날짜 목록 → 연속 구간(최대 chunk_days 일)."""
+        out = []
+        for day in days:
+            if out and day - out[-1][1] == datetime.timedelta(days=1) and (day - out[-1][0]).days < self.chunk_days:
+                out[-1] = (out[-1][0], day)
+            else:
+                out.append((day, day))
+        return out
+
+    # ---- run ----
+    def _fetch(self, start, end):
+        self.limiter.wait()
+        return fetch_rate_series([b for b, _ in self.pairs], [q for _, q in self.pairs], start, end)
+
+    def run(self, progress=None) -> BackfillResult:
+        result = BackfillResult()
+        done = self._load_checkpoint()
+        total = (self.end - self.start).days + 1
+        days = [d for d in self.pending_days() if d not in done]
+        result.skipped_days = total - len(days)
+        wanted = set(self.pairs)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self._fetch, s, e): (s, e) for s, e in self.ranges(days)}
+            for future in as_completed(futures):
+                start, end = futures[future]
+                try:
+                    fetched = future.result()
+                except (SeriesUnavailable, requests.RequestException, ValueError) as e:
+                    result.failed.append((start, end, str(e)))
+                    continue
+                # 이미 저장된 행은 건드리지 않는다 (신규만 INSERT → 환율 엔진 증분 로드)
+                rows = [r for r in fetched.rates
+                        if (r.base, r.quote) in wanted and (r.base, r.quote, r.date) not in self._existing]
+                if self.dry_run:
+                    created, updated = len(rows), 0
+                else:
+                    created, updated = upsert_rates(rows)  # 저장은 메인 스레드에서 (DB 커넥션 하나)
+                result.created += created
+                result.updated += updated
+                result.calls += fetched.calls
+                result.missing.extend(fetched.missing)
+                day = start
+                while day <= end:
+                    done.add(day)
+                    day += datetime.timedelta(days=1)
+                if not self.dry_run:
+                    self._save_checkpoint(done)
+                if progress:
+                    progress(start, end, len(rows))
+        return result
@@ -0,0 +1,202 @@
+# api/services/fx_engine.py
+from __future__ import annotations
+
+import datetime
+import threading
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+import numpy as np
+from django.conf import settings
+
+from api import versioning
+from api.models import LatestExchangeRate
+from api.services import money
+
+# ExchangeRate 변경 신호 (api.services.exchange.notify_rates_changed 에서 bump)
+VERSION_LABEL = "api.exchangerate"
+
+DIRECT, INVERSE = 0, 1  # via 행렬 값 (2 이상은 피벗 인덱스 + 2)
+RATE_QUANT = Decimal("0.00000001")  # ExchangeRate.rate decimal_places=8
+
+
+@dataclass
+class _Snapshot:
+    """불변 스냅샷. 재로드 시 새로 만들어 통째로 교체하므로 읽기에 락이 필요 없다."""
+    index: dict[str, int] = field(default_factory=dict)
+    currencies: list[str] = field(default_factory=list)
+    direct: np.ndarray = field(default_factory=lambda: np.empty((0, 0)))   # 저장된 최신 환율 (NaN=없음)
+    effective: np.ndarray = field(default_factory=lambda: np.empty((0, 0)))  # 역수/삼각 보간 포함
+    via: np.ndarray = field(default_factory=lambda: np.empty((0, 0), dtype=np.int8))
+    # (base, quote) → (date, id, Decimal rate) : 원본 정밀도 보존
+    cells: dict[tuple[str, str], tuple] = field(default_factory=dict)
+    pivots: list[str] = field(default_factory=list)  # via 의 피벗 인덱스 해석용 (구성 당시 설정)
+
+
+class RateEngine:
+    """
+    프로세스 전역 환율 엔진.
+    - 모든 (base, quote) 최신 환율을 n×n 배열로 보관 → 조회 O(1)
+    - 없는 쌍은 역수(quote→base) 또는 피벗 통화(settings.FX_PIVOTS) 경유 삼각 환산으로 미리 채움
+    - ExchangeRate 버전이 바뀌면 LatestExchangeRate((base, quote) 별 1행)에서 다시 구성 → 이력 길이와 무관
+    """
+
+    def __init__(self, check_interval: float = 1.0):
+        self.check_interval = check_interval
+        self._snap = _Snapshot()
+        self._lock = threading.Lock()
+        self._version = None
+        self._checked_at = 0.0
+
+    @property
+    def pivots(self) -> list[str]:
+        return [p.upper() for p in getattr(settings, "FX_PIVOTS", ["USD", "KRW", "EUR"])]
+
+    # ---- loading ----
+    def _ensure_fresh(self) -> _Snapshot:
+        now = time.monotonic()
+        if self._version is not None and now - self._checked_at < self.check_interval:
+            return self._snap
+        with self._lock:
+            if self._version is not None and now - self._checked_at < self.check_interval:
+                return self._snap
+            current = versioning.get_label_versions(VERSION_LABEL)[VERSION_LABEL][0]
+            if current != self._version:
+                self._snap = self._build()
+            self._version = current
+            self._checked_at = time.monotonic()
+            return self._snap
+
+    def mark_stale(self) -> None:
+        """같은 프로세스의 쓰기 직후 다음 조회에서 바로 버전을 확인하도록."""
+        self._checked_at = 0.0
+
+    def _build(self) -> _Snapshot:
+        rows = LatestExchangeRate.objects.order_by().values_list("row_id", "base", "quote", "date", "rate")
+        cells = {(base.upper(), quote.upper()): (date, rid, rate) for rid, base, quote, date, rate in rows}
+
+        currencies = sorted({c for pair in cells for c in pair} | set(self.pivots))
+        index = {c: i for i, c in enumerate(currencies)}
+        n = len(currencies)
+        direct = np.full((n, n), np.nan)
+        for (b, q), (_, _, rate) in cells.items():
+            direct[index[b], index[q]] = float(rate)
+        np.fill_diagonal(direct, 1.0)
+
+        # 역수 → 피벗 경유 순으로 빈 칸 채우기 (행렬 연산, 통화 수 n 에 대해 O(n²·피벗))
+        via = np.where(np.isnan(direct), -1, DIRECT).astype(np.int8)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inverse = 1.0 / direct.T
+        effective = np.where(np.isnan(direct), inverse, direct)
+        via[(via < 0) & ~np.isnan(effective)] = INVERSE
+        for k, pivot in enumerate(self.pivots):
+            p = index[pivot]
+            candidate = effective[:, p][:, None] * effective[p, :][None, :]
+            fill = np.isnan(effective) & ~np.isnan(candidate)
+            effective[fill] = candidate[fill]
+            via[fill] = k + 2
+
+        return _Snapshot(index=index, currencies=currencies, direct=direct,
+                         effective=effective, via=via, cells=cells, pivots=self.pivots)
+
+    # ---- lookups ----
+    def rate(self, base: str, quote: str) -> float | None:
+        snap = self._ensure_fresh()
+        base, quote = (base or "").upper(), (quote or "").upper()
+        if base == quote and base:
+            return 1.0
+        i, j = snap.index.get(base), snap.index.get(quote)
+        if i is None or j is None:
+            return None
+        r = snap.effective[i, j]
+        return None if np.isnan(r) else float(r)
+
+    def detail(self, base: str, quote: str) -> tuple[Decimal, datetime.date | None] | None:
+        """
+        정확한(Decimal) 환율과 기준일. 저장 가격 정규화처럼 float 오차가 없어야 하는 곳에서 사용.
+        역수/피벗 경유 환율은 구성 환율(Decimal)로 다시 계산해 최종 값만 소수 8자리로 반올림,
+        기준일은 구성 환율 중 가장 오래된 날짜.
+        """
+        snap = self._ensure_fresh()
+        base, quote = (base or "").upper(), (quote or "").upper()
+        if base == quote and base:
+            return Decimal(1), None
+        i, j = snap.index.get(base), snap.index.get(quote)
+        if i is None or j is None:
+            return None
+        return self._detail(snap, i, j)
+
+    def _detail(self, snap: _Snapshot, i: int, j: int):
+        found = self._exact(snap, i, j)
+        if found is None:
+            return None
+        rate, day = found
+        # 저장된 직접 환율은 DB 값 그대로, 유도 환율(역수/곱)은 여기서 한 번만 반올림
+        return (rate if snap.via[i, j] == DIRECT else rate.quantize(RATE_QUANT)), day
+
+    def _exact(self, snap: _Snapshot, i: int, j: int):
+        """반올림하지 않은 Decimal 환율과 기준일 (피벗 경유 시 구간별 반올림 오차가 곱해지지 않도록)."""
+        if i == j:
+            return Decimal(1), None
+        via = int(snap.via[i, j])
+        if via < 0:
+            return None
+        if via in (DIRECT, INVERSE):
+            key = (snap.currencies[i], snap.currencies[j]) if via == DIRECT else (snap.currencies[j], snap.currencies[i])
+            day, _, rate = snap.cells[key]
+            rate = Decimal(rate)
+            return (rate if via == DIRECT else 1 / rate), day
+        p = snap.index[snap.pivots[via - 2]]
+        legs = [self._exact(snap, i, p), self._exact(snap, p, j)]
+        if None in legs:
+            return None
+        days = [d for _, d in legs if d]
+        return legs[0][0] * legs[1][0], (min(days) if days else None)
+
+    def rates_map(self, bases, quote: str) -> dict[str, Decimal]:
+        """{base: Decimal 환율} — 구할 수 있는 base 만 포함. 환산/응답용이므로 float 행렬이 아닌 detail() 값."""
+        out = {}
+        for b in {(b or "").upper() for b in bases if b}:
+            detail = self.detail(b, quote)
+            if detail:
+                out[b] = detail[0]
+        return out
+
+    def convert_int(self, currencies: np.ndarray, quote: str) -> tuple[np.ndarray, np.ndarray]:
+        """행별 통화 배열 → (고정소수점 정수 최신 환율 배열, 환율 있음 마스크). AsOfRates.convert_int 의 최신판."""
+        currencies = np.asarray(currencies, dtype=str)
+        codes, inverse = np.unique(currencies, return_inverse=True)
+        details = [self.detail(str(c), quote) if c else None for c in codes]
+        code_rates = np.array([money.rate_to_int(d[0]) if d else 0 for d in details], dtype=np.int64)
+        code_ok = np.array([d is not None for d in details], dtype=bool)
+        if not codes.size:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=bool)
+        return code_rates[inverse], code_ok[inverse]
+
+    def latest(self, quote: str, bases=None) -> tuple[dict[str, str], list[str]]:
+        """
+        quote 기준 최신 환율 문자열 맵과 삼각/역수로 유도된 base 목록.
+        저장된 환율은 DB 값(Decimal) 그대로, 유도 값은 detail() 과 같은 Decimal 계산 (소수 8자리).
+        """
+        snap = self._ensure_fresh()
+        quote = (quote or "").upper()
+        j = snap.index.get(quote)
+        if j is None:
+            return {}, []
+        wanted = [b.upper() for b in bases] if bases else [c for c in snap.currencies if c != quote]
+        rates, derived = {}, []
+        for b in wanted:
+            i = snap.index.get(b)
+            if i is None or np.isnan(snap.effective[i, j]):
+                continue
+            if snap.via[i, j] == DIRECT:
+                cell = snap.cells.get((b, quote))
+                rates[b] = str(cell[2]) if cell else str(Decimal("1"))
+            else:
+                rates[b] = f"{self._detail(snap, i, j)[0]:.8f}"
+                derived.append(b)
+        return rates, derived
+
+
+rate_engine = RateEngine()
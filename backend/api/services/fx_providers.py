@@ -0,0 +1,178 @@
+# api/services/fx_providers.py
+from __future__ import annotations
+
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+EWMA_ALPHA = 0.2          # 지연/오류율 지수이동평균 가중치 (최근 호출 비중)
+UNOBSERVED_LATENCY = 1.0  # 아직 성공 기록이 없는 프로바이더의 가정 지연(초)
+
+Outcome = namedtuple("Outcome", ["result", "provider", "attempts"])
+
+_FAILED = object()
+# 헤지 요청/백그라운드 완료 대기용. 프로바이더 호출은 I/O 대기라 스레드로 충분하다
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="fx-provider")
+
+
+class ProviderHealth:
+    """
+    프로바이더 하나의 상태 (프로세스 단위).
+    - 지연(EWMA, 성공 호출만) / 오류율(EWMA) / 연속 실패 수
+    - 서킷 브레이커: 연속 실패가 threshold 이상이면 OPEN → reset_timeout 후 HALF_OPEN 에서 한 번 시험 호출
+    """
+
+    def __init__(self, name: str, threshold: int, reset_timeout: float):
+        self.name = name
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.calls = self.errors = self.consecutive_failures = 0
+        self.latency = None     # 초, EWMA
+        self.error_rate = 0.0   # 0~1, EWMA
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self._trial = False     # HALF_OPEN 시험 호출 진행 중
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def record(self, ok: bool, elapsed: float) -> None:
+        with self._lock:
+            self.calls += 1
+            self.error_rate += EWMA_ALPHA * ((0.0 if ok else 1.0) - self.error_rate)
+            if ok:
+                self.latency = elapsed if self.latency is None else self.latency + EWMA_ALPHA * (elapsed - self.latency)
+                self.consecutive_failures = 0
+                self.state = CLOSED
+            else:
+                self.errors += 1
+                self.consecutive_failures += 1
+                if self.state == HALF_OPEN or self.consecutive_failures >= self.threshold:
+                    self.state = OPEN
+                    self.opened_at = time.monotonic()
+            self._trial = False
+
+    def score(self) -> float:
+        """낮을수록 우선: 지연 × 오류율 가중. 관측 전에는 UNOBSERVED_LATENCY 로 가정."""
+        latency = UNOBSERVED_LATENCY if self.latency is None else self.latency
+        return latency * (1.0 + 4.0 * self.error_rate) + self.error_rate
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "calls": self.calls,
+                "errors": self.errors,
+                "consecutive_failures": self.consecutive_failures,
+                "error_rate": round(self.error_rate, 4),
+                "latency_ms": None if self.latency is None else round(self.latency * 1000, 1),
+            }
+
+
+class ProviderManager:
+    """
+    프로바이더 목록을 상태 기반으로 호출.
+    - ordered(): OPEN 서킷은 건너뛰고, 관측 지연/오류율 점수 순으로 정렬 (동점이면 등록 순서)
+    - call(): 앞에서부터 호출, accept(result) 를 만족하는 첫 결과 반환. 예외는 실패로 기록 후 다음 프로바이더
+    - hedge_after(초): 첫 호출이 그 시간 안에 끝나지 않으면 다음 프로바이더에 두 번째 요청을 보내 먼저 온 결과 사용
+    프로바이더는 fn(*args) 호출 가능 객체면 되므로 지연을 넣은 가짜 프로바이더로 바꿔 시험할 수 있다.
+    """
+
+    def __init__(self, providers, threshold: int | None = None, reset_timeout: float | None = None,
+                 hedge_after: float | None = None, registry: dict | None = None):
+        self.providers = list(providers)
+        self.threshold = threshold or getattr(settings, "FX_BREAKER_THRESHOLD", 3)
+        self.reset_timeout = reset_timeout if reset_timeout is not None else getattr(settings, "FX_BREAKER_RESET", 30.0)
+        self.hedge_after = hedge_after if hedge_after is not None else getattr(settings, "FX_HEDGE_AFTER", 0)
+        self.registry = registry if registry is not None else _registry
+        for name, _ in self.providers:
+            self.health(name)
+
+    def health(self, name: str) -> ProviderHealth:
+        with _registry_lock:
+            if name not in self.registry:
+                self.registry[name] = ProviderHealth(name, self.threshold, self.reset_timeout)
+            return self.registry[name]
+
+    def ordered(self, exclude=()) -> list:
+        candidates = [(i, name, fn) for i, (name, fn) in enumerate(self.providers) if name not in exclude]
+        candidates.sort(key=lambda c: (self.health(c[1]).score(), c[0]))
+        return [(name, fn) for _, name, fn in candidates]
+
+    def _invoke(self, name, fn, args):
+        started = time.monotonic()
+        try:
+            result = fn(*args)
+        except Exception:
+            self.health(name).record(False, time.monotonic() - started)
+            return _FAILED
+        self.health(name).record(True, time.monotonic() - started)
+        return result
+
+    def call(self, *args, accept=lambda r: r is not None, exclude=()) -> Outcome:
+        # allow() 는 HALF_OPEN 시험 호출 자리를 잡으므로 실제로 호출할 때 확인한다
+        queue = iter([(n, fn) for n, fn in self.ordered(exclude)])
+        attempts = 0
+
+        def next_provider():
+            for name, fn in queue:
+                if self.health(name).allow():
+                    return name, fn
+            return None
+
+        if not self.hedge_after:
+            while (picked := next_provider()) is not None:
+                attempts += 1
+                result = self._invoke(*picked, args)
+                if result is not _FAILED and accept(result):
+                    return Outcome(result, picked[0], attempts)
+            return Outcome(None, None, attempts)
+
+        futures, exhausted = {}, False
+
+        def launch():
+            nonlocal attempts, exhausted
+            picked = next_provider()
+            if picked is None:
+                exhausted = True
+                return
+            attempts += 1
+            futures[_executor.submit(self._invoke, *picked, args)] = picked[0]
+
+        launch()
+        while futures:
+            # 진행 중 요청이 하나뿐이고 다음 후보가 남아 있으면 hedge_after 만큼만 기다린 뒤 두 번째 요청
+            timeout = self.hedge_after if len(futures) < 2 and not exhausted else None
+            done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                launch()
+                continue
+            for future in done:
+                name = futures.pop(future)
+                result = future.result()
+                if result is not _FAILED and accept(result):
+                    # 남은 요청은 백그라운드에서 끝나며 통계만 기록된다
+                    return Outcome(result, name, attempts)
+            if not exhausted:
+                launch()  # 실패/결과 없음 → 다음 후보
+        return Outcome(None, None, attempts)
+
+    def stats(self) -> dict:
+        return {name: self.health(name).as_dict() for name in [n for n, _ in self.ordered()]}
+
+
+_registry: dict[str, ProviderHealth] = {}
+_registry_lock = threading.Lock()
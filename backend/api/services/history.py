@@ -0,0 +1,180 @@
+# api/services/history.py
+from __future__ import annotations
+
+import numpy as np
+
+from api.models import WatchTransaction, WatchTransactionDaily
+from api.services import money
+from api.services.asof import AsOfRates
+from api.services.fx_engine import rate_engine
+from api.services.market import local_days
+from api.services.rollup import HIGH, LOW
+
+BUCKETS = ("day", "week", "month")
+FIELDS = ["bucket_start", "count", "median", "min", "max"]
+# 일 버킷은 롤업 테이블(WatchTransactionDaily)에서 읽으므로 중앙값 대신 평균
+DAILY_FIELDS = ["bucket_start", "count", "mean", "min", "max"]
+
+
+def _fmt(x) -> str:
+    return f"{x:.2f}"
+
+
+def bucket_starts(days: np.ndarray, bucket: str) -> np.ndarray:
+    """datetime64[D] → 버킷 시작일(datetime64[D]). week 은 월요일 시작."""
+    if bucket == "month":
+        return days.astype("datetime64[M]").astype("datetime64[D]")
+    d = days.astype(np.int64)
+    # 1970-01-01 은 목요일 → (d + 3) % 7 == 0 이 월요일
+    return (d - (d + 3) % 7).astype("datetime64[D]")
+
+
+def _series(keys: np.ndarray, mid: np.ndarray, low: np.ndarray, high: np.ndarray) -> list[list]:
+    """
+    keys(버킷 시작일) 별 count/median/min/max 를 정렬+reduceat 로 계산.
+    (키, 값) 으로 정렬해 두면 그룹별 중앙값을 인덱스 연산만으로 얻을 수 있다.
+    """
+    if keys.size == 0:
+        return []
+    order = np.lexsort((mid, keys))
+    keys, mid, low, high = keys[order], mid[order], low[order], high[order]
+
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    counts = np.diff(np.r_[starts, keys.size])
+    median = (mid[starts + (counts - 1) // 2] + mid[starts + counts // 2]) / 2
+    mins = np.minimum.reduceat(low, starts)
+    maxs = np.maximum.reduceat(high, starts)
+
+    return [
+        [str(k), int(n), _fmt(md), _fmt(mn), _fmt(mx)]
+        for k, n, md, mn, mx in zip(keys[starts], counts, median, mins, maxs)
+    ]
+
+
+def _daily_series(keys: np.ndarray, count: np.ndarray, sum_mid: np.ndarray,
+                  low: np.ndarray, high: np.ndarray) -> list[list]:
+    """롤업 행(변형·국가·통화별 일 집계)을 keys(날짜) 별로 합친다: 건수/합계는 더하고 min/max 는 reduceat."""
+    if keys.size == 0:
+        return []
+    order = np.argsort(keys, kind="stable")
+    keys, count, sum_mid, low, high = keys[order], count[order], sum_mid[order], low[order], high[order]
+
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    counts = np.add.reduceat(count, starts)
+    mean = np.add.reduceat(sum_mid, starts) / counts
+    mins = np.minimum.reduceat(low, starts)
+    maxs = np.maximum.reduceat(high, starts)
+
+    return [
+        [str(k), int(n), _fmt(avg), _fmt(mn), _fmt(mx)]
+        for k, n, avg, mn, mx in zip(keys[starts], counts, mean, mins, maxs)
+    ]
+
+
+def _quote_rates(currency: np.ndarray, days: np.ndarray, quote: str, at: str):
+    """행별 (고정소수점 정수 환율, 환율 있음 마스크): latest 는 환율 엔진, transaction 은 날짜 기준 as-of."""
+    if at == "latest":
+        return rate_engine.convert_int(currency, quote)
+    return AsOfRates(quote, set(currency.tolist())).convert_int(currency, days)
+
+
+def _to_quote(values, rates: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # 정수 최소단위 × 고정소수점 환율 → quote 최소단위 (api/services/money.py), 통계용으로만 float 변환
+    minor, ok = money.to_minor_array(values)
+    return money.to_float(money.convert_array(minor, rates)), ok
+
+
+def price_history(variant_ids, quote: str, bucket: str = "month", ttype: str = "sell",
+                  split: bool = False, at: str = "transaction") -> dict:
+    """
+    변형(들)의 버킷별 시세 시계열.
+    - 판매: price / 매입: 중앙값은 (price_min+price_max)/2, min 은 price_min, max 는 price_max 기준
+    - 각 거래는 거래일(created_at, 현지 날짜) 기준 as-of 환율로 quote 환산 (at="latest" 이면 최신 환율)
+    - bucket="day" 는 거래 대신 일별 롤업 행을 읽는다 (daily_history)
+    - split=True 이면 변형별 시계열을 따로 반환
+    """
+    quote = (quote or "KRW").upper()
+    variant_ids = sorted(set(variant_ids))
+    if bucket == "day":
+        return daily_history(variant_ids, quote, ttype=ttype, split=split, at=at)
+    rows = list(
+        WatchTransaction.objects
+        .filter(watch_variant_id__in=variant_ids, transaction_type=ttype)
+        .values_list("watch_variant_id", "created_at", "currency", LOW, HIGH)
+        .order_by()
+    )
+    vid, created, currency, low, high = zip(*rows) if rows else ((),) * 5
+    vid = np.array(vid, dtype=np.int64)
+    days = local_days(created)  # 현지 날짜 (DB 시간대 변환 없이)
+    currency = np.array([(c or "").upper() for c in currency], dtype=str)
+
+    rates, rate_ok = _quote_rates(currency, days, quote, at)
+    low, low_ok = _to_quote(low, rates)
+    high, high_ok = _to_quote(high, rates)
+    ok = rate_ok & low_ok & high_ok
+    vid, days, low, high = vid[ok], days[ok], low[ok], high[ok]
+    keys = bucket_starts(days, bucket)
+    mid = (low + high) / 2
+
+    result = _envelope(variant_ids, quote, bucket, ttype, at, int((~ok).sum()), FIELDS)
+    if split:
+        result["series"] = {
+            str(v): _series(keys[vid == v], mid[vid == v], low[vid == v], high[vid == v])
+            for v in variant_ids
+        }
+    else:
+        result["series"] = _series(keys, mid, low, high)
+    return result
+
+
+def daily_history(variant_ids, quote: str, ttype: str = "sell", split: bool = False,
+                  at: str = "transaction") -> dict:
+    """
+    일 단위 시계열: 거래 테이블 대신 WatchTransactionDaily(변형·국가·유형·일·통화별 롤업) 행만 읽는다.
+    - 롤업의 원 통화 합계/최솟값/최댓값을 읽을 때 환산 → 환율이 바뀌어도 롤업을 다시 쓸 필요가 없다
+    - at="transaction" 은 롤업 날짜 기준 as-of 환율 (거래일 기준 환산과 같은 값)
+    - 롤업에는 개별 가격이 없으므로 중앙값 대신 평균((low+high)/2 의 평균)
+    """
+    rows = list(
+        WatchTransactionDaily.objects
+        .filter(watch_variant_id__in=variant_ids, transaction_type=ttype)
+        .values_list("watch_variant_id", "day", "currency", "count", "sum_low", "sum_high", "min_low", "max_high")
+        .order_by()
+    )
+    vid, day, currency, count, sum_low, sum_high, min_low, max_high = zip(*rows) if rows else ((),) * 8
+    vid = np.array(vid, dtype=np.int64)
+    days = np.array(day, dtype="datetime64[D]")
+    currency = np.array([(c or "").upper() for c in currency], dtype=str)
+    count = np.array(count, dtype=np.int64)
+
+    rates, rate_ok = _quote_rates(currency, days, quote, at)
+    sum_low, _ = _to_quote(sum_low, rates)
+    sum_high, _ = _to_quote(sum_high, rates)
+    low, low_ok = _to_quote(min_low, rates)
+    high, high_ok = _to_quote(max_high, rates)
+    ok = rate_ok & low_ok & high_ok
+    unconverted = int(count[~ok].sum())  # 롤업 행이 아닌 거래 건수
+    vid, keys, count, low, high = vid[ok], days[ok], count[ok], low[ok], high[ok]
+    sum_mid = (sum_low[ok] + sum_high[ok]) / 2
+
+    result = _envelope(variant_ids, quote, "day", ttype, at, unconverted, DAILY_FIELDS)
+    if split:
+        result["series"] = {
+            str(v): _daily_series(keys[vid == v], count[vid == v], sum_mid[vid == v], low[vid == v], high[vid == v])
+            for v in variant_ids
+        }
+    else:
+        result["series"] = _daily_series(keys, count, sum_mid, low, high)
+    return result
+
+
+def _envelope(variant_ids, quote, bucket, ttype, at, unconverted, fields) -> dict:
+    return {
+        "watch_variants": variant_ids,
+        "quote": quote,
+        "bucket": bucket,
+        "type": ttype,
+        "convert_at": at,
+        "unconverted": unconverted,
+        "fields": fields,
+    }
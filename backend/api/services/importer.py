@@ -0,0 +1,293 @@
+# api/services/importer.py
+from __future__ import annotations
+
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.core.validators import URLValidator
+from django.db import connection, transaction
+from django.db.models.functions import Upper
+
+from api import versioning
+from api.models import Country, WatchTransaction, WatchVariant
+from api.services import normalize, rollup
+
+CHUNK_SIZE = 5000
+BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+FORMATS = ("csv", "jsonl")
+
+_url_validator = URLValidator()
+_price_field = WatchTransaction._meta.get_field("price")
+RELATED_FIELDS = ["watch_variant", "country"]
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    failed: int = 0
+    errors: list = field(default_factory=list)
+
+    def add_error(self, row_no: int, errors: dict):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row_no, "errors": errors})
+
+    def as_dict(self) -> dict:
+        return {"created": self.created, "failed": self.failed, "errors": self.errors}
+
+
+def iter_records(stream, fmt: str):
+    """텍스트 스트림을 한 줄씩 dict 로 (전체를 메모리에 올리지 않음)."""
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+    elif fmt == "jsonl":
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                yield {"__invalid__": "JSON 형식 오류"}
+    else:
+        raise ValueError(f"지원하지 않는 형식: {fmt}")
+
+
+def detect_format(filename: str | None, default: str = "csv") -> str:
+    name = (filename or "").lower()
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if name.endswith(".csv"):
+        return "csv"
+    return default
+
+
+def open_text(binary_stream) -> io.TextIOBase:
+    return io.TextIOWrapper(binary_stream, encoding="utf-8-sig", newline="")
+
+
+def _blank(v) -> bool:
+    return v is None or (isinstance(v, str) and not v.strip())
+
+
+def _decimal(v):
+    if _blank(v):
+        return None
+    try:
+        d = Decimal(str(v).replace(",", "").strip())
+    except InvalidOperation:
+        raise ValidationError("숫자가 아닙니다.")
+    _price_field.run_validators(d)  # max_digits / decimal_places
+    return d
+
+
+class TransactionImporter:
+    """
+    대량 거래 적재.
+    - 청크 단위로 WatchVariant(model_number) / Country(iso2) 를 한 번에 조회해 메모리 맵에 누적
+    - 행 검증은 WatchTransaction.clean() 과 같은 규칙(판매/매입 가격, 국가 기본통화)을 DB 조회 없이 적용
+    - 유효한 행만 bulk_create, 오류 행은 행 번호와 함께 보고 (배치 전체를 중단하지 않음)
+    """
+
+    def __init__(self, chunk_size: int = CHUNK_SIZE, batch_size: int = BATCH_SIZE, dry_run: bool = False):
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.variants: dict[str, int | None] = {}      # MODEL_NUMBER → id (중복이면 None)
+        self.variant_ids: set[int] = set()
+        self.countries: dict[str, tuple[int, str]] = {}  # ISO2 → (id, default_currency)
+        self.country_ids: dict[int, tuple[int, str]] = {}
+
+    # ---- lookup maps ----
+    def _load_lookups(self, records):
+        numbers = {str(r.get("model_number") or "").strip().upper() for r in records} - {""}
+        numbers -= self.variants.keys()
+        if numbers:
+            # 입력은 대문자로 정규화했으므로 DB 쪽도 Upper() 로 비교 (저장값 대소문자와 무관)
+            matches = (
+                WatchVariant.objects.annotate(number_upper=Upper("model_number"))
+                .filter(number_upper__in=numbers)
+                .values_list("id", "number_upper")
+            )
+            for vid, key in matches:
+                self.variants[key] = None if key in self.variants else vid
+                self.variant_ids.add(vid)
+            for num in numbers:
+                self.variants.setdefault(num, 0)  # 0 = 없음 (재조회 방지)
+
+        ids = set()
+        for r in records:
+            v = r.get("watch_variant")
+            if not _blank(v) and str(v).strip().isdigit():
+                ids.add(int(v))
+        ids -= self.variant_ids
+        if ids:
+            self.variant_ids.update(WatchVariant.objects.filter(id__in=ids).values_list("id", flat=True))
+
+        codes = {str(r.get("country") or "").strip().upper() for r in records} - {""}
+        codes -= self.countries.keys()
+        if codes:
+            numeric = {int(c) for c in codes if c.isdigit()}
+            qs = Country.objects.filter(iso2__in=codes) | Country.objects.filter(id__in=numeric)
+            for cid, iso2, dc in qs.values_list("id", "iso2", "default_currency"):
+                entry = (cid, (dc or "").upper())
+                self.countries[iso2.upper()] = entry
+                self.country_ids[cid] = entry
+            for c in codes:
+                if c.isdigit() and int(c) in self.country_ids:
+                    self.countries[c] = self.country_ids[int(c)]
+
+    # ---- validation ----
+    def _variant_id(self, r, errors):
+        v = r.get("watch_variant")
+        if not _blank(v):
+            vid = int(v) if str(v).strip().isdigit() else None
+            if vid not in self.variant_ids:
+                errors["watch_variant"] = "존재하지 않는 변형입니다."
+            return vid
+        num = str(r.get("model_number") or "").strip().upper()
+        if not num:
+            errors["model_number"] = "model_number 또는 watch_variant가 필요합니다."
+            return None
+        vid = self.variants.get(num)
+        if vid is None:
+            errors["model_number"] = "모델번호가 여러 변형에 해당합니다. watch_variant(id)를 지정하세요."
+        elif vid == 0:
+            errors["model_number"] = f"존재하지 않는 모델번호입니다: {num}"
+        return vid or None
+
+    def build(self, r: dict) -> tuple[WatchTransaction | None, dict]:
+        """dict 한 행 → (미저장 WatchTransaction, 오류 dict)."""
+        if "__invalid__" in r:
+            return None, {"row": r["__invalid__"]}
+        errors: dict = {}
+        vid = self._variant_id(r, errors)
+
+        country = self.countries.get(str(r.get("country") or "").strip().upper())
+        if country is None:
+            errors["country"] = "국가를 선택해주세요."
+        elif not country[1]:
+            errors["country"] = "선택한 국가에 기본 통화(default_currency)가 설정되어 있지 않습니다."
+
+        year = r.get("year")
+        try:
+            year = int(str(year).strip())
+            if year < 0:
+                raise ValueError
+        except (TypeError, ValueError):
+            errors["year"] = "연식(year)이 올바르지 않습니다."
+
+        ttype = str(r.get("transaction_type") or "").strip().lower()
+        if ttype not in ("sell", "buy"):
+            errors["transaction_type"] = "sell 또는 buy 여야 합니다."
+
+        prices = {}
+        for name in ("price", "price_min", "price_max"):
+            try:
+                prices[name] = _decimal(r.get(name))
+            except ValidationError as e:
+                errors[name] = e.messages[0]
+                prices[name] = None
+
+        if ttype == "sell":
+            if prices["price"] is None and "price" not in errors:
+                errors["price"] = "판매는 price가 필요합니다."
+            prices["price_min"] = prices["price_max"] = None
+        elif ttype == "buy":
+            if prices["price_min"] is None or prices["price_max"] is None:
+                errors.setdefault("price_min", "매입은 price_min/price_max가 필요합니다.")
+            elif prices["price_min"] > prices["price_max"]:
+                errors["price_max"] = "최대값은 최소값보다 크거나 같아야 합니다."
+            prices["price"] = None
+
+        url = None if _blank(r.get("url")) else str(r["url"]).strip()
+        if url:
+            try:
+                _url_validator(url)
+            except ValidationError:
+                errors["url"] = "올바른 URL이 아닙니다."
+
+        if errors:
+            return None, errors
+        note = None if _blank(r.get("note")) else str(r["note"])
+        obj = WatchTransaction(
+            watch_variant_id=vid, year=year, transaction_type=ttype,
+            country_id=country[0], currency=country[1],
+            note=note, url=url, **prices,
+        )
+        # 모델 필드 제약(max_length, 정수 범위 등)도 행 단위로 확인: DB(MySQL strict)에서 DataError 가 나면
+        # bulk_create 트랜잭션 전체가 실패하므로. FK 는 위 조회 맵으로 확인했으므로 제외 (DB 조회 없음)
+        try:
+            obj.clean_fields(exclude=RELATED_FIELDS)
+        except ValidationError as e:
+            return None, {name: messages[0] for name, messages in e.message_dict.items()}
+        return obj, {}
+
+    # ---- insert ----
+    def insert(self, objs: list[WatchTransaction], need_pks: bool = False) -> list[WatchTransaction]:
+        """
+        bulk_create + KRW 정규화 + 영향받은 롤업 버킷 재집계 (bulk_create 는 시그널을 보내지 않으므로).
+        need_pks: bulk_create 가 pk 를 돌려주지 않는 DB(MySQL)에서도 객체에 id 를 채운다 (조회 한 번 추가).
+        """
+        if not objs or self.dry_run:
+            return objs
+        normalize.apply_many(objs)
+        with transaction.atomic():
+            created = WatchTransaction.objects.bulk_create(objs, batch_size=self.batch_size)
+            if need_pks and not connection.features.can_return_rows_from_bulk_insert:
+                self._fill_pks(created)
+            for key in {rollup.bucket_key(o) for o in created}:
+                rollup.refresh_bucket(*key)
+            versioning.bump(WatchTransaction)  # bulk_create 는 post_save 를 보내지 않는다
+        return created
+
+    # 자연 키: created_at(auto_now_add, 마이크로초)까지 같으면 같은 INSERT 의 행 → id 오름차순이 삽입 순서
+    NATURAL_KEY = ("watch_variant_id", "country_id", "transaction_type", "created_at")
+
+    def _fill_pks(self, objs: list[WatchTransaction]) -> None:
+        """
+        방금 bulk_create 한 행의 id 를 자연 키로 다시 읽어 채운다.
+        LAST_INSERT_ID() + 행 수는 innodb_autoinc_lock_mode=2(MySQL 8 기본)에서 id 가 연속이라는 보장이 없어 쓰지 않는다.
+        """
+        rows = (
+            WatchTransaction.objects
+            .filter(watch_variant_id__in={o.watch_variant_id for o in objs},
+                    created_at__in={o.created_at for o in objs})
+            .order_by("id")
+            .values_list("id", *self.NATURAL_KEY)
+        )
+        ids: dict[tuple, list[int]] = {}
+        for pk, *key in rows:
+            ids.setdefault(tuple(key), []).append(pk)
+        for obj in objs:
+            # 키가 완전히 같은 행(같은 마이크로초)은 삽입 순서대로 배정
+            obj.pk = ids[tuple(getattr(obj, f) for f in self.NATURAL_KEY)].pop(0)
+
+    def run(self, records, start_row: int = 1) -> ImportResult:
+        result = ImportResult()
+        it = iter(records)
+        row_no = start_row
+        while True:
+            chunk = list(islice(it, self.chunk_size))
+            if not chunk:
+                break
+            self._load_lookups([r for r in chunk if isinstance(r, dict)])
+            objs = []
+            for r in chunk:
+                if not isinstance(r, dict):
+                    obj, errors = None, {"row": "객체(JSON object)가 아닙니다."}
+                else:
+                    obj, errors = self.build(r)
+                if errors:
+                    result.add_error(row_no, errors)
+                else:
+                    objs.append(obj)
+                row_no += 1
+            result.created += len(self.insert(objs))
+        return result
@@ -0,0 +1,142 @@
+# api/services/market.py
+from __future__ import annotations
+
+import datetime
+from decimal import Decimal
+
+import numpy as np
+from django.utils import timezone
+
+from api.models import WatchTransaction
+from api.services import money
+from api.services.asof import AsOfRates
+from api.services.fx_engine import rate_engine
+
+PERCENTILES = (10, 50, 90)
+
+
+def _fmt(x) -> str | None:
+    # 금액은 기존 DecimalField 직렬화와 동일하게 소수 2자리 문자열
+    return None if x is None or np.isnan(x) else f"{x:.2f}"
+
+
+def local_days(values) -> np.ndarray:
+    """
+    aware datetime 목록 → 현지(settings.TIME_ZONE) 날짜 datetime64[D].
+    DB 시간대 변환(TruncDate tzinfo=, MySQL 은 시간대 테이블이 없으면 NULL)에 기대지 않고 UTC 시각으로 계산한다.
+    UTC 오프셋은 서로 다른 UTC 시(hour)마다 한 번만 조회해 더한다 (DST 포함).
+    """
+    tz = timezone.get_current_timezone()
+    ts = np.array([v.astimezone(datetime.timezone.utc).replace(tzinfo=None) for v in values], dtype="datetime64[s]")
+    hours, inverse = np.unique(ts.astype("datetime64[h]"), return_inverse=True)
+    offsets = np.array([
+        int(h.astype(datetime.datetime).replace(tzinfo=datetime.timezone.utc).astimezone(tz).utcoffset().total_seconds())
+        for h in hours
+    ], dtype="timedelta64[s]")
+    return (ts + offsets[inverse]).astype("datetime64[D]")
+
+
+def _convert(values, rate_int: np.ndarray, rate_ok: np.ndarray) -> np.ndarray:
+    """금액 열 → quote 금액(float, 통계용). 환산은 정수 최소단위로 하고 마지막에만 float 로 바꾼다."""
+    minor, ok = money.to_minor_array(values)
+    out = money.to_float(money.convert_array(minor, rate_int))
+    out[~(ok & rate_ok)] = np.nan
+    return out
+
+
+def summarize(values: np.ndarray) -> dict:
+    """count/min/max/mean/median/p10/p90 (NaN 제외)."""
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return {"count": 0, "min": None, "max": None, "mean": None,
+                "median": None, "p10": None, "p90": None}
+    p10, p50, p90 = np.percentile(values, PERCENTILES)
+    return {
+        "count": int(values.size),
+        "min": _fmt(values.min()),
+        "max": _fmt(values.max()),
+        "mean": _fmt(values.mean()),
+        "median": _fmt(p50),
+        "p10": _fmt(p10),
+        "p90": _fmt(p90),
+    }
+
+
+def _grouped(keys: np.ndarray, columns: dict[str, np.ndarray]) -> dict:
+    """keys 값별로 columns 각각을 summarize. (행 단위가 아닌 그룹 단위 루프)"""
+    out = {}
+    if keys.size == 0:
+        return out
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    uniq, starts = np.unique(sorted_keys, return_index=True)
+    bounds = list(starts[1:]) + [sorted_keys.size]
+    for key, lo, hi in zip(uniq, starts, bounds):
+        idx = order[lo:hi]
+        out[str(key)] = {name: summarize(col[idx]) for name, col in columns.items()}
+    return out
+
+
+def _section(mask, countries, years, columns: dict[str, np.ndarray]) -> dict:
+    cols = {name: col[mask] for name, col in columns.items()}
+    flatten = len(cols) == 1  # 판매는 price 하나 → 한 단계 평탄화
+    overall = {name: summarize(col) for name, col in cols.items()}
+    by_country = _grouped(countries[mask], cols)
+    by_year = _grouped(years[mask], cols)
+    if flatten:
+        (name,) = cols
+        overall = overall[name]
+        by_country = {k: v[name] for k, v in by_country.items()}
+        by_year = {k: v[name] for k, v in by_year.items()}
+    return {"overall": overall, "by_country": by_country, "by_year": by_year}
+
+
+def variant_market_summary(variant_id: int, quote: str, at: str = "latest") -> dict:
+    """
+    변형(WatchVariant) 하나의 시세 요약.
+    - 좁은 values_list 한 번 조회 → 정수 최소단위 NumPy 배열 → 고정소수점 환율 벡터 곱으로 quote 정규화
+    - at="latest": 통화별 최신 환율(환율 엔진) / at="transaction": 거래일 기준 as-of 환율(AsOfRates)
+    - 판매(price), 매입(price_min/price_max) 각각 전체/국가별/연식별 통계
+    """
+    quote = (quote or "KRW").upper()
+    rows = list(
+        WatchTransaction.objects
+        .filter(watch_variant_id=variant_id)
+        .values_list("transaction_type", "currency", "country__iso2", "year",
+                     "price", "price_min", "price_max", "created_at")
+        .order_by()
+    )
+
+    ttype, currency, iso2, year, price, pmin, pmax, created = zip(*rows) if rows else ((),) * 8
+    currency = np.array([(c or "").upper() for c in currency], dtype=str)
+    countries = np.array([c or "" for c in iso2], dtype=str)
+    years = np.array(year, dtype=int)
+    is_sell = np.array(ttype, dtype=str) == "sell"
+
+    # 행별 고정소수점 정수 환율 벡터 (환율이 없는 행은 rate_ok=False → NaN → 통계에서 제외)
+    codes = np.unique(currency)
+    bases = {c for c in codes if c and c != quote}
+    if at == "transaction":
+        rates_map = None
+        row_rates, rate_ok = AsOfRates(quote, bases).convert_int(currency, local_days(created))
+    else:
+        rates_map = rate_engine.rates_map(bases, quote)
+        row_rates, rate_ok = rate_engine.convert_int(currency, quote)
+
+    price = _convert(price, row_rates, rate_ok)
+    pmin = _convert(pmin, row_rates, rate_ok)
+    pmax = _convert(pmax, row_rates, rate_ok)
+
+    return {
+        "watch_variant": variant_id,
+        "quote": quote,
+        "convert_at": at,
+        # 거래일 기준 환산은 행마다 환율이 달라 통화별 단일 환율을 보고하지 않는다
+        # 소수 8자리 문자열 (applied_rate 와 같은 형식, float 를 거치지 않음)
+        "rates": None if rates_map is None else {
+            c: money.format_rate(Decimal(1) if c == quote else rates_map.get(c)) for c in codes if c
+        },
+        "unconverted": int((~rate_ok).sum()),
+        "sell": _section(is_sell, countries, years, {"price": price}),
+        "buy": _section(~is_sell, countries, years, {"price_min": pmin, "price_max": pmax}),
+    }
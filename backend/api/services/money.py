@@ -0,0 +1,105 @@
+# api/services/money.py
+"""
+정수 최소단위(minor unit) 금액 표현.
+- 금액: 저장 자릿수(DecimalField 15,2 의 소수 2자리) 그대로 100 을 곱한 정수 → 통화와 관계없이 입력 손실 없음
+  (KRW/JPY 도 "7003.85" → 700385, ISO 4217 최소단위로 미리 반올림하지 않는다)
+- 환율: 소수 8자리 고정소수점 정수 (ExchangeRate.rate decimal_places=8 과 같음) → 1400.12345678 = 140012345678
+- 환산은 정수 곱/나눗셈만 사용하고, 반올림(half-up)은 환산 결과를 소수 2자리로 맞출 때 한 번만 한다.
+  배열 버전은 NumPy 로 벡터화된다.
+DB 컬럼과 API 문자열 형식(소수 2자리)은 그대로 두고, 계산 경로에서만 사용한다.
+"""
+from __future__ import annotations
+
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+import numpy as np
+
+RATE_PLACES = 8
+RATE_SCALE = 10 ** RATE_PLACES
+AMOUNT_PLACES = 2  # 금액 DecimalField decimal_places = API 금액 문자열 소수 자릿수
+AMOUNT_SCALE = 10 ** AMOUNT_PLACES
+
+_INT64_MAX = np.iinfo(np.int64).max
+_AMOUNT_QUANT = Decimal(1).scaleb(-AMOUNT_PLACES)
+
+
+def to_minor(value) -> int | None:
+    """Decimal/str/int 금액 → 최소단위 정수 (저장 금액은 정확히 변환, 그보다 긴 입력만 half-up). 빈 값/잘못된 값은 None."""
+    if value is None or value == "":
+        return None
+    try:
+        d = value if isinstance(value, Decimal) else Decimal(str(value))
+        return int(d.scaleb(AMOUNT_PLACES).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def from_minor(minor: int) -> Decimal:
+    return Decimal(int(minor)).scaleb(-AMOUNT_PLACES).quantize(_AMOUNT_QUANT)
+
+
+def format_minor(minor: int | None) -> str | None:
+    """최소단위 정수 → API 금액 문자열 ("1234.50")."""
+    if minor is None:
+        return None
+    return str(from_minor(minor))
+
+
+def rate_to_int(rate) -> int | None:
+    """환율(Decimal/str/float) → 소수 8자리 고정소수점 정수."""
+    if rate is None:
+        return None
+    d = rate if isinstance(rate, Decimal) else Decimal(str(rate))
+    return int(d.scaleb(RATE_PLACES).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def rate_from_int(rate_int: int) -> Decimal:
+    return Decimal(int(rate_int)).scaleb(-RATE_PLACES)
+
+
+def format_rate(rate) -> str | None:
+    """환율 → 소수 8자리 문자열 (API applied_rate 용, float 를 거치지 않음)."""
+    rate_int = rate_to_int(rate)
+    return None if rate_int is None else f"{rate_from_int(rate_int):.{RATE_PLACES}f}"
+
+
+def convert_minor(minor: int | None, rate_int: int | None) -> int | None:
+    """단건 환산 (파이썬 정수, 자릿수 제한 없음): 최소단위 × 환율정수 / 10^8, half-up."""
+    if minor is None or rate_int is None:
+        return None
+    return (minor * rate_int + RATE_SCALE // 2) // RATE_SCALE  # half-up (금액 ≥ 0 기준)
+
+
+def convert_array(minor: np.ndarray, rate_int: np.ndarray) -> np.ndarray:
+    """
+    배열 환산: 행별 최소단위 금액 × 행별 환율정수 → 최소단위 (int64, half-up).
+    a·r/D 를 a·(r div D) + (a·(r mod D) + D/2) div D 로 나눠 계산해 int64 범위 안에서 끝낸다.
+    그래도 넘칠 만큼 큰 값이 있으면 파이썬 정수(object 배열)로 같은 식을 계산한다.
+    """
+    minor = np.asarray(minor, dtype=np.int64)
+    rate_int = np.asarray(rate_int, dtype=np.int64)
+    d = np.int64(RATE_SCALE)
+    q, r = np.divmod(rate_int, d)
+    limit = _INT64_MAX // 2
+    a = np.abs(minor)
+    if np.any(a > limit // d) or np.any(a > limit // np.maximum(np.abs(q), 1)):
+        minor, q, r = (x.astype(object) for x in (minor, q, r))
+        return (minor * q + (minor * r + RATE_SCALE // 2) // RATE_SCALE).astype(object)
+    return minor * q + (minor * r + d // 2) // d
+
+
+def to_minor_array(values) -> tuple[np.ndarray, np.ndarray]:
+    """DB 금액 목록(Decimal/None) → (최소단위 int64 배열, 값 있음 마스크)."""
+    out = np.zeros(len(values), dtype=np.int64)
+    ok = np.zeros(len(values), dtype=bool)
+    for i, v in enumerate(values):
+        m = to_minor(v)
+        if m is not None:
+            out[i] = m
+            ok[i] = True
+    return out, ok
+
+
+def to_float(minor: np.ndarray) -> np.ndarray:
+    """최소단위 배열 → 금액 float 배열 (통계 계산용, 환산이 끝난 뒤에만)."""
+    return np.asarray(minor, dtype=float) / AMOUNT_SCALE
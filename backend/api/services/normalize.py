@@ -0,0 +1,99 @@
+# api/services/normalize.py
+from __future__ import annotations
+
+from django.db import transaction
+from django.db.models import DecimalField, F, Value
+from django.db.models.functions import Round
+
+from api import versioning
+from api.models import WatchTransaction
+from api.services import money
+from api.services.fx_engine import rate_engine
+
+QUOTE = "KRW"
+# 원 가격 필드 → 정규화 필드
+COLUMNS = (("price", "price_krw"), ("price_min", "price_min_krw"), ("price_max", "price_max_krw"))
+
+
+def apply(tx: WatchTransaction) -> None:
+    """
+    저장 전 인스턴스의 KRW 정규화 컬럼을 현재 최신 환율(환율 엔진, Decimal)로 채운다.
+    정수 최소단위 환산(api/services/money.py): 원 금액 × 환율을 소수 2자리로 half-up 한 번 (조회 시 환산과 같은 값).
+    """
+    detail = rate_engine.detail(tx.currency, QUOTE) if tx.currency else None
+    rate, day = detail if detail else (None, None)
+    tx.krw_rate, tx.krw_rate_date = rate, day
+    rate_int = money.rate_to_int(rate)
+    for src, dst in COLUMNS:
+        minor = money.convert_minor(money.to_minor(getattr(tx, src)), rate_int)
+        setattr(tx, dst, None if minor is None else money.from_minor(minor))
+
+
+def apply_many(objs) -> None:
+    """bulk_create 처럼 시그널이 없는 경로용."""
+    for tx in objs:
+        apply(tx)
+
+
+def current_rates() -> dict[str, tuple]:
+    """거래에 쓰인 통화별 현재 KRW 환율 (환율 엔진 detail). 환율 수집 전후를 비교해 바뀐 통화만 재계산한다."""
+    codes = WatchTransaction.objects.order_by().values_list("currency", flat=True).distinct()
+    return {code: rate_engine.detail(code, QUOTE) for code in set(codes) if code}
+
+
+def changed_currencies(before: dict[str, tuple]) -> list[str]:
+    """current_rates() 스냅샷 이후 KRW 환율(값 또는 기준일)이 바뀐 통화. 환율 저장이 커밋된 뒤 호출."""
+    rate_engine.mark_stale()  # 이 프로세스의 엔진도 바로 버전을 확인하도록
+    after = current_rates()
+    return sorted(code for code in before.keys() | after.keys() if before.get(code) != after.get(code))
+
+
+def stale_currencies() -> list[str]:
+    """
+    저장된 정규화 환율(krw_rate, krw_rate_date)이 현재 최신 KRW 환율과 다른 통화.
+    환율 단건 저장/삭제(API, 관리자) 커밋 후 바뀐 통화만 재계산하는 데 쓴다 (api/signals.py).
+    """
+    rate_engine.mark_stale()
+    stored = WatchTransaction.objects.order_by().values_list("currency", "krw_rate", "krw_rate_date").distinct()
+    stale = set()
+    for code, rate, day in stored:
+        if not code or code in stale:
+            continue
+        detail = rate_engine.detail(code, QUOTE)
+        if (rate, day) != (detail if detail else (None, None)):
+            stale.add(code)
+    return sorted(stale)
+
+
+def recompute(currencies=None) -> dict[str, int]:
+    """
+    정규화 컬럼 일괄 재계산: 통화마다 UPDATE 한 번 (행을 읽어오지 않음).
+    환율이 없는 통화는 정규화 컬럼을 비운다. → {통화: 갱신 행 수}
+    """
+    qs = WatchTransaction.objects.order_by()
+    if currencies:
+        qs = qs.filter(currency__in=[c.upper() for c in currencies])
+    codes = sorted(set(qs.values_list("currency", flat=True).distinct()))
+
+    updated = {}
+    with transaction.atomic():
+        for code in codes:
+            detail = rate_engine.detail(code, QUOTE) if code else None
+            if detail is None:
+                values = {dst: None for _, dst in COLUMNS}
+                values.update(krw_rate=None, krw_rate_date=None)
+            else:
+                rate, day = detail
+                rate_value = Value(rate, output_field=DecimalField(max_digits=18, decimal_places=8))
+                values = {
+                    # apply() 와 같은 규칙: 원 금액(소수 2자리 그대로) × 환율 → 소수 2자리 반올림 한 번
+                    dst: Round(F(src) * rate_value, money.AMOUNT_PLACES,
+                               output_field=DecimalField(max_digits=20, decimal_places=2))
+                    for src, dst in COLUMNS
+                }
+                values.update(krw_rate=rate, krw_rate_date=day)
+            # updated_at(auto_now) 은 건드리지 않는다 (사용자 수정 시각 유지, 조건부 GET 과 무관)
+            updated[code] = qs.filter(currency=code).update(**values)
+        if any(updated.values()):
+            versioning.bump(WatchTransaction)  # 응답 캐시/ETag 무효화 (update() 는 시그널 없음)
+    return updated
@@ -0,0 +1,167 @@
+# api/services/rollup.py
+from __future__ import annotations
+
+import datetime
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max, Min, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from api.models import WatchTransaction, WatchTransactionDaily
+from api.services import money
+from api.services.fx_engine import rate_engine
+
+BATCH_SIZE = 1000
+
+# 판매는 price, 매입은 price_min/price_max 를 low/high 로 사용
+LOW = Coalesce("price", "price_min")
+HIGH = Coalesce("price", "price_max")
+
+AGGREGATES = {
+    "n": Count("id"),
+    "s_low": Sum(LOW),
+    "s_high": Sum(HIGH),
+    "mn_low": Min(LOW),
+    "mx_high": Max(HIGH),
+}
+
+VALUE_FIELDS = (
+    "count", "sum_low", "sum_high", "min_low", "max_high",
+    "quote", "quote_rate", "quote_sum_low", "quote_sum_high", "quote_min_low", "quote_max_high",
+)
+
+
+def rollup_quote() -> str:
+    return getattr(settings, "ROLLUP_QUOTE", "KRW").upper()
+
+
+def local_day(dt: datetime.datetime) -> datetime.date:
+    return timezone.localdate(dt)
+
+
+def _day_bounds(day: datetime.date):
+    start = timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+    return start, start + datetime.timedelta(days=1)
+
+
+def _latest_rates(currencies, quote: str) -> dict[str, Decimal]:
+    # 환율 엔진의 정확한 Decimal 환율 (float 를 거치지 않음)
+    out = {}
+    for c in currencies:
+        detail = rate_engine.detail(c, quote) if c and c != quote else None
+        if detail:
+            out[c] = detail[0]
+    return out
+
+
+def _scale(value, rate):
+    # 정규화 컬럼(api/services/normalize.py)과 같은 정수 최소단위 환산 규칙
+    if value is None or rate is None:
+        return None
+    return money.from_minor(money.convert_minor(money.to_minor(value), money.rate_to_int(rate)))
+
+
+def _make_row(key, currency, agg, quote, rates) -> WatchTransactionDaily:
+    variant_id, country_id, ttype, day = key
+    rate = Decimal(1) if currency == quote else rates.get(currency)
+    return WatchTransactionDaily(
+        watch_variant_id=variant_id, country_id=country_id, transaction_type=ttype,
+        day=day, currency=currency,
+        count=agg["n"],
+        sum_low=agg["s_low"] or 0, sum_high=agg["s_high"] or 0,
+        min_low=agg["mn_low"], max_high=agg["mx_high"],
+        quote=quote, quote_rate=rate,
+        quote_sum_low=_scale(agg["s_low"] or 0, rate),
+        quote_sum_high=_scale(agg["s_high"] or 0, rate),
+        quote_min_low=_scale(agg["mn_low"], rate),
+        quote_max_high=_scale(agg["mx_high"], rate),
+    )
+
+
+def make_key(variant_id, country_id, ttype, created_at):
+    return (variant_id, country_id, ttype, local_day(created_at))
+
+
+def bucket_key(tx: WatchTransaction):
+    return make_key(*(getattr(tx, f) for f in WatchTransaction.ROLLUP_FIELDS))
+
+
+@transaction.atomic
+def refresh_bucket(variant_id: int, country_id: int, ttype: str, day: datetime.date) -> None:
+    """
+    버킷 하나만 다시 집계. (variant, created_at) 인덱스 범위 조회라 거래량과 무관하게 가볍다.
+    min/max 는 증감으로 되돌릴 수 없으므로 덧셈/뺄셈 대신 버킷 단위 재계산을 사용.
+    """
+    start, end = _day_bounds(day)
+    groups = list(
+        WatchTransaction.objects
+        .filter(watch_variant_id=variant_id, country_id=country_id, transaction_type=ttype,
+                created_at__gte=start, created_at__lt=end)
+        .values("currency")
+        .annotate(**AGGREGATES)
+        .order_by()
+    )
+    bucket = WatchTransactionDaily.objects.filter(
+        watch_variant_id=variant_id, country_id=country_id, transaction_type=ttype, day=day,
+    )
+    bucket.exclude(currency__in=[g["currency"] for g in groups]).delete()
+    if not groups:
+        return
+
+    quote = rollup_quote()
+    rates = _latest_rates({g["currency"] for g in groups}, quote)
+    key = (variant_id, country_id, ttype, day)
+    for g in groups:
+        row = _make_row(key, g["currency"], g, quote, rates)
+        WatchTransactionDaily.objects.update_or_create(
+            watch_variant_id=variant_id, country_id=country_id, transaction_type=ttype,
+            day=day, currency=g["currency"],
+            defaults={name: getattr(row, name) for name in VALUE_FIELDS},
+        )
+
+
+@transaction.atomic
+def rebuild(date_from: datetime.date | None = None, date_to: datetime.date | None = None) -> int:
+    """
+    기간(양끝 포함)의 롤업을 지우고 다시 만든다. 생성된 행 수 반환.
+    좁은 values_list 를 스트리밍하며 버킷별로 누적한다. 현지 날짜는 파이썬에서 계산
+    (DB 시간대 변환 TruncDate(tzinfo=) 는 MySQL 시간대 테이블이 없으면 NULL).
+    """
+    tx = WatchTransaction.objects.all()
+    rollups = WatchTransactionDaily.objects.all()
+    if date_from:
+        tx = tx.filter(created_at__gte=_day_bounds(date_from)[0])
+        rollups = rollups.filter(day__gte=date_from)
+    if date_to:
+        tx = tx.filter(created_at__lt=_day_bounds(date_to)[1])
+        rollups = rollups.filter(day__lte=date_to)
+    rollups.delete()
+
+    groups: dict[tuple, dict] = {}
+    rows = (
+        tx.values_list(*WatchTransaction.ROLLUP_FIELDS, "currency", LOW, HIGH)
+        .order_by()
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    for variant_id, country_id, ttype, created_at, currency, low, high in rows:
+        key = (make_key(variant_id, country_id, ttype, created_at), currency)
+        agg = groups.get(key)
+        if agg is None:
+            agg = groups[key] = {"n": 0, "s_low": None, "s_high": None, "mn_low": None, "mx_high": None}
+        # SQL Count/Sum/Min/Max 와 같게: NULL 은 합계·최솟값·최댓값에서 제외
+        agg["n"] += 1
+        if low is not None:
+            agg["s_low"] = low if agg["s_low"] is None else agg["s_low"] + low
+            agg["mn_low"] = low if agg["mn_low"] is None else min(agg["mn_low"], low)
+        if high is not None:
+            agg["s_high"] = high if agg["s_high"] is None else agg["s_high"] + high
+            agg["mx_high"] = high if agg["mx_high"] is None else max(agg["mx_high"], high)
+
+    quote = rollup_quote()
+    rates = _latest_rates({currency for _, currency in groups}, quote)
+    objs = [_make_row(key, currency, agg, quote, rates) for (key, currency), agg in groups.items()]
+    WatchTransactionDaily.objects.bulk_create(objs, batch_size=BATCH_SIZE)
+    return len(objs)
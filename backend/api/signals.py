@@ -0,0 +1,99 @@
+# api/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from api.models import Brand, Country, ExchangeRate, Vendor, WatchModel, WatchPrice, WatchTransaction, WatchVariant
+from api.services import normalize, rollup
+from api.services.exchange import notify_rates_changed, sync_latest_rates
+from api import versioning
+
+
+# ── 거래 일별 롤업 증분 갱신 ────────────────────────────────────────────────
+@receiver(pre_save, sender=WatchTransaction)
+def _remember_rollup_bucket(sender, instance, **kwargs):
+    # 수정 시 변형/국가/유형/날짜가 바뀌면 이전 버킷도 다시 집계해야 하므로 기존 키 보관
+    # (DB 에서 읽은 인스턴스는 from_db 가 보관한 값 사용 → 추가 SELECT 없음)
+    instance._rollup_old_key = None
+    if instance.pk and not instance._state.adding:
+        loaded = getattr(instance, "_rollup_loaded", None)
+        if loaded is None:
+            loaded = (
+                WatchTransaction.objects.filter(pk=instance.pk)
+                .values_list(*WatchTransaction.ROLLUP_FIELDS)
+                .first()
+            )
+        if loaded:
+            instance._rollup_old_key = rollup.make_key(*loaded)
+
+
+@receiver(pre_save, sender=WatchTransaction)
+def _normalize_prices(sender, instance, raw=False, **kwargs):
+    # KRW 정규화 컬럼 (price_krw 등) — 저장 시점 최신 환율
+    if not raw:
+        normalize.apply(instance)
+
+
+@receiver(post_save, sender=WatchTransaction)
+def _refresh_rollup_on_save(sender, instance, raw=False, **kwargs):
+    if raw:  # loaddata
+        return
+    new_key = rollup.bucket_key(instance)
+    rollup.refresh_bucket(*new_key)
+    old_key = getattr(instance, "_rollup_old_key", None)
+    if old_key and old_key != new_key:
+        rollup.refresh_bucket(*old_key)
+    instance.remember_rollup_fields()  # 같은 인스턴스를 다시 저장할 때의 기준
+
+
+@receiver(post_delete, sender=WatchTransaction)
+def _refresh_rollup_on_delete(sender, instance, **kwargs):
+    rollup.refresh_bucket(*rollup.bucket_key(instance))
+
+
+# ── 모델 버전 (catalog tree 캐시, 목록/단건 ETag·익명 응답 캐시 무효화) ─────────
+# bulk_create/update 경로는 시그널이 없으므로 직접 versioning.bump (importer.insert, normalize.recompute)
+VERSIONED_MODELS = (Brand, WatchModel, Vendor, WatchVariant, Country, WatchPrice, WatchTransaction)
+
+
+def _bump_version(sender, **kwargs):
+    if kwargs.get("raw"):
+        return
+    versioning.bump(sender)
+
+
+for _model in VERSIONED_MODELS:
+    post_save.connect(_bump_version, sender=_model, dispatch_uid=f"bump_version:{_model._meta.label_lower}")
+    post_delete.connect(_bump_version, sender=_model, dispatch_uid=f"bump_version_del:{_model._meta.label_lower}")
+
+
+# ── 최신 환율 테이블 / 환율 캐시 무효화 / 환율 엔진 버전 ───────────────────────
+@receiver(pre_save, sender=ExchangeRate)
+def _remember_rate_pair(sender, instance, **kwargs):
+    # 수정으로 base/quote 가 바뀌면 이전 쌍의 최신 환율도 다시 맞춰야 하므로 기존 쌍 보관
+    instance._latest_old_pair = None
+    if instance.pk and not instance._state.adding:
+        instance._latest_old_pair = (
+            ExchangeRate.objects.filter(pk=instance.pk).values_list("base", "quote").first()
+        )
+
+
+@receiver(post_save, sender=ExchangeRate)
+@receiver(post_delete, sender=ExchangeRate)
+def _invalidate_rates_cache(sender, instance, **kwargs):
+    if kwargs.get("raw"):
+        return
+    # ExchangeRate.save() / 삭제(Collector)가 연 트랜잭션 안에서 실행된다
+    pairs = {(instance.base, instance.quote)}
+    if getattr(instance, "_latest_old_pair", None):
+        pairs.add(instance._latest_old_pair)
+    sync_latest_rates(pairs)
+    notify_rates_changed()
+    # 저장된 KRW 정규화 가격도 커밋 후 맞춘다 (목록/내보내기의 ?convert=KRW 가 단건 조회와 같은 환율을 쓰도록)
+    transaction.on_commit(_recompute_stale_normalized)
+
+
+def _recompute_stale_normalized():
+    changed = normalize.stale_currencies()
+    if changed:
+        normalize.recompute(changed)
@@ -0,0 +1,171 @@
+# api/sparse.py
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+
+def _names(request, param: str) -> list[str]:
+    raw = request.query_params.get(param) or ""
+    return list(dict.fromkeys(n.strip() for n in raw.split(",") if n.strip()))
+
+
+class SparseSerializerMixin:
+    """
+    context 의 fields / expand 를 반영하는 시리얼라이저 믹스인.
+    - expand: Meta.expandable = {이름: (시리얼라이저, source, select_related 경로)} 에 선언된 관계를 중첩 객체로
+    - fields: 나열한 필드(+ 펼친 관계)만 남긴다
+    중첩된 시리얼라이저에는 적용하지 않는다 (최상위 응답만 대상).
+    """
+
+    @classmethod
+    def expandable(cls) -> dict:
+        return getattr(cls.Meta, "expandable", {})
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields, expand = self.context.get("fields"), self.context.get("expand") or ()
+        specs = self.expandable()
+        for name in expand:
+            serializer_class, source, _ = specs[name]
+            kwargs = {"source": source} if source != name else {}
+            self.fields[name] = serializer_class(read_only=True, **kwargs)
+        if fields:
+            keep = set(fields) | set(expand)
+            for name in [n for n in self.fields if n not in keep]:
+                self.fields.pop(name)
+
+
+class SparseFieldsMixin:
+    """
+    GET 목록/단건에 ?fields=a,b (응답 필드 제한) / ?expand=x,y (관계 객체 인라인) 지원.
+    - fields: .only() 로 필요한 컬럼만 읽고, 쓰지 않는 select_related 조인은 뺀다
+      (정렬/커서 페이지네이션 컬럼과 pk 는 항상 포함, 모델 필드가 아닌 source 가 있으면 컬럼 제한은 생략)
+    - expand: 시리얼라이저 Meta.expandable 의 select_related 경로를 추가 → 관계 객체도 같은 쿼리에서
+    - 쓰기 요청(POST/PUT/PATCH/DELETE)에는 적용하지 않는다
+    """
+
+    def get_sparse_fields(self, fields: list[str]) -> list[str]:
+        """하위 클래스 훅: 응답 후처리에 필요한 필드를 덧붙인다 (응답에서는 trim_to_requested 로 다시 뺀다)."""
+        return fields
+
+    def get_extra_sparse_fields(self) -> list[str]:
+        """하위 클래스 훅: ?fields= 에 쓸 수 있는 시리얼라이저 밖 이름 (뷰가 후처리로 덧붙이는 필드)."""
+        return []
+
+    def requested_fields(self) -> list[str] | None:
+        """?fields= 로 요청한 이름 그대로 (get_sparse_fields 로 덧붙인 필드 제외). 없으면 None."""
+        self.sparse()
+        return self._requested_fields
+
+    def trim_to_requested(self, item: dict) -> dict:
+        """응답 항목에서 요청하지 않은 키(후처리 입력으로만 읽은 필드)를 뺀다."""
+        requested = self.requested_fields()
+        if requested is not None:
+            keep = set(requested) | set(self.sparse()[1])
+            for name in [n for n in item if n not in keep]:
+                del item[name]
+        return item
+
+    def sparse(self) -> tuple[list[str] | None, list[str]]:
+        """(fields 또는 None, expand) — 요청마다 한 번만 해석."""
+        cached = getattr(self, "_sparse", None)
+        if cached is not None:
+            return cached
+        request = getattr(self, "request", None)
+        self._requested_fields = None
+        if request is None or request.method not in SAFE_METHODS:
+            self._sparse = (None, [])
+            return self._sparse
+
+        fields, expand = _names(request, "fields"), _names(request, "expand")
+        serializer_class = self.get_serializer_class()
+        expandable = serializer_class.expandable()
+        errors = {}
+        unknown = [n for n in expand if n not in expandable]
+        if unknown:
+            errors["expand"] = f"펼칠 수 없는 관계입니다: {', '.join(unknown)} (가능: {', '.join(expandable) or '없음'})"
+        if fields:
+            available = set(serializer_class().fields) | set(expandable) | set(self.get_extra_sparse_fields())
+            unknown = [n for n in fields if n not in available]
+            if unknown:
+                errors["fields"] = f"알 수 없는 필드입니다: {', '.join(unknown)}"
+        if errors:
+            raise ValidationError(errors)
+
+        self._requested_fields = fields or None
+        self._sparse = (self.get_sparse_fields(fields) if fields else None, expand)
+        return self._sparse
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fields"], context["expand"] = self.sparse()
+        return context
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields, expand = self.sparse()
+        if not (fields or expand):
+            return queryset
+        serializer_class = self.get_serializer_class()
+        expandable = serializer_class.expandable()
+        paths = [expandable[n][2] for n in expand]
+        if fields is None:
+            return queryset.select_related(*paths) if paths else queryset
+
+        model = queryset.model
+        columns = {model._meta.pk.name}
+        serializer_fields = serializer_class().fields
+        for name in fields:
+            field = serializer_fields.get(name)
+            if field is None:  # 펼친 관계 전용 이름 (예: brand)
+                continue
+            resolved = self._resolve_source(model, field.source)
+            if resolved is None:
+                return queryset.select_related(*paths) if paths else queryset  # 계산 필드 → 컬럼 제한 생략
+            column, path = resolved
+            columns.add(column)
+            if path:
+                paths.append(path)
+
+        for name in self._ordering_names(queryset):
+            column = name.lstrip("-").split("__")[0]
+            try:
+                if model._meta.get_field(column).concrete:
+                    columns.add(column)
+            except FieldDoesNotExist:
+                pass
+        columns.update(p.split("__")[0] for p in paths)  # select_related 하는 FK 는 지연 로딩할 수 없다
+
+        queryset = queryset.select_related(None)
+        if paths:
+            queryset = queryset.select_related(*paths)
+        return queryset.only(*columns)
+
+    @staticmethod
+    def _resolve_source(model, source: str):
+        """시리얼라이저 source → (모델 컬럼, select_related 경로 또는 None). 모델 필드가 아니면 None."""
+        parts = source.split(".")
+        try:
+            field = model._meta.get_field(parts[0])
+        except FieldDoesNotExist:
+            return None
+        if not field.concrete:
+            return None
+        path, current = [], field
+        for part in parts[1:]:
+            if not current.is_relation:
+                break
+            path.append(current.name)
+            try:
+                current = current.related_model._meta.get_field(part)
+            except FieldDoesNotExist:
+                return None
+        return field.name, "__".join(path) or None
+
+    def _ordering_names(self, queryset) -> list[str]:
+        names = list(queryset.query.order_by)
+        names += list(getattr(self, "ordering_fields", None) or ())
+        pagination = getattr(self, "pagination_class", None)
+        ordering = getattr(pagination, "ordering", None) or ()
+        names += [ordering] if isinstance(ordering, str) else list(ordering)
+        return [n for n in names if isinstance(n, str)]
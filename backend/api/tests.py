@@ -1,3 +1,1527 @@
-from django.test import TestCase
+import csv
+import datetime
+import gzip
+import importlib
+import json
+import os
+import tempfile
+import time
+import zlib
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.apps import apps as django_apps
+from django.contrib.auth import get_user_model
+from django.core import checks
+from django.core.management import call_command
+from django.db import connection
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.fastread import RowSerializer
+from api.middleware import CompressionMiddleware
+from api.response_cache import response_cache
+from api.models import (
+    Brand, Country, ExchangeRate, LatestExchangeRate, Vendor, WatchModel, WatchPrice, WatchTransaction,
+    WatchTransactionDaily, WatchVariant,
+)
+from api.services import exchange, money, normalize
+from api.services.exchange import SeriesUnavailable
+from api.services.asof import AsOfRates
+from api.services.importer import TransactionImporter
+from api.services.market import local_days
+from api.services.fx_providers import CLOSED, HALF_OPEN, OPEN, ProviderManager
+from api.services.fx_backfill import RateBackfill
+from api.services.fx_engine import rate_engine
+from api.views_watches import WatchPriceViewSet, WatchTransactionViewSet, WatchVariantViewSet
+
+
+def reset_rate_engine():
+    """테스트 트랜잭션 롤백으로 환율 버전 번호가 이전 테스트와 같아질 수 있으므로 스냅샷을 버린다."""
+    rate_engine._version = None
+    rate_engine.mark_stale()
+
+
+def _fake_response(payload):
+    response = mock.Mock()
+    response.raise_for_status.return_value = None
+    response.json.return_value = payload
+    return response
+
+
+class FetchRatesTests(TestCase):
+    """
+    manage.py fetch_rates / exchange.fetch_rates: 날짜당 프로바이더 호출 1회, anchor 기준 교차 환율, 일괄 upsert.
+    공유 HTTP 세션(exchange._http)을 가짜로 바꿔 네트워크 없이 실행한다.
+    """
+    # 1 USD = x (exchangerate.host 형식 응답)
+    USD_RATES = {"USD": 1, "KRW": 1400.5, "JPY": 150.25, "EUR": 0.92}
+
+    def setUp(self):
+        exchange.fetch_cache.invalidate()  # 이전 실행의 수집 결과(single-flight 캐시)를 쓰지 않도록
+        self.rates = dict(self.USD_RATES)
+        self.requests = []
+        for patcher in (
+            mock.patch.object(exchange._http, "get", side_effect=self._get),
+            # 프로바이더 상태(서킷/순서)는 프로세스 전역이므로 테스트마다 새로
+            mock.patch.object(exchange, "batch_providers", ProviderManager(exchange.BATCH_PROVIDERS, registry={})),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _get(self, url, params=None, timeout=None):
+        self.requests.append((url, params))
+        anchor = self.rates[params["base"]]
+        symbols = params["symbols"].split(",")
+        return _fake_response({"rates": {s: self.rates[s] / anchor for s in symbols if s in self.rates}})
+
+    def _run(self, *args):
+        out = StringIO()
+        call_command("fetch_rates", *args, stdout=out)
+        return out.getvalue()
+
+    def test_one_call_per_date_and_cross_rates(self):
+        self._run("--bases", "USD,JPY", "--quote", "KRW,EUR", "--date", "2025-03-03")
+
+        self.assertEqual(len(self.requests), 1)
+        url, params = self.requests[0]
+        self.assertTrue(url.endswith("/2025-03-03"))
+        self.assertEqual(params, {"base": "USD", "symbols": "EUR,JPY,KRW"})
+
+        day = datetime.date(2025, 3, 3)
+        stored = {(r.base, r.quote): r.rate for r in ExchangeRate.objects.filter(date=day)}
+        q = Decimal("0.00000001")
+        self.assertEqual(stored, {
+            ("USD", "KRW"): Decimal("1400.5").quantize(q),
+            ("USD", "EUR"): Decimal("0.92").quantize(q),
+            ("JPY", "KRW"): (Decimal("1400.5") / Decimal("150.25")).quantize(q),
+            ("JPY", "EUR"): (Decimal("0.92") / Decimal("150.25")).quantize(q),
+        })
+        self.assertEqual(LatestExchangeRate.objects.count(), 4)
+
+    def test_rerun_updates_in_place(self):
+        self._run("--bases", "USD", "--quote", "KRW", "--date", "2025-03-03")
+        self.rates["KRW"] = 1410.0
+        exchange.fetch_cache.invalidate()
+
+        out = self._run("--bases", "USD", "--quote", "KRW", "--date", "2025-03-03")
+
+        self.assertIn("신규 0, 갱신 1", out)
+        row = ExchangeRate.objects.get(base="USD", quote="KRW", date=datetime.date(2025, 3, 3))
+        self.assertEqual(row.rate, Decimal("1410.00000000"))
+        self.assertEqual(LatestExchangeRate.objects.get(base="USD", quote="KRW").rate, Decimal("1410.00000000"))
+
+    def test_recompute_only_changed_currencies(self):
+        brand = Brand.objects.create(name_en="Omega", name_ko="오메가")
+        variant = WatchVariant.objects.create(watch_model=WatchModel.objects.create(brand=brand), model_number="310.30")
+        day = datetime.date(2025, 3, 3)
+        jpy_krw = (Decimal("1400.5") / Decimal("150.25")).quantize(Decimal("0.00000001"))
+        ExchangeRate.objects.create(base="USD", quote="KRW", date=day, rate=Decimal("1300"))
+        ExchangeRate.objects.create(base="JPY", quote="KRW", date=day, rate=jpy_krw, source="exchangerate.host")
+        rate_engine.mark_stale()
+        txs = {}
+        for iso2, currency in (("US", "USD"), ("JP", "JPY")):
+            country = Country.objects.create(name_kr=iso2, name_en=iso2, iso2=iso2, default_currency=currency)
+            txs[currency] = WatchTransaction.objects.create(watch_variant=variant, country=country, year=2024,
+                                                            transaction_type="sell", price=Decimal("100.10"))
+
+        with mock.patch.object(normalize, "recompute", wraps=normalize.recompute) as recompute:
+            out = self._run("--bases", "USD,JPY", "--quote", "KRW", "--date", "2025-03-03")
+
+        recompute.assert_called_once_with(["USD"])  # JPY→KRW 는 같은 값으로 갱신됨
+        self.assertIn("KRW 정규화 가격 재계산: 1건 (USD)", out)
+        txs["USD"].refresh_from_db()
+        self.assertEqual((txs["USD"].krw_rate, txs["USD"].price_krw), (Decimal("1400.5"), Decimal("140190.05")))
+
+        exchange.fetch_cache.invalidate()
+        out = self._run("--bases", "USD,JPY", "--quote", "KRW", "--date", "2025-03-03")
+        self.assertIn("최신 환율 변경 없음", out)
+
+    def test_dates_fetched_once_each(self):
+        days = [datetime.date(2025, 3, d) for d in (3, 4, 5)]
+        result = exchange.fetch_rates(["USD", "JPY"], ["KRW"], days, workers=3)
+
+        self.assertEqual(result.calls, 3)
+        self.assertEqual(sorted(url.rsplit("/", 1)[1] for url, _ in self.requests), [d.isoformat() for d in days])
+        self.assertEqual(len(result.rates), 6)
+        self.assertEqual(result.missing, [])
+
+    def test_missing_symbols_fall_through_to_next_provider(self):
+        def get(url, params=None, timeout=None):
+            self.requests.append((url, params))
+            if "from" in params:  # frankfurter: 나머지 통화만 요청받아야 한다
+                return _fake_response({"rates": {s: self.rates[s] for s in params["to"].split(",")}})
+            return _fake_response({"rates": {"KRW": self.rates["KRW"]}})  # exchangerate.host: JPY 없음
+
+        exchange._http.get.side_effect = get
+        result = exchange.fetch_rates(["JPY"], ["KRW"], [datetime.date(2025, 3, 3)])
+
+        self.assertEqual(result.calls, 2)
+        self.assertEqual(self.requests[1][1], {"from": "USD", "to": "JPY"})
+        (row,) = result.rates
+        self.assertEqual(row.source, "exchangerate.host+frankfurter.app")
+        self.assertEqual(row.rate, (Decimal("1400.5") / Decimal("150.25")).quantize(Decimal("0.00000001")))
+
+
+class FakeProvider:
+    """일반 호출 가능 객체 프로바이더: 지정한 지연 후 결과 반환, 또는 예외."""
+
+    def __init__(self, result="ok", delay=0.0, fail=False):
+        self.result, self.delay, self.fail = result, delay, fail
+        self.calls = 0
+
+    def __call__(self, *args):
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("down")
+        return self.result
+
+
+class ProviderManagerTests(SimpleTestCase):
+    """서킷 브레이커 상태 전이, 점수 기반 순서, 헤지. 상태는 테스트마다 새 registry 에 둔다."""
+
+    def manager(self, providers, **kwargs):
+        kwargs.setdefault("hedge_after", 0)
+        return ProviderManager(providers, registry={}, **kwargs)
+
+    def test_breaker_opens_after_threshold_and_skips_provider(self):
+        primary, backup = FakeProvider(fail=True), FakeProvider("backup")
+        manager = self.manager([("primary", primary), ("backup", backup)], threshold=2, reset_timeout=60)
+
+        for _ in range(2):
+            self.assertIsNone(manager.call(exclude=("backup",)).provider)
+        self.assertEqual(manager.health("primary").state, OPEN)
+        self.assertEqual([n for n, _ in manager.ordered()], ["backup", "primary"])
+
+        outcome = manager.call(exclude=("backup",))
+        self.assertEqual((outcome.provider, outcome.attempts), (None, 0))  # OPEN: 호출하지 않음
+        self.assertEqual(manager.call().result, "backup")
+        self.assertEqual(primary.calls, 2)
+
+    def test_half_open_trial_closes_on_success(self):
+        primary = FakeProvider(fail=True)
+        manager = self.manager([("primary", primary)], threshold=1, reset_timeout=0.05)
+
+        self.assertIsNone(manager.call().provider)
+        self.assertEqual(manager.health("primary").state, OPEN)
+        self.assertEqual(manager.call().attempts, 0)  # OPEN: 호출하지 않음
+
+        time.sleep(0.06)
+        primary.fail = False
+        self.assertTrue(manager.health("primary").allow())
+        self.assertEqual(manager.health("primary").state, HALF_OPEN)
+        self.assertFalse(manager.health("primary").allow())  # 시험 호출은 한 번만
+        manager.health("primary").record(True, 0.01)
+        self.assertEqual(manager.health("primary").state, CLOSED)
+        self.assertEqual(manager.call().provider, "primary")
+
+    def test_half_open_trial_failure_reopens(self):
+        primary = FakeProvider(fail=True)
+        manager = self.manager([("primary", primary)], threshold=1, reset_timeout=0.05)
+        manager.call()
+
+        time.sleep(0.06)
+        self.assertEqual(manager.call().attempts, 1)  # 시험 호출 1회
+        self.assertEqual(manager.health("primary").state, OPEN)
+        self.assertEqual(primary.calls, 2)
+
+    def test_ordered_prefers_faster_and_healthier(self):
+        slow, fast = FakeProvider("slow", delay=0.05), FakeProvider("fast")
+        manager = self.manager([("slow", slow), ("fast", fast)])
+        self.assertEqual([n for n, _ in manager.ordered()], ["slow", "fast"])  # 관측 전: 등록 순서
+
+        manager.call()
+        manager.call(exclude=("slow",))
+        self.assertEqual([n for n, _ in manager.ordered()], ["fast", "slow"])
+        self.assertEqual(manager.call().provider, "fast")
+
+        fast.fail = True
+        manager.call()  # fast 실패 → slow 로 폴백, 오류율 반영
+        self.assertEqual([n for n, _ in manager.ordered()], ["slow", "fast"])
+
+    def test_accept_rejects_empty_result(self):
+        empty, full = FakeProvider({}), FakeProvider({"KRW": 1})
+        manager = self.manager([("empty", empty), ("full", full)])
+
+        outcome = manager.call(accept=bool)
+        self.assertEqual((outcome.provider, outcome.attempts), ("full", 2))
+
+    def test_hedge_wins_on_slow_primary(self):
+        primary, secondary = FakeProvider("primary", delay=0.5), FakeProvider("secondary")
+        manager = self.manager([("primary", primary), ("secondary", secondary)], hedge_after=0.05)
+
+        started = time.monotonic()
+        outcome = manager.call()
+        elapsed = time.monotonic() - started
+
+        self.assertEqual((outcome.result, outcome.provider, outcome.attempts), ("secondary", "secondary", 2))
+        self.assertLess(elapsed, 0.4)
+        self.assertEqual(primary.calls, 1)
+
+    def test_hedge_not_sent_when_primary_is_fast(self):
+        primary, secondary = FakeProvider("primary"), FakeProvider("secondary")
+        manager = self.manager([("primary", primary), ("secondary", secondary)], hedge_after=0.2)
+
+        outcome = manager.call()
+        self.assertEqual((outcome.provider, outcome.attempts), ("primary", 1))
+        self.assertEqual(secondary.calls, 0)
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class RowSerializerParityTests(TestCase):
+    """
+    목록 고속 직렬화(api/fastread.py) ↔ ModelSerializer 출력 일치.
+    Decimal / 마이크로초가 있는 datetime / choices / 이미지 URL / 조인 경로 끝의 NULL / ?fields= / ?expand=.
+    """
+    VIEWSETS = {
+        "transactions": WatchTransactionViewSet,
+        "watch-variants": WatchVariantViewSet,
+        "watch-prices": WatchPriceViewSet,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        brand = Brand.objects.create(name_en="Rolex", name_ko="롤렉스", logo="brand_logos/rolex.png")
+        named = WatchModel.objects.create(brand=brand, nickname="Submariner", image="watch_models/sub.png")
+        unnamed = WatchModel.objects.create(brand=brand, nickname=None)  # model_nickname → null
+        v1 = WatchVariant.objects.create(watch_model=named, model_number="126610LN", color="Black",
+                                         image="watch_variants/126610ln.png")
+        v2 = WatchVariant.objects.create(watch_model=unnamed, model_number="124060", color=None)
+        vendor = Vendor.objects.create(name="Boutique", website=None)
+        kr = Country.objects.create(name_kr="한국", name_en="Korea", iso2="KR", default_currency="KRW",
+                                    flag="country_flags/kr.png")
+        us = Country.objects.create(name_kr="미국", name_en="United States", iso2="US", default_currency="USD")
+        jp = Country.objects.create(name_kr="일본", name_en="Japan", iso2="JP", default_currency="JPY")
+
+        day = datetime.date(2025, 1, 2)
+        ExchangeRate.objects.create(base="USD", quote="KRW", date=day, rate=Decimal("1400.12345678"))
+        rate_engine.mark_stale()
+
+        for i, (variant, year, price) in enumerate([(v1, 2023, 15_000_000), (v2, 2024, 9_900_000)]):
+            WatchPrice.objects.create(watch_variant=variant, vendor=vendor, year=year, price=price,
+                                      url=None if i else "https://example.com/p")
+        rows = [
+            (v1, kr, "sell", {"price": Decimal("15500000.00")}, "풀세트"),
+            (v1, us, "sell", {"price": Decimal("10999.99")}, None),
+            (v2, us, "buy", {"price_min": Decimal("8000.10"), "price_max": Decimal("8500.05")}, None),
+            (v2, jp, "buy", {"price_min": Decimal("1200000"), "price_max": Decimal("1300000")}, ""),  # 환율 없음
+        ]
+        base = timezone.make_aware(datetime.datetime(2025, 3, 1, 9, 30, 15, 123456), datetime.timezone.utc)
+        for i, (variant, country, ttype, prices, note) in enumerate(rows):
+            tx = WatchTransaction.objects.create(watch_variant=variant, country=country, year=2024,
+                                                 transaction_type=ttype, note=note, **prices)
+            WatchTransaction.objects.filter(pk=tx.pk).update(created_at=base + datetime.timedelta(hours=i))
+        WatchPrice.objects.update(created_at=base)
+
+    def setUp(self):
+        rate_engine.mark_stale()
+        self.client = APIClient()
+
+    def test_row_serializer_matches_model_serializer(self):
+        for name, viewset in self.VIEWSETS.items():
+            with self.subTest(name):
+                serializer_class = viewset.serializer_class
+                row_serializer = RowSerializer.compile(serializer_class())
+                self.assertIsNotNone(row_serializer)
+                queryset = viewset.queryset.all()
+                expected = [dict(d) for d in serializer_class(list(queryset), many=True).data]
+                fast = row_serializer.many(queryset.values(*row_serializer.columns))
+                self.assertTrue(expected)
+                self.assertEqual(fast, expected)
+                self.assertEqual([list(d) for d in fast], [list(d) for d in expected])  # 키 순서
+
+    def _get_both(self, url):
+        """같은 요청을 고속 경로 / ModelSerializer 경로로 → (고속 응답, 기존 응답, 고속 경로 사용 여부)."""
+        with mock.patch.object(RowSerializer, "many", autospec=True, side_effect=RowSerializer.many) as many:
+            fast = self.client.get(url)
+        viewset = self.VIEWSETS[url.split("/")[2]]
+        with mock.patch.object(viewset, "fast_list", False):
+            slow = self.client.get(url)
+        self.assertEqual((fast.status_code, slow.status_code), (200, 200))
+        return fast.json(), slow.json(), many.called
+
+    def test_api_responses_match(self):
+        for name in self.VIEWSETS:
+            with self.subTest(name):
+                fast, slow, used = self._get_both(f"/api/{name}/")
+                self.assertTrue(used)
+                self.assertEqual(fast, slow)
+
+    def test_api_sample_values(self):
+        fast, _, _ = self._get_both("/api/transactions/")
+        by_note = {r["note"]: r for r in fast["results"]}
+        row = by_note["풀세트"]
+        self.assertEqual((row["price"], row["price_krw"], row["transaction_type"]),
+                         ("15500000.00", "15500000.00", "sell"))
+        self.assertEqual(row["created_at"], "2025-03-01T18:30:15.123456+09:00")
+        self.assertIsNone(by_note[""]["price_min_krw"])  # JPY 환율 없음
+
+        fast, _, _ = self._get_both("/api/watch-variants/")
+        by_number = {r["model_number"]: r for r in fast}  # 변형 목록은 페이지네이션 없음
+        self.assertEqual(by_number["126610LN"]["image"], "http://testserver/media/watch_variants/126610ln.png")
+        self.assertIsNone(by_number["124060"]["image"])
+        self.assertIsNone(by_number["124060"]["model_nickname"])
+        self.assertIsNone(by_number["124060"]["color"])
+
+    def test_api_sparse_fields_match(self):
+        urls = [
+            "/api/transactions/?fields=id,price,price_krw,created_at,transaction_type",
+            "/api/transactions/?fields=krw_rate,krw_rate_date,country",
+            "/api/watch-variants/?fields=model_number,brand,model_nickname,image",
+            "/api/watch-prices/?fields=price,url,created_at",
+        ]
+        for url in urls:
+            with self.subTest(url):
+                fast, slow, used = self._get_both(url)
+                self.assertTrue(used)
+                self.assertEqual(fast, slow)
+
+    def test_api_expand_falls_back_and_matches(self):
+        urls = [
+            "/api/transactions/?expand=watch_variant,country",
+            "/api/watch-variants/?expand=watch_model,brand",
+            "/api/watch-prices/?expand=vendor,brand&fields=price,vendor,brand",
+        ]
+        for url in urls:
+            with self.subTest(url):
+                fast, slow, used = self._get_both(url)
+                self.assertFalse(used)  # 중첩 시리얼라이저 → 기존 경로
+                self.assertEqual(fast, slow)
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class CreateManyTransactionsTests(TestCase):
+    """POST /api/transactions/ 배열 본문: 항목별 결과에 id, KRW 정규화, 롤업 (bulk_create 가 pk 를 돌려주지 않는 DB 포함)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        brand = Brand.objects.create(name_en="Tudor", name_ko="튜더")
+        cls.variant = WatchVariant.objects.create(watch_model=WatchModel.objects.create(brand=brand),
+                                                  model_number="79830RB")
+        cls.country = Country.objects.create(name_kr="미국", name_en="United States", iso2="US",
+                                             default_currency="USD")
+        ExchangeRate.objects.create(base="USD", quote="KRW", date=datetime.date(2025, 1, 2), rate=Decimal("1400"))
+        cls.operator = get_user_model().objects.create_user("operator", password="pw", role="operator")
+
+    def setUp(self):
+        rate_engine.mark_stale()
+        self.client = APIClient()
+        self.client.force_authenticate(self.operator)
+
+    def _post(self):
+        items = [
+            {"watch_variant": self.variant.pk, "country": self.country.pk, "year": 2024,
+             "transaction_type": "sell", "price": "3500.25"},
+            {"watch_variant": self.variant.pk, "country": self.country.pk, "year": 2024,
+             "transaction_type": "buy"},  # price_min/price_max 없음 → 오류
+            {"watch_variant": self.variant.pk, "country": self.country.pk, "year": 2023,
+             "transaction_type": "buy", "price_min": "3000", "price_max": "3200"},
+        ]
+        response = self.client.post("/api/transactions/", items, format="json")
+        self.assertEqual(response.status_code, 201)
+        return response.json()
+
+    def _assert_created(self, body):
+        self.assertEqual((body["created"], body["failed"]), (2, 1))
+        self.assertEqual([r["status"] for r in body["results"]], [201, 400, 201])
+        ids = [r["data"]["id"] for r in body["results"] if r["status"] == 201]
+        self.assertTrue(all(ids))
+        stored = WatchTransaction.objects.in_bulk(ids)
+        self.assertEqual(stored[ids[0]].price_krw, Decimal("4900350.00"))
+        self.assertEqual(stored[ids[1]].price_max_krw, Decimal("4480000.00"))
+        daily = WatchTransactionDaily.objects.filter(watch_variant=self.variant)
+        self.assertEqual(sum(daily.values_list("count", flat=True)), 2)
+
+    def _post_counting(self):
+        with CaptureQueriesContext(connection) as queries:
+            body = self._post()
+        inserts = [q for q in queries if q["sql"].startswith('INSERT INTO "api_watchtransaction"')]
+        return body, len(queries), len(inserts)
+
+    def test_bulk_insert(self):
+        body, _, inserts = self._post_counting()
+        self._assert_created(body)
+        self.assertEqual(inserts, 1)
+
+    def test_without_returning_bulk_insert(self):
+        self._post()  # 첫 요청의 일회성 조회(버전 행 생성 등)는 비교에서 뺀다
+        WatchTransaction.objects.all().delete()
+        _, returning_queries, _ = self._post_counting()
+        WatchTransaction.objects.all().delete()
+        # MySQL 처럼: bulk_create 가 pk 를 채우지 않는 백엔드 → INSERT 한 번 + id 재조회 한 번
+        with mock.patch.object(type(connection.features), "can_return_rows_from_bulk_insert", False):
+            body, queries, inserts = self._post_counting()
+        self._assert_created(body)
+        self.assertEqual(inserts, 1)
+        self.assertEqual(queries, returning_queries + 1)
+
+    def test_identical_rows_get_distinct_ids(self):
+        item = {"watch_variant": self.variant.pk, "country": self.country.pk, "year": 2024,
+                "transaction_type": "sell", "price": "3500.25"}
+        frozen = timezone.now()
+        with mock.patch.object(type(connection.features), "can_return_rows_from_bulk_insert", False), \
+                mock.patch("django.utils.timezone.now", return_value=frozen):
+            body = self.client.post("/api/transactions/", [item] * 3, format="json").json()
+        ids = [r["data"]["id"] for r in body["results"]]
+        self.assertEqual(ids, sorted(WatchTransaction.objects.values_list("id", flat=True)))
+        self.assertEqual(len(set(ids)), 3)
+
+
+class _FakeBrotli:
+    """brotli 미설치 환경용 대역: zlib 으로 같은 인터페이스(compress / Compressor.process·finish)."""
+
+    @staticmethod
+    def compress(data, quality=None):
+        return zlib.compress(data)
+
+    class Compressor:
+        def __init__(self, quality=None):
+            self._z = zlib.compressobj()
+
+        def process(self, data):
+            return self._z.compress(data)
+
+        def finish(self):
+            return self._z.flush()
+
+
+class CompressionMiddlewareTests(SimpleTestCase):
+    """gzip 임의 패딩(BREACH 완화), brotli 는 자격 증명 없는 요청에만, 토큰 경로/HTML 제외."""
+    BODY = b'{"results": [' + b",".join(b'{"id": %d, "price": "1000.00"}' % i for i in range(200)) + b"]}"
+
+    def _call(self, path, streaming=False, encoding="gzip", content_type="application/json", **headers):
+        def get_response(request):
+            if streaming:
+                return StreamingHttpResponse(iter([self.BODY[:1000], self.BODY[1000:]]),
+                                             content_type="application/x-ndjson")
+            return HttpResponse(self.BODY, content_type=content_type)
+
+        request = RequestFactory().get(path, HTTP_ACCEPT_ENCODING=encoding, **headers)
+        return CompressionMiddleware(get_response)(request)
+
+    def test_gzip_length_varies_between_responses(self):
+        responses = [self._call("/api/transactions/") for _ in range(10)]
+        for response in responses:
+            self.assertEqual(response["Content-Encoding"], "gzip")
+            self.assertEqual(gzip.decompress(response.content), self.BODY)
+        self.assertGreater(len({len(r.content) for r in responses}), 1)
+
+    def test_streaming_gzip(self):
+        response = self._call("/api/transactions/", streaming=True)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(b"".join(response.streaming_content)), self.BODY)
+
+    def test_auth_paths_not_compressed(self):
+        for path in ("/api/auth/login/", "/api/auth/refresh/"):
+            response = self._call(path)
+            self.assertFalse(response.has_header("Content-Encoding"))
+            self.assertEqual(response.content, self.BODY)
+
+    def test_html_not_compressed(self):
+        response = self._call("/api/transactions/", content_type="text/html")  # 브라우저블 API: CSRF 토큰
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    @mock.patch("api.middleware.brotli", _FakeBrotli)
+    def test_brotli_for_anonymous_requests(self):
+        response = self._call("/api/transactions/", encoding="gzip, br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(zlib.decompress(response.content), self.BODY)
+        self.assertIn("Cookie", response["Vary"])
+
+        response = self._call("/api/transactions/", streaming=True, encoding="br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(zlib.decompress(b"".join(response.streaming_content)), self.BODY)
+
+    @mock.patch("api.middleware.brotli", _FakeBrotli)
+    def test_credentials_fall_back_to_padded_gzip(self):
+        # brotli 는 패딩이 없으므로 비밀값이 실릴 수 있는 요청은 gzip
+        for headers in ({"HTTP_AUTHORIZATION": "Bearer token"}, {"HTTP_COOKIE": "sessionid=abc"}):
+            with self.subTest(headers):
+                responses = [self._call("/api/transactions/", encoding="br, gzip", **headers) for _ in range(10)]
+                for response in responses:
+                    self.assertEqual(response["Content-Encoding"], "gzip")
+                    self.assertEqual(gzip.decompress(response.content), self.BODY)
+                self.assertGreater(len({len(r.content) for r in responses}), 1)
+        response = self._call("/api/transactions/", encoding="br", HTTP_AUTHORIZATION="Bearer token")
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class NormalizedRateSyncTests(TestCase):
+    """환율 단건 저장/삭제 후 저장된 KRW 정규화 컬럼도 갱신 → 목록/내보내기/단건 ?convert=KRW 가 같은 환율."""
+
+    @classmethod
+    def setUpTestData(cls):
+        brand = Brand.objects.create(name_en="Cartier", name_ko="까르띠에")
+        variant = WatchVariant.objects.create(watch_model=WatchModel.objects.create(brand=brand), model_number="WSSA0018")
+        us = Country.objects.create(name_kr="미국", name_en="United States", iso2="US", default_currency="USD")
+        ExchangeRate.objects.create(base="USD", quote="KRW", date=datetime.date(2025, 1, 2),
+                                    rate=Decimal("1400.12345678"))
+        rate_engine.mark_stale()
+        cls.tx = WatchTransaction.objects.create(watch_variant=variant, country=us, year=2024,
+                                                 transaction_type="sell", price=Decimal("100.10"))
+
+    def setUp(self):
+        rate_engine.mark_stale()
+        self.client = APIClient()
+
+    def _converted(self):
+        listed = self.client.get("/api/transactions/?convert=KRW").json()["results"][0]
+        single = self.client.get(f"/api/transactions/{self.tx.pk}/?convert=KRW").json()
+        export = self.client.get("/api/transactions/?convert=KRW&format=csv")
+        (row,) = csv.DictReader(b"".join(export.streaming_content).decode("utf-8-sig").splitlines())
+        return [(r["applied_rate"], r["price_converted"]) for r in (listed, single, row)]
+
+    def test_rate_change_updates_stored_columns(self):
+        self.assertEqual(self._converted(), [("1400.12345678", "140152.36")] * 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            new = ExchangeRate.objects.create(base="USD", quote="KRW", date=datetime.date(2025, 2, 3),
+                                              rate=Decimal("1500"))
+        self.assertEqual(self._converted(), [("1500.00000000", "150150.00")] * 3)
+        self.tx.refresh_from_db()
+        self.assertEqual((self.tx.krw_rate, self.tx.krw_rate_date), (Decimal("1500"), datetime.date(2025, 2, 3)))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            new.delete()
+        self.assertEqual(self._converted(), [("1400.12345678", "140152.36")] * 3)
+
+    def test_unrelated_rate_leaves_transactions_alone(self):
+        with mock.patch.object(normalize, "recompute") as recompute, self.captureOnCommitCallbacks(execute=True):
+            ExchangeRate.objects.create(base="EUR", quote="JPY", date=datetime.date(2025, 2, 3), rate=Decimal("160"))
+        recompute.assert_not_called()
+
+
+class CacheConfigTests(TestCase):
+    """공유 캐시 설정 점검(check --deploy 경고)과 운영자용 캐시 통계."""
+
+    def test_dev_cache_backend_is_deploy_warning(self):
+        dev = {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": "/tmp/x"}
+        with override_settings(CACHES={"default": dev, "shared": dev}):
+            self.assertEqual(checks.run_checks(tags=[checks.Tags.caches]), [])  # 일반 check 는 통과
+            warnings = checks.run_checks(tags=[checks.Tags.caches], include_deployment_checks=True)
+        self.assertEqual([w.id for w in warnings], ["api.W001"])
+
+    def test_shared_cache_backend_passes_deploy_check(self):
+        redis = {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": "redis://127.0.0.1:6379/1"}
+        with override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+                                       "shared": redis}):
+            warnings = checks.run_checks(tags=[checks.Tags.caches], include_deployment_checks=True)
+        self.assertNotIn("api.W001", [w.id for w in warnings])
+
+    def test_cache_stats_operator_only(self):
+        client = APIClient()
+        self.assertIn(client.get("/api/fx/cache-stats/").status_code, (401, 403))
+        client.force_authenticate(get_user_model().objects.create_user("op", password="pw", role="operator"))
+        body = client.get("/api/fx/cache-stats/").json()
+        self.assertEqual(set(body), {"fx_fetch", "response"})
+        self.assertTrue({"local_hits", "shared_hits", "misses", "loads", "hit_ratio"} <= set(body["response"]))
+
+
+class TransactionImporterTests(TestCase):
+    """대량 적재: 모델번호 대소문자 무시 조회, 행 단위 오류 보고 (모델 필드 제약 포함)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        brand = Brand.objects.create(name_en="Rolex", name_ko="롤렉스")
+        cls.variant = WatchVariant.objects.create(watch_model=WatchModel.objects.create(brand=brand),
+                                                  model_number="126610LN")
+        Country.objects.create(name_kr="한국", name_en="Korea", iso2="KR", default_currency="KRW")
+
+    def _row(self, **overrides):
+        row = {"model_number": "126610LN", "country": "KR", "year": "2024", "transaction_type": "sell",
+               "price": "15,000,000"}
+        row.update(overrides)
+        return row
+
+    def test_model_number_case_insensitive(self):
+        result = TransactionImporter().run([self._row(model_number=" 126610ln "), self._row(model_number="126610Ln")])
+        self.assertEqual((result.created, result.failed), (2, 0))
+        self.assertEqual(set(WatchTransaction.objects.values_list("watch_variant_id", flat=True)), {self.variant.pk})
+
+    def test_overlong_url_reported_per_row(self):
+        long_url = "https://example.com/" + "a" * 200  # 유효한 URL 이지만 URLField max_length=200 초과
+        result = TransactionImporter().run([
+            self._row(),
+            self._row(url=long_url),
+            self._row(transaction_type="buy", price="", price_min="1", price_max="2"),
+        ])
+        self.assertEqual((result.created, result.failed), (2, 1))
+        (error,) = result.errors
+        self.assertEqual(error["row"], 2)
+        self.assertEqual(list(error["errors"]), ["url"])
+        self.assertEqual(WatchTransaction.objects.count(), 2)
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False, FX_PIVOTS=["USD", "KRW", "EUR"])
+class AsOfRatesTests(TestCase):
+    """거래일 기준 환율: 직접 / 역수 / 피벗 경유, 날짜별 as-of. KRW 기준 환율만 저장된 상태."""
+    Q = Decimal("0.00000001")
+
+    @classmethod
+    def setUpTestData(cls):
+        for base, day, rate in (("USD", "2025-01-01", "1400"), ("USD", "2025-02-01", "1450"),
+                                ("JPY", "2025-01-01", "9.5")):
+            ExchangeRate.objects.create(base=base, quote="KRW", date=datetime.date.fromisoformat(day),
+                                        rate=Decimal(rate))
+
+    def test_direct(self):
+        asof = AsOfRates("KRW", {"USD", "KRW"})
+        self.assertEqual(asof.rate("USD", datetime.date(2025, 1, 15)), Decimal("1400"))
+        self.assertEqual(asof.rate("USD", datetime.date(2025, 2, 1)), Decimal("1450"))
+        self.assertIsNone(asof.rate("USD", datetime.date(2024, 12, 31)))
+        self.assertEqual(asof.rate("KRW", datetime.date(2025, 1, 15)), Decimal(1))
+
+    def test_inverse(self):
+        asof = AsOfRates("USD", {"KRW"})
+        self.assertEqual(asof.rate("KRW", datetime.date(2025, 1, 15)), (1 / Decimal("1400")).quantize(self.Q))
+        self.assertEqual(asof.rate("KRW", datetime.date(2025, 3, 1)), (1 / Decimal("1450")).quantize(self.Q))
+
+    def test_pivot(self):
+        asof = AsOfRates("USD", {"JPY"})
+        # JPY→KRW × KRW→USD(역수): 반올림은 최종 곱에만
+        self.assertEqual(asof.rate("JPY", datetime.date(2025, 1, 15)), (Decimal("9.5") / Decimal("1400")).quantize(self.Q))
+        self.assertEqual(asof.rate("JPY", datetime.date(2025, 2, 10)), (Decimal("9.5") / Decimal("1450")).quantize(self.Q))
+        self.assertIsNone(AsOfRates("USD", {"CHF"}).rate("CHF", datetime.date(2025, 1, 15)))
+
+    def test_convert_int_matches_rate(self):
+        asof = AsOfRates("USD", {"JPY", "KRW"})
+        days = [datetime.date(2024, 12, 1), datetime.date(2025, 1, 15), datetime.date(2025, 2, 10)]
+        currencies = ["JPY", "KRW", "USD"]
+        rates, ok = asof.convert_int(np.array(currencies), np.array(days, dtype="datetime64[D]"))
+        self.assertEqual(ok.tolist(), [False, True, True])
+        self.assertEqual(rates[1], int((1 / Decimal("1400")).quantize(self.Q).scaleb(8)))
+        self.assertEqual(rates[2], 10 ** 8)
+
+    def test_api_transaction_date_conversion_to_unstored_quote(self):
+        brand = Brand.objects.create(name_en="IWC", name_ko="IWC")
+        variant = WatchVariant.objects.create(watch_model=WatchModel.objects.create(brand=brand), model_number="IW3716")
+        jp = Country.objects.create(name_kr="일본", name_en="Japan", iso2="JP", default_currency="JPY")
+        tx = WatchTransaction.objects.create(watch_variant=variant, country=jp, year=2024,
+                                             transaction_type="sell", price=Decimal("1000000"))
+        WatchTransaction.objects.filter(pk=tx.pk).update(
+            created_at=timezone.make_aware(datetime.datetime(2025, 1, 15, 12)))
+
+        item = APIClient().get("/api/transactions/?convert=USD&convert_at=transaction").json()["results"][0]
+        rate = (Decimal("9.5") / Decimal("1400")).quantize(self.Q)
+        self.assertEqual(item["applied_rate"], f"{rate:.8f}")
+        self.assertEqual(item["price_converted"], str((Decimal("1000000") * rate).quantize(Decimal("0.01"))))
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class SparseConvertFieldsTests(TestCase):
+    """?fields= + ?convert=: 환산 입력 필드는 내부에서만 읽고 응답/내보내기에는 요청한 필드만."""
+
+    @classmethod
+    def setUpTestData(cls):
+        brand = Brand.objects.create(name_en="Tudor", name_ko="튜더")
+        variant = WatchVariant.objects.create(watch_model=WatchModel.objects.create(brand=brand), model_number="M79030N")
+        us = Country.objects.create(name_kr="미국", name_en="United States", iso2="US", default_currency="USD")
+        ExchangeRate.objects.create(base="USD", quote="KRW", date=datetime.date(2025, 1, 2), rate=Decimal("1400"))
+        reset_rate_engine()
+        cls.tx = WatchTransaction.objects.create(watch_variant=variant, country=us, year=2024,
+                                                 transaction_type="sell", price=Decimal("100.10"))
+
+    def setUp(self):
+        rate_engine.mark_stale()
+        self.client = APIClient()
+
+    def test_list_and_retrieve_keep_only_requested(self):
+        for convert in ("USD", "KRW", "EUR"):  # 환산 안 함 / 저장 컬럼 / 환율 엔진
+            with self.subTest(convert):
+                (item,) = self.client.get(f"/api/transactions/?fields=id,price&convert={convert}").json()["results"]
+                self.assertEqual(list(item), ["id", "price"])
+
+        (item,) = self.client.get("/api/transactions/?fields=id,price_converted&convert=KRW").json()["results"]
+        self.assertEqual(item, {"id": self.tx.pk, "price_converted": "140140.00"})
+
+        single = self.client.get(f"/api/transactions/{self.tx.pk}/?fields=id,applied_rate&convert=KRW").json()
+        self.assertEqual(single, {"id": self.tx.pk, "applied_rate": "1400.00000000"})
+
+    def test_converted_fields_need_convert(self):
+        self.assertEqual(self.client.get("/api/transactions/?fields=id,price_converted").status_code, 400)
+
+    def test_export_keeps_only_requested(self):
+        url = "/api/transactions/?fields=id,price_converted&convert=KRW&format="
+        text = b"".join(self.client.get(url + "csv").streaming_content).decode("utf-8-sig")
+        self.assertEqual(list(csv.DictReader(text.splitlines())),
+                         [{"id": str(self.tx.pk), "price_converted": "140140.00"}])
+        lines = b"".join(self.client.get(url + "ndjson").streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], [{"id": self.tx.pk, "price_converted": "140140.00"}])
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class KeysetPaginationTests(TestCase):
+    """커서 페이지네이션: (-created_at, -id) 순서, 같은 created_at 은 id 로 구분, 페이지 사이 삽입에도 중복/누락 없음."""
+
+    @classmethod
+    def setUpTestData(cls):
+        brand = Brand.objects.create(name_en="Omega", name_ko="오메가")
+        cls.variant = WatchVariant.objects.create(watch_model=WatchModel.objects.create(brand=brand),
+                                                  model_number="310.30.42")
+        cls.kr = Country.objects.create(name_kr="한국", name_en="Korea", iso2="KR", default_currency="KRW")
+        base = timezone.make_aware(datetime.datetime(2025, 3, 1, 9, 0))
+        # 앞의 세 건과 뒤의 네 건은 created_at 이 같다
+        for i, hour in enumerate([0, 0, 0, 1, 1, 1, 1]):
+            tx = WatchTransaction.objects.create(watch_variant=cls.variant, country=cls.kr, year=2024,
+                                                 transaction_type="sell", price=Decimal(1000 + i))
+            WatchTransaction.objects.filter(pk=tx.pk).update(created_at=base + datetime.timedelta(hours=hour))
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def _walk(self, url, on_page=None):
+        ids, pages = [], 0
+        while url:
+            body = self.client.get(url).json()
+            self.assertNotIn("count", body)  # COUNT(*) 없음
+            ids += [item["id"] for item in body["results"]]
+            pages += 1
+            if on_page:
+                on_page(pages)
+            url = body["next"]
+        return ids, pages
+
+    def test_pages_follow_created_at_then_id(self):
+        expected = list(WatchTransaction.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+        ids, pages = self._walk("/api/transactions/?page_size=2")
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 4)
+
+    def test_insert_between_pages_does_not_shift(self):
+        expected = list(WatchTransaction.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+
+        def insert_newer(page):
+            if page == 1:
+                WatchTransaction.objects.create(watch_variant=self.variant, country=self.kr, year=2024,
+                                                transaction_type="sell", price=Decimal("999"))
+
+        ids, _ = self._walk("/api/transactions/?page_size=3", on_page=insert_newer)
+        self.assertEqual(ids, expected)
+
+    def test_previous_returns_same_page(self):
+        first = self.client.get("/api/transactions/?page_size=3").json()
+        second = self.client.get(first["next"]).json()
+        back = self.client.get(second["previous"]).json()
+        self.assertEqual([i["id"] for i in back["results"]], [i["id"] for i in first["results"]])
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get("/api/transactions/?cursor=cD1ub3Rqc29u").status_code, 404)  # p=notjson
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class VariantMarketSummaryTests(TestCase):
+    """변형 시세 요약: 통화 정규화, 판매/매입 통계, 환율 없는 행 제외, 거래일(현지 날짜) 기준 환율."""
+
+    @classmethod
+    def setUpTestData(cls):
+        brand = Brand.objects.create(name_en="Panerai", name_ko="파네라이")
+        cls.variant = WatchVariant.objects.create(watch_model=WatchModel.objects.create(brand=brand),
+                                                  model_number="PAM01312")
+        kr = Country.objects.create(name_kr="한국", name_en="Korea", iso2="KR", default_currency="KRW")
+        us = Country.objects.create(name_kr="미국", name_en="United States", iso2="US", default_currency="USD")
+        jp = Country.objects.create(name_kr="일본", name_en="Japan", iso2="JP", default_currency="JPY")
+        for day, rate in (("2025-01-01", "1400"), ("2025-02-01", "1500")):
+            ExchangeRate.objects.create(base="USD", quote="KRW", date=datetime.date.fromisoformat(day),
+                                        rate=Decimal(rate))
+        reset_rate_engine()
+        rows = [
+            (kr, 2023, "sell", {"price": Decimal("1000000")}, "2025-01-10T00:00:00+00:00"),
+            # UTC 1월 31일 16시 = 서울 2월 1일 01시 → 거래일 환율은 2월 1일(1500)
+            (us, 2024, "sell", {"price": Decimal("1000")}, "2025-01-31T16:00:00+00:00"),
+            (jp, 2024, "sell", {"price": Decimal("100000")}, "2025-01-10T00:00:00+00:00"),  # JPY 환율 없음
+            (us, 2024, "buy", {"price_min": Decimal("800"), "price_max": Decimal("900")}, "2025-01-10T00:00:00+00:00"),
+        ]
+        for country, year, ttype, prices, created in rows:
+            tx = WatchTransaction.objects.create(watch_variant=cls.variant, country=country, year=year,
+                                                 transaction_type=ttype, **prices)
+            WatchTransaction.objects.filter(pk=tx.pk).update(created_at=datetime.datetime.fromisoformat(created))
+
+    def setUp(self):
+        rate_engine.mark_stale()
+        self.client = APIClient()
+
+    def _market(self, query=""):
+        response = self.client.get(f"/api/watch-variants/{self.variant.pk}/market/{query}")
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_latest_rates(self):
+        body = self._market("?convert=KRW")
+        self.assertEqual((body["quote"], body["convert_at"], body["unconverted"]), ("KRW", "latest", 1))
+        self.assertEqual(body["rates"], {"KRW": "1.00000000", "USD": "1500.00000000", "JPY": None})
+        sell = body["sell"]
+        self.assertEqual(sell["overall"]["count"], 2)
+        self.assertEqual((sell["overall"]["min"], sell["overall"]["max"], sell["overall"]["median"]),
+                         ("1000000.00", "1500000.00", "1250000.00"))
+        self.assertEqual(sell["by_country"]["US"]["mean"], "1500000.00")
+        self.assertEqual(sell["by_country"]["JP"]["count"], 0)
+        self.assertEqual(sorted(sell["by_year"]), ["2023", "2024"])
+        buy = body["buy"]["overall"]
+        self.assertEqual((buy["price_min"]["min"], buy["price_max"]["max"]), ("1200000.00", "1350000.00"))
+
+    def test_transaction_date_rates_use_local_day(self):
+        body = self._market("?convert=KRW&convert_at=transaction")
+        self.assertIsNone(body["rates"])
+        self.assertEqual(body["sell"]["by_country"]["US"]["mean"], "1500000.00")
+        self.assertEqual(body["buy"]["overall"]["price_min"]["min"], "1120000.00")  # 1월 10일 → 1400
+
+    def test_local_days(self):
+        values = [datetime.datetime(2025, 1, 31, 14, 59, tzinfo=datetime.timezone.utc),
+                  datetime.datetime(2025, 1, 31, 15, 0, tzinfo=datetime.timezone.utc)]
+        self.assertEqual(local_days(values).tolist(), [datetime.date(2025, 1, 31), datetime.date(2025, 2, 1)])
+
+    def test_invalid_convert_at(self):
+        self.assertEqual(self.client.get(f"/api/watch-variants/{self.variant.pk}/market/?convert_at=x").status_code, 400)
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class StreamingExportTests(TestCase):
+    """?format=csv|ndjson: 목록과 같은 필터/필드/값 표현, 스트리밍 응답, 행 수와 무관한 쿼리 수."""
+
+    @classmethod
+    def setUpTestData(cls):
+        brand = Brand.objects.create(name_en="Breitling", name_ko="브라이틀링")
+        model = WatchModel.objects.create(brand=brand)
+        cls.v1 = WatchVariant.objects.create(watch_model=model, model_number="AB0138")
+        v2 = WatchVariant.objects.create(watch_model=model, model_number="A17326")
+        kr = Country.objects.create(name_kr="한국", name_en="Korea", iso2="KR", default_currency="KRW")
+        vendor = Vendor.objects.create(name="Dealer")
+        for i in range(5):
+            WatchTransaction.objects.create(watch_variant=cls.v1 if i % 2 else v2, country=kr, year=2020 + i,
+                                            transaction_type="sell", price=Decimal(f"{1000 + i}.50"), note=f"메모{i}")
+        WatchTransaction.objects.create(watch_variant=cls.v1, country=kr, year=2024, transaction_type="buy",
+                                        price_min=Decimal("900"), price_max=Decimal("950.25"))
+        WatchPrice.objects.create(watch_variant=cls.v1, vendor=vendor, year=2024, price=Decimal("12000000"))
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def _export(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response, StreamingHttpResponse)
+        return response, b"".join(response.streaming_content).decode("utf-8")
+
+    def _listed(self, url):
+        return self.client.get(url + "&page_size=500").json()["results"]
+
+    def test_csv_matches_list(self):
+        query = f"?watch_variant={self.v1.pk}"
+        response, text = self._export(f"/api/transactions/{query}&format=csv")
+        self.assertTrue(response["Content-Type"].startswith("text/csv"))
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="watchtransaction.csv"')
+        self.assertTrue(text.startswith("﻿"))
+        rows = list(csv.DictReader(text[1:].splitlines()))
+        listed = self._listed(f"/api/transactions/{query}")
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(list(rows[0]), list(listed[0]))
+        # CSV 는 None 을 빈 칸으로 쓴다
+        as_text = [{k: "" if v is None else str(v) for k, v in item.items()} for item in listed]
+        self.assertEqual(sorted(rows, key=lambda r: int(r["id"])), sorted(as_text, key=lambda r: int(r["id"])))
+
+    def test_ndjson_matches_list(self):
+        for url in ("/api/transactions/?transaction_type=sell", "/api/watch-prices/?year=2024"):
+            with self.subTest(url):
+                response, text = self._export(url + "&format=ndjson")
+                self.assertTrue(response["Content-Type"].startswith("application/x-ndjson"))
+                rows = [json.loads(line) for line in text.splitlines()]
+                self.assertTrue(rows)
+                self.assertCountEqual(rows, self._listed(url))
+
+    def test_query_count_independent_of_rows(self):
+        def count(url):
+            with CaptureQueriesContext(connection) as ctx:
+                self._export(url)
+            return len(ctx.captured_queries)
+
+        few = count(f"/api/transactions/?watch_variant={self.v1.pk}&format=ndjson")
+        self.assertEqual(count("/api/transactions/?format=ndjson"), few)
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class ConditionalGetTests(TestCase):
+    """ETag / Last-Modified: 일치하면 본 쿼리 없이 304, 쓰기(버전 증가) 후에는 새 ETag 로 200."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.brand = Brand.objects.create(name_en="Zenith", name_ko="제니스")
+        cls.operator = get_user_model().objects.create_user("operator", password="pw", role="operator")
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_if_none_match_returns_304_with_one_query(self):
+        first = self.client.get("/api/brands/")
+        etag = first["ETag"]
+        self.assertEqual(first["Cache-Control"], "no-cache")
+        self.assertIn("Last-Modified", first)
+        with CaptureQueriesContext(connection) as ctx:
+            second = self.client.get("/api/brands/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second["ETag"], etag)
+        self.assertEqual(len(ctx.captured_queries), 1)  # 버전 테이블만
+        # 압축 미들웨어가 붙이는 W/ 는 무시하고 비교
+        self.assertEqual(self.client.get("/api/brands/", HTTP_IF_NONE_MATCH=f"W/{etag}").status_code, 304)
+        self.assertEqual(self.client.get(f"/api/brands/{self.brand.pk}/", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_etag_differs_by_format(self):
+        etag = self.client.get("/api/brands/")["ETag"]
+        self.assertEqual(self.client.get("/api/brands/?format=api", HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_write_changes_etag(self):
+        etag = self.client.get("/api/brands/")["ETag"]
+        operator = APIClient()
+        operator.force_authenticate(self.operator)
+        self.assertEqual(operator.post("/api/brands/", {"name_en": "Hublot", "name_ko": "위블로"}).status_code, 201)
+
+        response = self.client.get("/api/brands/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(response.json()), 2)
+        # 펼침 대상 모델(Brand)이 바뀌어도 변형 목록 ETag 가 바뀐다
+        variant_etag = self.client.get("/api/watch-variants/")["ETag"]
+        self.brand.name_en = "Zenith SA"
+        self.brand.save()
+        self.assertNotEqual(self.client.get("/api/watch-variants/")["ETag"], variant_etag)
+
+    def test_if_modified_since(self):
+        last_modified = self.client.get("/api/brands/")["Last-Modified"]
+        self.assertEqual(self.client.get("/api/brands/", HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+        self.assertEqual(self.client.get("/api/brands/", HTTP_IF_MODIFIED_SINCE="Mon, 01 Jan 2001 00:00:00 GMT")
+                         .status_code, 200)
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False, FX_PIVOTS=["USD", "KRW", "EUR"])
+class RateEngineTests(TestCase):
+    """최신 환율 행렬: 직접 / 역수 / 피벗 경유, 정밀(Decimal) 환율과 기준일, 버전 변경 시 재구성."""
+
+    @classmethod
+    def setUpTestData(cls):
+        ExchangeRate.objects.create(base="USD", quote="KRW", date=datetime.date(2025, 1, 3), rate=Decimal("1400"))
+        ExchangeRate.objects.create(base="EUR", quote="USD", date=datetime.date(2025, 1, 2), rate=Decimal("1.1"))
+        ExchangeRate.objects.create(base="USD", quote="JPY", date=datetime.date(2025, 1, 3), rate=Decimal("150"))
+
+    def setUp(self):
+        reset_rate_engine()
+
+    def test_direct_inverse_and_pivot(self):
+        self.assertEqual(rate_engine.rate("USD", "KRW"), 1400.0)
+        self.assertAlmostEqual(rate_engine.rate("KRW", "USD"), 1 / 1400)
+        self.assertAlmostEqual(rate_engine.rate("EUR", "KRW"), 1540.0)       # EUR→USD→KRW
+        self.assertAlmostEqual(rate_engine.rate("KRW", "EUR"), 1 / 1540)     # 역수 두 번
+        self.assertEqual(rate_engine.rate("krw", "KRW"), 1.0)
+        self.assertIsNone(rate_engine.rate("CHF", "KRW"))
+
+    def test_detail_is_exact_with_oldest_leg_date(self):
+        self.assertEqual(rate_engine.detail("USD", "KRW"), (Decimal("1400"), datetime.date(2025, 1, 3)))
+        self.assertEqual(rate_engine.detail("EUR", "KRW"), (Decimal("1540.00000000"), datetime.date(2025, 1, 2)))
+        rate, day = rate_engine.detail("KRW", "USD")
+        self.assertEqual((rate, day), (Decimal("0.00071429"), datetime.date(2025, 1, 3)))
+        self.assertIsNone(rate_engine.detail("CHF", "KRW"))
+
+    def test_convert_int(self):
+        rates, ok = rate_engine.convert_int(np.array(["USD", "EUR", "KRW", "CHF", ""]), "KRW")
+        self.assertEqual(ok.tolist(), [True, True, True, False, False])
+        self.assertEqual(rates[:3].tolist(), [1400 * 10 ** 8, 1540 * 10 ** 8, 10 ** 8])
+
+    def test_latest_marks_derived(self):
+        rates, derived = rate_engine.latest("KRW")
+        self.assertEqual(rates["USD"], "1400.00000000")
+        self.assertEqual(rates["JPY"], "9.33333333")
+        self.assertIn("EUR", rates)
+        self.assertEqual(derived, ["EUR", "JPY"])
+
+    def test_pivot_rounds_only_the_product(self):
+        # JPY→USD(1/150) × USD→KRW(1400): 역수를 먼저 8자리로 자르면 9.33333338
+        self.assertEqual(rate_engine.detail("JPY", "KRW")[0], Decimal("9.33333333"))
+        self.assertEqual(rate_engine.rates_map(["jpy", "USD", "CHF", ""], "KRW"),
+                         {"JPY": Decimal("9.33333333"), "USD": Decimal("1400")})
+
+    def test_reloads_after_rate_change(self):
+        self.assertEqual(rate_engine.rate("USD", "KRW"), 1400.0)
+        ExchangeRate.objects.create(base="USD", quote="KRW", date=datetime.date(2025, 1, 4), rate=Decimal("1450"))
+        rate_engine.mark_stale()
+        self.assertEqual(rate_engine.rate("USD", "KRW"), 1450.0)
+        self.assertAlmostEqual(rate_engine.rate("EUR", "KRW"), 1595.0)
+
+
+class RateBackfillTests(TestCase):
+    """기간 백필: 저장된 날짜 제외, 구간 분할, 실패 구간만 재실행, 휴일은 체크포인트로 다시 요청하지 않음."""
+    START, END = datetime.date(2025, 1, 1), datetime.date(2025, 1, 12)  # 1/4-5, 1/11-12 주말
+
+    @classmethod
+    def setUpTestData(cls):
+        ExchangeRate.objects.create(base="USD", quote="KRW", date=datetime.date(2025, 1, 2), rate=Decimal("1400"))
+
+    def setUp(self):
+        self.checkpoint = os.path.join(self.enterContext(tempfile.TemporaryDirectory()), "backfill.json")
+        self.calls = []
+        self.fail_from = None
+
+    def _series(self, bases, quotes, start, end):
+        self.calls.append((start, end))
+        if start == self.fail_from:
+            raise SeriesUnavailable("down")
+        result = exchange.FetchResult(calls=1)
+        day = start
+        while day <= end:
+            if day.weekday() < 5:
+                result.rates.append(ExchangeRate(base="USD", quote="KRW", date=day, rate=Decimal("1450"), source="test"))
+            else:
+                result.missing.append((day, "USD", "KRW"))
+            day += datetime.timedelta(days=1)
+        return result
+
+    def _run(self, **kwargs):
+        backfill = RateBackfill(["USD"], ["KRW"], self.START, self.END, workers=1, chunk_days=3,
+                                checkpoint=self.checkpoint, **kwargs)
+        with mock.patch("api.services.fx_backfill.fetch_rate_series", side_effect=self._series):
+            return backfill.run()
+
+    def test_ranges_skip_stored_days(self):
+        backfill = RateBackfill(["USD"], ["KRW"], self.START, self.END, chunk_days=3)
+        days = backfill.pending_days()
+        self.assertNotIn(datetime.date(2025, 1, 2), days)
+        d = datetime.date
+        self.assertEqual(backfill.ranges(days), [(d(2025, 1, 1), d(2025, 1, 1)), (d(2025, 1, 3), d(2025, 1, 5)),
+                                                 (d(2025, 1, 6), d(2025, 1, 8)), (d(2025, 1, 9), d(2025, 1, 11)),
+                                                 (d(2025, 1, 12), d(2025, 1, 12))])
+
+    def test_resume_after_failure(self):
+        self.fail_from = datetime.date(2025, 1, 6)
+        first = self._run()
+        self.assertEqual([(s, e) for s, e, _ in first.failed], [(datetime.date(2025, 1, 6), datetime.date(2025, 1, 8))])
+        self.assertEqual(first.created, 4)  # 1/1, 1/3, 1/9, 1/10
+        self.assertEqual(len(first.missing), 4)
+
+        self.fail_from, self.calls = None, []
+        second = self._run()
+        self.assertEqual(self.calls, [(datetime.date(2025, 1, 6), datetime.date(2025, 1, 8))])
+        self.assertEqual((second.created, second.skipped_days, second.failed), (3, 9, []))
+        self.assertEqual(ExchangeRate.objects.filter(source="test").count(), 7)
+
+        self.calls = []
+        third = self._run()
+        self.assertEqual((self.calls, third.skipped_days), ([], 12))  # 주말도 다시 요청하지 않는다
+
+    def test_checkpoint_for_other_arguments_is_ignored(self):
+        self._run()
+        self.calls = []
+        other = RateBackfill(["USD"], ["KRW"], self.START, self.END + datetime.timedelta(days=1), workers=1,
+                             chunk_days=3, checkpoint=self.checkpoint)
+        with mock.patch("api.services.fx_backfill.fetch_rate_series", side_effect=self._series):
+            other.run()
+        self.assertIn((datetime.date(2025, 1, 4), datetime.date(2025, 1, 5)), self.calls)  # 주말 재요청
+
+    def test_dry_run_writes_nothing(self):
+        result = self._run(dry_run=True)
+        self.assertEqual(result.created, 7)
+        self.assertFalse(ExchangeRate.objects.filter(source="test").exists())
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+
+class MoneyTests(SimpleTestCase):
+    """정수 최소단위 금액: 저장 자릿수 그대로 변환, 환산 반올림(half-up)은 마지막에 한 번, 배열/단건 결과 일치."""
+
+    def test_to_minor(self):
+        self.assertEqual(money.to_minor("7003.85"), 700385)
+        self.assertEqual(money.to_minor(Decimal("1500000")), 150000000)  # KRW 도 소수 2자리 그대로
+        self.assertEqual(money.to_minor("0.005"), 1)    # 저장 자릿수보다 긴 입력만 half-up
+        self.assertEqual(money.to_minor("0.0049"), 0)
+        self.assertIsNone(money.to_minor(""))
+        self.assertIsNone(money.to_minor("abc"))
+        self.assertEqual(money.format_minor(700385), "7003.85")
+        self.assertEqual(money.format_minor(5), "0.05")
+        self.assertIsNone(money.format_minor(None))
+
+    def test_rates(self):
+        self.assertEqual(money.rate_to_int(Decimal("1400.12345678")), 140012345678)
+        self.assertEqual(money.rate_to_int("0.000714285714"), 71429)
+        self.assertEqual(money.format_rate(Decimal("1400")), "1400.00000000")
+        self.assertEqual(money.format_rate(0.1), "0.10000000")
+
+    def test_convert_rounds_half_up_once(self):
+        rate = money.rate_to_int(Decimal("1400.12345678"))
+        self.assertEqual(money.convert_minor(money.to_minor("100.10"), rate), 14015236)  # 140152.357...
+        # 0.005 경계: 0.01 × 0.5 = 0.005 → 0.01
+        self.assertEqual(money.convert_minor(1, money.rate_to_int("0.5")), 1)
+        self.assertEqual(money.convert_minor(1, money.rate_to_int("0.49999999")), 0)
+        self.assertIsNone(money.convert_minor(None, rate))
+        self.assertIsNone(money.convert_minor(100, None))
+
+    def test_convert_array_matches_scalar(self):
+        amounts = [0, 1, 10010, 99999999999, 12345678901234]
+        rates = [money.rate_to_int(r) for r in ("1400.12345678", "0.5", "0.00071429", "9.5", "1")]
+        got = money.convert_array(np.array(amounts), np.array(rates))
+        self.assertEqual(got.tolist(), [money.convert_minor(a, r) for a, r in zip(amounts, rates)])
+        # int64 를 넘는 곱은 파이썬 정수로 계산
+        big = money.convert_array(np.array([10 ** 15]), np.array([money.rate_to_int("150000")]))
+        self.assertEqual(int(big[0]), money.convert_minor(10 ** 15, money.rate_to_int("150000")))
+
+    def test_to_minor_array(self):
+        minor, ok = money.to_minor_array([Decimal("1.50"), None, Decimal("0")])
+        self.assertEqual((minor.tolist(), ok.tolist()), ([150, 0, 0], [True, False, True]))
+        self.assertEqual(money.to_float(np.array([150, 5])).tolist(), [1.5, 0.05])
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class ColumnarRendererTests(TestCase):
+    """?format=columnar: JSON 목록과 같은 값을 열 배열로, 반복 값 열은 사전 인코딩, next/previous 유지."""
+
+    @classmethod
+    def setUpTestData(cls):
+        brand = Brand.objects.create(name_en="Tag Heuer", name_ko="태그호이어")
+        variant = WatchVariant.objects.create(watch_model=WatchModel.objects.create(brand=brand), model_number="CBN2A1B")
+        kr = Country.objects.create(name_kr="한국", name_en="Korea", iso2="KR", default_currency="KRW")
+        us = Country.objects.create(name_kr="미국", name_en="United States", iso2="US", default_currency="USD")
+        for country, price in ((kr, "7000000"), (us, "5000.50"), (kr, "6900000")):
+            WatchTransaction.objects.create(watch_variant=variant, country=country, year=2024,
+                                            transaction_type="sell", price=Decimal(price))
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def _pair(self, query):
+        rows = self.client.get(f"/api/transactions/?{query}").json()
+        response = self.client.get(f"/api/transactions/?{query}&format=columnar")
+        self.assertEqual(response.status_code, 200)
+        return rows, response.json()
+
+    def test_columns_match_rows(self):
+        rows, body = self._pair("page_size=2")
+        results = rows["results"]
+        self.assertEqual(body["columns"], list(results[0]))
+        self.assertIsNone(body["previous"])
+        self.assertIn("format=columnar", body["next"])
+        self.assertIn("cursor=", body["next"])
+        for col in body["columns"]:
+            values = body["data"][col]
+            self.assertEqual(len(values), 2)
+            if col in body["dictionaries"]:
+                values = [None if v is None else body["dictionaries"][col][v] for v in values]
+            self.assertEqual(values, [r[col] for r in results], col)
+
+    def test_dictionary_encoding(self):
+        _, body = self._pair("page_size=10")
+        self.assertEqual(body["dictionaries"]["currency"], ["KRW", "USD"])  # 최신순: KRW, USD, KRW
+        self.assertEqual(body["data"]["currency"], [0, 1, 0])
+        self.assertEqual(body["dictionaries"]["year"], [2024])
+        self.assertNotIn("price", body["dictionaries"])
+        self.assertEqual(body["data"]["price"], ["6900000.00", "5000.50", "7000000.00"])
+
+    def test_errors_are_plain_json(self):
+        response = self.client.get("/api/transactions/?format=columnar&year=abc")
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn("columns", response.json())
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=True)
+class ResponseCacheTests(TestCase):
+    """익명 GET 응답 캐시: 적중 시 버전 조회만, 단건/대량 쓰기(버전 증가) 후 새 데이터, 로그인 사용자는 캐시 안 함."""
+
+    @classmethod
+    def setUpTestData(cls):
+        brand = Brand.objects.create(name_en="Grand Seiko", name_ko="그랜드세이코")
+        cls.variant = WatchVariant.objects.create(watch_model=WatchModel.objects.create(brand=brand),
+                                                  model_number="SBGA211")
+        cls.kr = Country.objects.create(name_kr="한국", name_en="Korea", iso2="KR", default_currency="KRW")
+        WatchTransaction.objects.create(watch_variant=cls.variant, country=cls.kr, year=2024,
+                                        transaction_type="sell", price=Decimal("6000000"))
+        cls.operator = get_user_model().objects.create_user("operator", password="pw", role="operator")
+
+    def setUp(self):
+        response_cache.invalidate()  # 롤백된 테스트와 버전 스탬프가 같아 이전 항목이 보일 수 있다
+        reset_rate_engine()
+        self.client = APIClient()
+
+    def _get(self, url, client=None):
+        with CaptureQueriesContext(connection) as ctx:
+            response = (client or self.client).get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.json(), len(ctx.captured_queries)
+
+    def test_hit_only_reads_versions(self):
+        first, cold = self._get("/api/transactions/")
+        second, warm = self._get("/api/transactions/")
+        self.assertEqual(first, second)
+        self.assertGreater(cold, warm)
+        self.assertEqual(warm, 1)  # 버전 스탬프 조회
+
+    def test_write_through_api_invalidates(self):
+        self._get("/api/transactions/")
+        operator = APIClient()
+        operator.force_authenticate(self.operator)
+        created = operator.post("/api/transactions/", {
+            "watch_variant": self.variant.pk, "country": self.kr.pk, "year": 2023,
+            "transaction_type": "sell", "price": "5900000",
+        }, format="json")
+        self.assertEqual(created.status_code, 201)
+        body, _ = self._get("/api/transactions/")
+        self.assertEqual(len(body["results"]), 2)
+
+        WatchTransaction.objects.get(pk=created.json()["id"]).delete()
+        body, _ = self._get("/api/transactions/")
+        self.assertEqual(len(body["results"]), 1)
+
+    def test_bulk_write_invalidates(self):
+        self._get("/api/transactions/")
+        TransactionImporter().insert([WatchTransaction(watch_variant=self.variant, country=self.kr, year=2022,
+                                                       transaction_type="sell", price=Decimal("5000000"),
+                                                       currency="KRW")])
+        body, _ = self._get("/api/transactions/")
+        self.assertEqual(len(body["results"]), 2)
+
+    def test_related_model_write_invalidates(self):
+        self._get("/api/watch-variants/")
+        self.variant.watch_model.brand.save()  # post_save → 버전 증가
+        _, queries = self._get("/api/watch-variants/")
+        self.assertGreater(queries, 1)
+
+    def test_keys_and_postprocessing(self):
+        plain, _ = self._get("/api/transactions/")
+        converted, _ = self._get("/api/transactions/?convert=KRW")
+        again, _ = self._get("/api/transactions/?convert=KRW")
+        self.assertEqual(converted, again)
+        self.assertNotIn("price_converted", self._get("/api/transactions/")[0]["results"][0])
+        self.assertEqual(plain["results"][0]["id"], converted["results"][0]["id"])
+
+    def test_authenticated_requests_bypass_cache(self):
+        client = APIClient()
+        client.force_authenticate(self.operator)
+        _, cold = self._get("/api/transactions/", client)
+        _, warm = self._get("/api/transactions/", client)
+        self.assertEqual(cold, warm)
+        self.assertGreater(warm, 1)
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class FieldFilterBackendTests(TestCase):
+    """filter_fields 선언 기반 필터: exact / 쉼표 __in / 범위, 형 변환, 잘못된 값은 400."""
+
+    @classmethod
+    def setUpTestData(cls):
+        brand = Brand.objects.create(name_en="Longines", name_ko="론진")
+        model = WatchModel.objects.create(brand=brand)
+        cls.v1 = WatchVariant.objects.create(watch_model=model, model_number="L3.781.4")
+        cls.v2 = WatchVariant.objects.create(watch_model=model, model_number="L2.793.4")
+        kr = Country.objects.create(name_kr="한국", name_en="Korea", iso2="KR", default_currency="KRW")
+        us = Country.objects.create(name_kr="미국", name_en="United States", iso2="US", default_currency="USD")
+        rows = [(cls.v1, kr, 2022, "2025-01-05"), (cls.v1, us, 2023, "2025-02-05"),
+                (cls.v2, kr, 2024, "2025-03-05"), (cls.v2, us, 2024, "2025-04-05")]
+        cls.ids = []
+        for variant, country, year, day in rows:
+            tx = WatchTransaction.objects.create(watch_variant=variant, country=country, year=year,
+                                                 transaction_type="sell", price=Decimal("1000"))
+            WatchTransaction.objects.filter(pk=tx.pk).update(
+                created_at=timezone.make_aware(datetime.datetime.fromisoformat(day)))
+            cls.ids.append(tx.pk)
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def _ids(self, query):
+        response = self.client.get(f"/api/transactions/?{query}")
+        self.assertEqual(response.status_code, 200, response.content)
+        return sorted(item["id"] for item in response.json()["results"])
+
+    def test_exact_and_in(self):
+        a, b, c, d = self.ids
+        self.assertEqual(self._ids(f"watch_variant={self.v1.pk}"), [a, b])
+        self.assertEqual(self._ids(f"watch_variant={self.v1.pk},{self.v2.pk}"), [a, b, c, d])
+        self.assertEqual(self._ids("country_iso2=us"), [b, d])         # upper 변환
+        self.assertEqual(self._ids("currency=krw,usd&year=2024"), [c, d])
+        self.assertEqual(self._ids("year="), [a, b, c, d])              # 빈 값은 무시
+
+    def test_ranges(self):
+        a, b, c, d = self.ids
+        self.assertEqual(self._ids("year__gte=2023&year__lt=2024"), [b])
+        self.assertEqual(self._ids("created_at__gte=2025-02-01&created_at__lte=2025-03-31"), [b, c])
+        self.assertEqual(self._ids("created_at__gt=2025-03-05T00:00:00%2B09:00"), [d])
+        # 범위를 허용하지 않는 필드의 __gte 는 무시
+        self.assertEqual(self._ids(f"watch_variant__gte={self.v2.pk}"), [a, b, c, d])
+
+    def test_invalid_values(self):
+        for query, param in (("year=abc", "year"), ("created_at__gte=2025-13-01", "created_at__gte"),
+                             ("price_krw__lte=NaN", "price_krw__lte"), ("watch_variant=1,x", "watch_variant")):
+            with self.subTest(query):
+                response = self.client.get(f"/api/transactions/?{query}")
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(param, response.json())
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class KeysetOrderingFilterTests(TestCase):
+    """?ordering=price_krw 등: NULL 행 제외, id 로 동점 정렬 고정, 커서 페이지네이션과 함께 중복/누락 없음."""
+
+    @classmethod
+    def setUpTestData(cls):
+        brand = Brand.objects.create(name_en="Hamilton", name_ko="해밀턴")
+        variant = WatchVariant.objects.create(watch_model=WatchModel.objects.create(brand=brand), model_number="H70455133")
+        kr = Country.objects.create(name_kr="한국", name_en="Korea", iso2="KR", default_currency="KRW")
+        for price in ("500000", "700000", "500000", "600000", "500000"):
+            WatchTransaction.objects.create(watch_variant=variant, country=kr, year=2024,
+                                            transaction_type="sell", price=Decimal(price))
+        WatchTransaction.objects.create(watch_variant=variant, country=kr, year=2024, transaction_type="buy",
+                                        price_min=Decimal("400000"), price_max=Decimal("450000"))
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def _walk(self, query):
+        items, url = [], f"/api/transactions/?{query}"
+        while url:
+            body = self.client.get(url).json()
+            items += body["results"]
+            url = body["next"]
+        return items
+
+    def test_ascending_with_id_tiebreak_across_pages(self):
+        items = self._walk("ordering=price_krw&page_size=2")
+        expected = list(WatchTransaction.objects.filter(transaction_type="sell")
+                        .order_by("price_krw", "id").values_list("id", flat=True))
+        self.assertEqual([i["id"] for i in items], expected)
+        self.assertEqual([i["price_krw"] for i in items][:3], ["500000.00"] * 3)
+
+    def test_descending(self):
+        items = self._walk("ordering=-price_krw&page_size=2")
+        expected = list(WatchTransaction.objects.filter(transaction_type="sell")
+                        .order_by("-price_krw", "-id").values_list("id", flat=True))
+        self.assertEqual([i["id"] for i in items], expected)
+
+    def test_buy_columns_only_return_buys(self):
+        items = self._walk("ordering=price_min_krw")
+        self.assertEqual([i["transaction_type"] for i in items], ["buy"])
+
+    def test_unknown_field_keeps_default_ordering(self):
+        items = self._walk("ordering=note")
+        expected = list(WatchTransaction.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+        self.assertEqual([i["id"] for i in items], expected)
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class SparseFieldsExpandTests(TestCase):
+    """?fields= 로 응답 필드 제한, ?expand= 로 관계 객체 인라인 (조인 한 번), 잘못된 이름은 400, 쓰기 요청에는 미적용."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.brand = Brand.objects.create(name_en="Nomos", name_ko="노모스")
+        cls.model = WatchModel.objects.create(brand=cls.brand, nickname="Tangente")
+        variant = WatchVariant.objects.create(watch_model=cls.model, model_number="139")
+        kr = Country.objects.create(name_kr="한국", name_en="Korea", iso2="KR", default_currency="KRW")
+        for i in range(3):
+            WatchTransaction.objects.create(watch_variant=variant, country=kr, year=2024,
+                                            transaction_type="sell", price=Decimal(2000000 + i))
+        cls.variant = variant
+        cls.operator = get_user_model().objects.create_user("operator", password="pw", role="operator")
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def _get(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json(), ctx.captured_queries
+
+    def test_fields(self):
+        body, queries = self._get("/api/transactions/?fields=id,price,year")
+        self.assertEqual([list(item) for item in body["results"]], [["id", "year", "price"]] * 3)
+        select = [q["sql"] for q in queries if "api_watchtransaction" in q["sql"] and "SELECT" in q["sql"]][-1]
+        self.assertNotIn("note", select)  # 요청하지 않은 컬럼은 읽지 않는다
+
+        single, _ = self._get(f"/api/watch-variants/{self.variant.pk}/?fields=model_number,brand")
+        self.assertEqual(single, {"model_number": "139", "brand": "Nomos"})
+
+    def test_expand_inlines_in_one_query(self):
+        body, queries = self._get("/api/transactions/?expand=watch_variant,country&fields=id,watch_variant,country")
+        item = body["results"][0]
+        self.assertEqual(set(item), {"id", "watch_variant", "country"})
+        self.assertEqual(item["watch_variant"]["model_number"], "139")
+        self.assertEqual(item["watch_variant"]["brand"], "Nomos")
+        self.assertEqual(item["country"]["iso2"], "KR")
+        with CaptureQueriesContext(connection) as fewer:
+            self.client.get("/api/transactions/?expand=watch_variant,country&fields=id&page_size=1")
+        self.assertEqual(len(queries), len(fewer.captured_queries))  # 행 수와 무관 (N+1 없음)
+
+        variants, _ = self._get("/api/watch-variants/?expand=brand,watch_model")
+        self.assertEqual(variants[0]["brand"]["name_en"], "Nomos")
+        self.assertEqual(variants[0]["watch_model"]["nickname"], "Tangente")
+
+    def test_unknown_names(self):
+        response = self.client.get("/api/transactions/?fields=id,nope&expand=vendor")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()), {"fields", "expand"})
+
+    def test_writes_ignore_sparse_params(self):
+        client = APIClient()
+        client.force_authenticate(self.operator)
+        response = client.post("/api/brands/?fields=id&expand=nope", {"name_en": "Sinn", "name_ko": "진"})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["name_en"], "Sinn")
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class RollupBackfillMigrationTests(TestCase):
+    """0020: 기존 거래로 일별 롤업을 채운다 (현지 날짜 버킷, 통화별 합계/최솟값/최댓값, KRW 환산)."""
+    migration = importlib.import_module("api.migrations.0020_backfill_watchtransactiondaily")
+
+    @classmethod
+    def setUpTestData(cls):
+        brand = Brand.objects.create(name_en="Cartier", name_ko="까르띠에")
+        cls.variant = WatchVariant.objects.create(watch_model=WatchModel.objects.create(brand=brand),
+                                                  model_number="WSTA0065")
+        cls.us = Country.objects.create(name_kr="미국", name_en="United States", iso2="US", default_currency="USD")
+        ExchangeRate.objects.create(base="USD", quote="KRW", date=datetime.date(2025, 1, 2), rate=Decimal("1400"))
+        reset_rate_engine()
+        rows = [
+            ("sell", {"price": Decimal("5000.10")}, "2025-01-31T16:00:00+00:00"),  # 서울 2월 1일 01시
+            ("sell", {"price": Decimal("5200.00")}, "2025-02-01T03:00:00+00:00"),
+            ("sell", {"price": Decimal("4900.00")}, "2025-01-31T14:00:00+00:00"),  # 서울 1월 31일
+            ("buy", {"price_min": Decimal("4000"), "price_max": Decimal("4500")}, "2025-02-01T03:00:00+00:00"),
+        ]
+        for ttype, prices, created in rows:
+            tx = WatchTransaction.objects.create(watch_variant=cls.variant, country=cls.us, year=2024,
+                                                 transaction_type=ttype, **prices)
+            WatchTransaction.objects.filter(pk=tx.pk).update(created_at=datetime.datetime.fromisoformat(created))
+
+    def setUp(self):
+        reset_rate_engine()
+
+    def _bucket(self, ttype, day):
+        return WatchTransactionDaily.objects.get(watch_variant=self.variant, country=self.us,
+                                                 transaction_type=ttype, day=day)
+
+    def test_backfill_builds_daily_rows(self):
+        WatchTransactionDaily.objects.all().delete()
+        self.migration.backfill_rollups(django_apps, None)
+
+        self.assertEqual(WatchTransactionDaily.objects.count(), 3)
+        sell = self._bucket("sell", datetime.date(2025, 2, 1))
+        self.assertEqual((sell.count, sell.currency, sell.sum_low, sell.min_low, sell.max_high),
+                         (2, "USD", Decimal("10200.10"), Decimal("5000.10"), Decimal("5200.00")))
+        self.assertEqual((sell.quote, sell.quote_rate, sell.quote_sum_low), ("KRW", Decimal("1400"), Decimal("14280140.00")))
+        self.assertEqual(self._bucket("sell", datetime.date(2025, 1, 31)).count, 1)
+        buy = self._bucket("buy", datetime.date(2025, 2, 1))
+        self.assertEqual((buy.min_low, buy.max_high, buy.quote_max_high),
+                         (Decimal("4000.00"), Decimal("4500.00"), Decimal("6300000.00")))
+
+    def test_replaces_stale_rows(self):
+        # 저장 시 갱신된 버킷(created_at 을 바꾸기 전의 날짜)은 지워지고 실제 거래일 버킷만 남는다
+        self.assertTrue(WatchTransactionDaily.objects.exclude(day__lte=datetime.date(2025, 2, 1)).exists())
+        self.migration.backfill_rollups(django_apps, None)
+        self.assertEqual(sorted(WatchTransactionDaily.objects.values_list("day", flat=True)),
+                         [datetime.date(2025, 1, 31), datetime.date(2025, 2, 1), datetime.date(2025, 2, 1)])
+
+    def test_empty_database_is_a_no_op(self):
+        WatchTransaction.objects.all().delete()
+        with mock.patch("api.services.rollup.rebuild") as rebuild:
+            self.migration.backfill_rollups(django_apps, None)
+        rebuild.assert_not_called()
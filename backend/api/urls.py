@@ -2,7 +2,8 @@ from django.urls import path, include
 from .views import RegisterView, LoginView, RefreshView, LogoutView, MeView, ProtectedSampleView , DealerOnlyView , OperatorOnlyView
 from .views_watches import (
     BrandViewSet, WatchModelViewSet, VendorViewSet, WatchVariantViewSet,
-    WatchPriceViewSet, CountryViewSet, WatchTransactionViewSet, ExchangeRateViewSet
+    WatchPriceViewSet, CountryViewSet, WatchTransactionViewSet, ExchangeRateViewSet,
+    CatalogTreeView,
 )
 from rest_framework.routers import DefaultRouter
 router = DefaultRouter()
@@ -25,5 +26,6 @@ urlpatterns = [
     path("sample/protected/", ProtectedSampleView.as_view()),  # 접근제어 예시
     path("dealer/only/", DealerOnlyView.as_view()),
     path("operator/only/", OperatorOnlyView.as_view()),
+    path("catalog/tree/", CatalogTreeView.as_view()),
     path("", include(router.urls)),
 ]
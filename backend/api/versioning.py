@@ -0,0 +1,47 @@
+# api/versioning.py
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from api.models import ModelVersion
+
+
+def label_of(model) -> str:
+    return model._meta.label_lower
+
+
+def bump(model) -> None:
+    """모델 버전 +1 (행이 없으면 생성). 워커가 여러 개여도 DB 에서 원자적으로 증가."""
+    bump_label(label_of(model))
+
+
+def bump_label(label: str) -> None:
+    now = timezone.now()
+    if ModelVersion.objects.filter(label=label).update(version=F("version") + 1, updated_at=now):
+        return
+    try:
+        with transaction.atomic():
+            ModelVersion.objects.create(label=label, version=1, updated_at=now)
+    except IntegrityError:
+        # 동시에 다른 워커가 먼저 만든 경우
+        ModelVersion.objects.filter(label=label).update(version=F("version") + 1, updated_at=now)
+
+
+def get_versions(*models) -> dict[str, tuple[int, object]]:
+    """{label: (version, updated_at)} — 한 번의 작은 조회."""
+    return get_label_versions(*(label_of(m) for m in models))
+
+
+def get_label_versions(*labels) -> dict[str, tuple[int, object]]:
+    found = {
+        label: (version, updated_at)
+        for label, version, updated_at in ModelVersion.objects.filter(label__in=labels)
+        .values_list("label", "version", "updated_at")
+    }
+    return {label: found.get(label, (0, None)) for label in labels}
+
+
+def stamp(*models) -> str:
+    """모델 순서대로 버전을 이어 붙인 문자열 (예: "3.12.40")."""
+    versions = get_versions(*models)
+    return ".".join(str(versions[label_of(m)][0]) for m in models)
@@ -1,11 +1,33 @@
+from decimal import Decimal
+
 from django.core.cache import cache
-from django.db.models import QuerySet
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework import viewsets, filters
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
-from .permissions import IsOperatorOrReadOnly
+from rest_framework.permissions import AllowAny
+from rest_framework.views import APIView
+from .conditional import ConditionalGetMixin, etag_matches
+from .exports import StreamingExportMixin
+from .filters import FieldFilterBackend, KeysetOrderingFilter
+from .pagination import TransactionPagination, WatchPricePagination, ExchangeRatePagination
+from .permissions import IsOperator, IsOperatorOrReadOnly
+from .services.asof import CONVERT_AT, AsOfRates
+from .fastread import FastListMixin
+from .response_cache import ResponseCacheMixin, response_cache
+from .sparse import SparseFieldsMixin
+from .services.catalog import CATALOG_MODELS, build_tree
+from .services.exchange import batch_providers, fetch_cache, series_providers
+from .services.fx_engine import rate_engine
+from .services import money, normalize
+from .services.market import variant_market_summary
+from .services.history import BUCKETS, price_history
+from .services.importer import FORMATS, TransactionImporter, detect_format, iter_records, open_text
+from . import versioning
 from .serializers import (
     BrandSerializer, WatchModelSerializer, VendorSerializer,
     WatchVariantSerializer, WatchPriceSerializer, CountrySerializer,
@@ -16,67 +38,198 @@ from api.models import (
     Country, WatchTransaction, ExchangeRate
 )
 
-class BaseReadWrite(viewsets.ModelViewSet):
+class BaseReadWrite(SparseFieldsMixin, ConditionalGetMixin, ResponseCacheMixin, FastListMixin, viewsets.ModelViewSet):
     permission_classes = [IsOperatorOrReadOnly]
     parser_classes = [MultiPartParser, FormParser, JSONParser]
-    filter_backends = [filters.SearchFilter]
+    filter_backends = [FieldFilterBackend, filters.SearchFilter]
     search_fields = ["^id"]  # 각 ViewSet에서 확장
+    filter_fields = {}       # 필드 필터 (api/filters.py 참고)
+    version_models = ()      # ETag/Last-Modified·익명 응답 캐시 키 대상 (응답에 영향을 주는 모델 전부, 펼침 포함)
+    fast_list = False        # True: 목록을 values() 행 + RowSerializer 로 직렬화 (api/fastread.py)
 
 class BrandViewSet(BaseReadWrite):
     queryset = Brand.objects.all().order_by("id")
     serializer_class = BrandSerializer
+    version_models = (Brand,)
     search_fields = ["name_en", "name_ko"]
 
 class WatchModelViewSet(BaseReadWrite):
     queryset = WatchModel.objects.all().order_by("id")
     serializer_class = WatchModelSerializer
+    version_models = (WatchModel, Brand)  # brand_name
     search_fields = ["brand__name_en","nickname"]
+    filter_fields = {
+        "brand": ("brand_id", "int", False),
+    }
 
 class VendorViewSet(BaseReadWrite):
     queryset = Vendor.objects.all().order_by("name")
     serializer_class = VendorSerializer
+    version_models = (Vendor,)
     search_fields = ["name"]
 
 class WatchVariantViewSet(BaseReadWrite):
     queryset = WatchVariant.objects.select_related("watch_model","watch_model__brand").all().order_by("watch_model__brand__name_en","model_number")
     serializer_class = WatchVariantSerializer
+    fast_list = True
+    version_models = (WatchVariant, WatchModel, Brand)  # brand, model_nickname
     search_fields = ["watch_model__brand__name_en","watch_model__nickname","model_number","color"]
+    filter_fields = {
+        "watch_model": ("watch_model_id", "int", False),
+        "brand":       ("watch_model__brand_id", "int", False),
+        "model_number": ("model_number", "str", False),
+    }
+
+    @action(detail=True, methods=["get"], url_path="market")
+    def market(self, request, pk=None):
+        """
+        변형별 시세 요약 (판매/매입, 전체·국가별·연식별).
+        GET /api/watch-variants/{id}/market/?convert=KRW&convert_at=latest|transaction
+        """
+        variant = self.get_object()
+        convert = (request.query_params.get("convert") or "KRW").upper().strip()
+        at = (request.query_params.get("convert_at") or "latest").lower()
+        if at not in CONVERT_AT:
+            return Response({"convert_at": "latest 또는 transaction 만 지원합니다."}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(variant_market_summary(variant.id, convert, at=at))
+
+    @action(detail=True, methods=["get"], url_path="history")
+    def history(self, request, pk=None):
+        """
+        변형별 버킷 시세 시계열.
+        GET /api/watch-variants/{id}/history/?bucket=day|week|month&convert=KRW&type=sell&convert_at=transaction|latest
+        (bucket=day 는 일별 롤업 테이블에서 읽어 중앙값 대신 평균)
+        """
+        variant = self.get_object()
+        return self._history_response(request, [variant.id])
 
-class WatchPriceViewSet(BaseReadWrite):
-    queryset = WatchPrice.objects.select_related("watch_variant","vendor").all().order_by("-year")
+    @action(detail=False, methods=["get"], url_path="history")
+    def history_many(self, request):
+        """
+        여러 변형 / 모델 전체의 시계열을 한 번에.
+        GET /api/watch-variants/history/?watch_variant=1,2,3 (또는 ?watch_model=5) [&split=variant]
+        """
+        params = request.query_params
+        qs = self.filter_queryset(self.get_queryset())
+        raw_ids = params.get("watch_variant")
+        if raw_ids:
+            try:
+                qs = qs.filter(id__in=[int(x) for x in raw_ids.split(",") if x.strip()])
+            except ValueError:
+                return Response({"watch_variant": "잘못된 값입니다."}, status=status.HTTP_400_BAD_REQUEST)
+        elif not (params.get("watch_model") or params.get("brand")):
+            return Response({"detail": "watch_variant 또는 watch_model 파라미터가 필요합니다."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        ids = list(qs.values_list("id", flat=True))
+        return self._history_response(request, ids)
+
+    def _history_response(self, request, variant_ids):
+        params = request.query_params
+        bucket = (params.get("bucket") or "month").lower()
+        ttype = (params.get("type") or "sell").lower()
+        if bucket not in BUCKETS:
+            return Response({"bucket": "day, week, month 만 지원합니다."}, status=status.HTTP_400_BAD_REQUEST)
+        if ttype not in ("sell", "buy"):
+            return Response({"type": "sell 또는 buy 만 지원합니다."}, status=status.HTTP_400_BAD_REQUEST)
+        at = (params.get("convert_at") or "transaction").lower()
+        if at not in CONVERT_AT:
+            return Response({"convert_at": "latest 또는 transaction 만 지원합니다."}, status=status.HTTP_400_BAD_REQUEST)
+        convert = (params.get("convert") or "KRW").upper().strip()
+        split = (params.get("split") or "").lower() == "variant"
+        return Response(price_history(variant_ids, convert, bucket=bucket, ttype=ttype, split=split, at=at))
+
+class WatchPriceViewSet(StreamingExportMixin, BaseReadWrite):
+    queryset = WatchPrice.objects.select_related("watch_variant","vendor").all().order_by("-created_at", "-id")
     serializer_class = WatchPriceSerializer
+    fast_list = True
+    version_models = (WatchPrice, WatchVariant, WatchModel, Brand, Vendor)  # ?expand= 포함
+    columnar_dictionary = ("watch_variant", "vendor", "year")  # ?format=columnar 사전 인코딩 열
+    pagination_class = WatchPricePagination
     search_fields = ["vendor__name","watch_variant__model_number"]
+    filter_fields = {
+        "watch_variant": ("watch_variant_id", "int", False),
+        "watch_model":   ("watch_variant__watch_model_id", "int", False),
+        "brand":         ("watch_variant__watch_model__brand_id", "int", False),
+        "vendor":        ("vendor_id", "int", False),
+        "year":          ("year", "int", True),
+        "created_at":    ("created_at", "datetime", True),
+    }
 
 class CountryViewSet(BaseReadWrite):
     queryset = Country.objects.all().order_by("name_en")
     serializer_class = CountrySerializer
+    version_models = (Country,)
     search_fields = ["name_en","name_kr","iso2","default_currency"]
 
-class WatchTransactionViewSet(BaseReadWrite):
+class WatchTransactionViewSet(StreamingExportMixin, BaseReadWrite):
     queryset = WatchTransaction.objects.select_related(
         "watch_variant", "watch_variant__watch_model",
         "watch_variant__watch_model__brand", "country"
-    ).all().order_by("-created_at")
+    ).all().order_by("-created_at", "-id")
     serializer_class = WatchTransactionSerializer
+    fast_list = True
+    # 정규화/환산 컬럼은 환율(ExchangeRate 버전)에, ?expand= 는 변형/모델/브랜드/국가에 의존
+    version_models = (WatchTransaction, ExchangeRate, WatchVariant, WatchModel, Brand, Country)
+    # ?format=columnar 사전 인코딩 열 (반복 값)
+    columnar_dictionary = ("watch_variant", "country", "currency", "transaction_type", "year",
+                           "krw_rate", "krw_rate_date", "convert_quote", "applied_rate")
+    pagination_class = TransactionPagination
     search_fields = ["watch_variant__model_number","country__name_en","country__iso2","transaction_type","year"]
+    filter_backends = [*BaseReadWrite.filter_backends, KeysetOrderingFilter]
+    # ?ordering=price_krw (판매 최저가순), -price_krw, price_min_krw (매입) … 커서 페이지네이션 유지
+    ordering_fields = ["created_at", "price_krw", "price_min_krw", "price_max_krw"]
+    filter_fields = {
+        "watch_variant":    ("watch_variant_id", "int", False),
+        "watch_model":      ("watch_variant__watch_model_id", "int", False),
+        "brand":            ("watch_variant__watch_model__brand_id", "int", False),
+        "country":          ("country_id", "int", False),
+        "country_iso2":     ("country__iso2", "upper", False),
+        "currency":         ("currency", "upper", False),
+        "transaction_type": ("transaction_type", "str", False),
+        "year":             ("year", "int", True),
+        "created_at":       ("created_at", "datetime", True),
+        "price_krw":        ("price_krw", "decimal", True),
+        "price_min_krw":    ("price_min_krw", "decimal", True),
+        "price_max_krw":    ("price_max_krw", "decimal", True),
+    }
+
+    # ?fields= 와 함께 ?convert= 를 쓰면 환산 입력 필드도 함께 읽고, 응답에서는 요청한 필드만 남긴다
+    CONVERT_INPUTS = ("currency", "transaction_type", "price", "price_min", "price_max", "created_at",
+                      "price_krw", "price_min_krw", "price_max_krw", "krw_rate")
+    # ?convert= 가 덧붙이는 필드 (?fields= 로 고를 수 있음)
+    CONVERTED_FIELDS = ("price_converted", "price_min_converted", "price_max_converted",
+                        "convert_quote", "applied_rate")
+
+    def get_sparse_fields(self, fields):
+        if (self.request.query_params.get("convert") or "").strip():
+            return list(dict.fromkeys([*fields, *self.CONVERT_INPUTS]))
+        return fields
+
+    def get_extra_sparse_fields(self):
+        return list(self.CONVERTED_FIELDS) if (self.request.query_params.get("convert") or "").strip() else []
 
     def list(self, request, *args, **kwargs):
         convert = (request.query_params.get("convert") or "").upper().strip()
-        response = super().list(request, *args, **kwargs)  # DRF가 페이지네이션+직렬화 처리
-        # convert 없으면 그대로 반환
-        if not convert:
+        convert_at = self._convert_at(request)
+        response = super().list(request, *args, **kwargs)  # DRF가 페이지네이션(커서)+직렬화 처리
+        # convert 없거나 내보내기(스트리밍, 자체 환산)면 그대로 반환
+        if not convert or response.streaming:
             return response
 
         # response.data 구조가 {'count':..., 'results':[...]} 또는 리스트인 케이스 모두 지원
         if isinstance(response.data, dict) and "results" in response.data:
             items = response.data["results"]
-            paginated = True
         elif isinstance(response.data, list):
             items = response.data
-            paginated = False
         else:
             return response  # 예외적 포맷
 
+        self._convert_items(items, convert, convert_at)
+        for it in items:
+            self.trim_to_requested(it)
+        return response
+
+    def _convert_items(self, items, convert, convert_at):
         # 1) 페이지에 있는 통화 목록 수집
         currencies = set()
         for it in items:
@@ -86,105 +239,207 @@ class WatchTransactionViewSet(BaseReadWrite):
 
         if not currencies:
             # 이미 모두 convert 통화이거나 금액 없음
-            return response
+            return
 
-        # 2) 최신 환율 맵 로드 (cache 5분)
-        rates_map = self._get_latest_rates_map(bases=currencies, quote=convert)
+        # KRW 최신 환율 환산은 저장된 정규화 컬럼을 그대로 사용 (행별 Decimal 계산 없음)
+        if self._use_normalized(convert, convert_at):
+            for it in items:
+                self._apply_normalized(it)
+            return
+
+        # 2) 환율 조회기 (latest: 환율 엔진 / transaction: 페이지 통화들의 이력을 한 번에 읽어 이진 탐색)
+        rate_for = self._rate_resolver(currencies, convert, convert_at)
 
-        # 3) 항목별로 KRW 환산 필드 주입
+        # 3) 항목별로 환산 필드 주입
         for it in items:
-            base_ccy = (it.get("currency") or "").upper()
-            rate = rates_map.get(base_ccy) if base_ccy != convert else 1
-            # 판매
-            if it.get("transaction_type") == "sell":
-                price = it.get("price")
-                it["price_converted"] = self._mul(price, rate) if rate and price is not None else None
-            # 매입
+            self._apply_rate(it, rate_for(it), convert)
+
+    # ---- export (?format=csv|ndjson) ----
+    def get_export_header(self, request, fields):
+        header = list(fields)
+        if (request.query_params.get("convert") or "").strip():
+            header += list(self.CONVERTED_FIELDS)
+        requested = self.requested_fields()
+        if requested is not None:  # 환산 입력으로만 읽은 열은 내보내지 않는다
+            header = [name for name in header if name in requested]
+        return header
+
+    def export_rows(self, request, queryset, fields):
+        convert = (request.query_params.get("convert") or "").upper().strip()
+        convert_at = self._convert_at(request)
+        rows = super().export_rows(request, queryset, fields)
+        if not convert:
+            return rows
+        if self._use_normalized(convert, convert_at):
+            return (self._apply_normalized(it) or it for it in rows)
+        # 내보낼 통화 목록은 DISTINCT 한 번으로 미리 구해 환율 조회기를 만든다
+        currencies = set(queryset.order_by().values_list("currency", flat=True).distinct()) - {convert}
+        return self._convert_rows(rows, self._rate_resolver(currencies, convert, convert_at), convert)
+
+    def _convert_rows(self, rows, rate_for, convert):
+        for it in rows:
+            self._apply_rate(it, rate_for(it), convert)
+            yield it
+
+    @action(detail=False, methods=["post"], url_path="bulk",
+            permission_classes=[IsOperator], parser_classes=[MultiPartParser])
+    def bulk(self, request):
+        """
+        운영자 전용 대량 적재.
+        POST /api/transactions/bulk/  (multipart: file=<csv|jsonl>, input_format=csv|jsonl 선택)
+        컬럼: model_number(또는 watch_variant), country(iso2), transaction_type, year,
+              price | price_min,price_max, note, url
+        """
+        upload = request.FILES.get("file")
+        if not upload:
+            return Response({"file": "파일이 필요합니다."}, status=status.HTTP_400_BAD_REQUEST)
+        fmt = (request.data.get("input_format") or detect_format(upload.name)).lower()
+        if fmt not in FORMATS:
+            return Response({"input_format": "csv 또는 jsonl 만 지원합니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+        result = TransactionImporter().run(iter_records(open_text(upload.file), fmt))
+        code = status.HTTP_201_CREATED if result.created else status.HTTP_400_BAD_REQUEST
+        return Response(result.as_dict(), status=code)
+
+    def create(self, request, *args, **kwargs):
+        # 배열 본문이면 여러 건을 한 번에 생성 (항목별 결과)
+        if isinstance(request.data, list):
+            return self._create_many(request.data)
+        return super().create(request, *args, **kwargs)
+
+    def _create_many(self, items):
+        """
+        POST /api/transactions/  [{...}, {...}, ...]  (최대 WatchTransactionListSerializer.max_items 건)
+        유효한 항목은 트랜잭션 하나에서 bulk_create (KRW 정규화/롤업 포함, TransactionImporter.insert),
+        잘못된 항목은 건너뛰고 결과에 오류로 보고한다.
+        bulk_create 가 pk 를 돌려주지 않는 DB(MySQL)에서는 같은 트랜잭션에서 자연 키로 id 를 다시 읽는다 (조회 1회).
+        → {"created", "failed", "results": [{"index", "status", "data" | "errors"}]}
+        """
+        serializer = self.get_serializer(data=items, many=True)
+        checked = serializer.validate_items(items)
+        TransactionImporter().insert([obj for obj, _ in checked if obj is not None], need_pks=True)
+
+        results = []
+        for index, (obj, errors) in enumerate(checked):
+            if errors:
+                results.append({"index": index, "status": status.HTTP_400_BAD_REQUEST, "errors": errors})
             else:
-                pmin = it.get("price_min")
-                pmax = it.get("price_max")
-                it["price_min_converted"] = self._mul(pmin, rate) if rate and pmin is not None else None
-                it["price_max_converted"] = self._mul(pmax, rate) if rate and pmax is not None else None
-
-            it["convert_quote"] = convert
-            it["applied_rate"] = float(rate) if rate else None  # 디버그/감사용(선택)
-
-        return response
+                results.append({"index": index, "status": status.HTTP_201_CREATED,
+                                "data": serializer.child.to_representation(obj)})
+        created = sum(1 for _, errors in checked if not errors)
+        code = status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST
+        return Response({"created": created, "failed": len(checked) - created, "results": results}, status=code)
 
     def retrieve(self, request, *args, **kwargs):
         convert = (request.query_params.get("convert") or "").upper().strip()
+        convert_at = self._convert_at(request)
         response = super().retrieve(request, *args, **kwargs)
         if not convert:
             return response
 
         it = response.data
         base_ccy = (it.get("currency") or "").upper()
-        if base_ccy == convert:
-            rate = 1
-        else:
-            rates_map = self._get_latest_rates_map(bases={base_ccy}, quote=convert)
-            rate = rates_map.get(base_ccy)
+        rate = self._rate_resolver({base_ccy} - {convert}, convert, convert_at)(it)
 
         if rate:
-            if it.get("transaction_type") == "sell":
-                price = it.get("price")
-                it["price_converted"] = self._mul(price, rate) if price is not None else None
-            else:
-                pmin = it.get("price_min")
-                pmax = it.get("price_max")
-                it["price_min_converted"] = self._mul(pmin, rate) if pmin is not None else None
-                it["price_max_converted"] = self._mul(pmax, rate) if pmax is not None else None
-
-            it["convert_quote"] = convert
-            it["applied_rate"] = float(rate)
+            self._apply_rate(it, rate, convert)
+        self.trim_to_requested(it)
 
         return response
 
     # ---- helpers ----
-    def _get_latest_rates_map(self, bases: set[str], quote: str, ttl_seconds: int = 300) -> dict[str, float]:
-        """
-        bases에 포함된 base 통화들에 대해, quote 기준 최신 1건의 rate를 맵으로 반환.
-        DB 한 번 조회(order_by base,-date,-id) 후 파이썬에서 base별 첫 레코드만 채택.
-        """
-        if not bases:
-            return {}
-
-        cache_key = f"latest_rates:{quote}:{','.join(sorted(bases))}"
-        cached = cache.get(cache_key)
-        if cached is not None:
-            return cached
-
-        qs = (
-            ExchangeRate.objects
-            .filter(quote=quote, base__in=bases)
-            .order_by("base", "-date", "-id")
-            .values("base", "rate")
-        )
-        rates_map: dict[str, float] = {}
-        for row in qs:
-            b = row["base"].upper()
-            if b not in rates_map:
-                # base가 바뀔 때 첫 번째(=가장 최신)만 채택
-                rates_map[b] = float(row["rate"])
-
-        cache.set(cache_key, rates_map, ttl_seconds)
-        return rates_map
+    def _apply_rate(self, it, rate, convert):
+        # 금액/환율을 정수 최소단위·고정소수점으로 바꿔 정수 연산으로 환산 (api/services/money.py)
+        rate_int = money.rate_to_int(rate) if rate else None
+
+        def conv(value):
+            return money.format_minor(money.convert_minor(money.to_minor(value), rate_int))
+
+        # 판매
+        if it.get("transaction_type") == "sell":
+            it["price_converted"] = conv(it.get("price"))
+        # 매입
+        else:
+            it["price_min_converted"] = conv(it.get("price_min"))
+            it["price_max_converted"] = conv(it.get("price_max"))
+
+        it["convert_quote"] = convert
+        it["applied_rate"] = money.format_rate(rate) if rate else None  # 디버그/감사용(선택), 소수 8자리 문자열
+
+    def _get_latest_rates_map(self, bases: set[str], quote: str) -> dict[str, Decimal]:
+        # 환산에는 float 가 아닌 정확한 Decimal 환율(소수 8자리)을 쓴다
+        return rate_engine.rates_map(bases, quote)
+
+    @staticmethod
+    def _use_normalized(convert, convert_at) -> bool:
+        return convert == normalize.QUOTE and convert_at == "latest"
 
     @staticmethod
-    def _mul(value, rate):
-        # value, rate를 안전하게 곱해 소수 2자리로 반올림
-        from decimal import Decimal, ROUND_HALF_UP, InvalidOperation
-        try:
-            v = Decimal(str(value))
-            r = Decimal(str(rate))
-            return str((v * r).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
-        except (InvalidOperation, TypeError):
-            return None
+    def _apply_normalized(it):
+        if it.get("transaction_type") == "sell":
+            it["price_converted"] = it.get("price_krw")
+        else:
+            it["price_min_converted"] = it.get("price_min_krw")
+            it["price_max_converted"] = it.get("price_max_krw")
+        rate = it.get("krw_rate")
+        it["convert_quote"] = normalize.QUOTE
+        it["applied_rate"] = money.format_rate(rate)
+
+    @staticmethod
+    def _convert_at(request) -> str:
+        convert_at = (request.query_params.get("convert_at") or "latest").lower().strip()
+        if convert_at not in CONVERT_AT:
+            raise ValidationError({"convert_at": "latest 또는 transaction 만 지원합니다."})
+        return convert_at
+
+    def _rate_resolver(self, currencies, convert, convert_at):
+        """항목(dict) → 적용 환율 함수. transaction 이면 거래일(created_at 현지 날짜) 기준 as-of 환율."""
+        if convert_at == "transaction":
+            asof = AsOfRates(convert, currencies)  # 통화 이력을 한 번에 조회
+            return lambda it: asof.rate(it.get("currency"), self._item_day(it))
+
+        rates_map = self._get_latest_rates_map(bases=currencies, quote=convert)
+
+        def latest(it):
+            base_ccy = (it.get("currency") or "").upper()
+            return Decimal(1) if base_ccy == convert else rates_map.get(base_ccy)
+        return latest
+
+    @staticmethod
+    def _item_day(it):
+        created_at = it.get("created_at")
+        if isinstance(created_at, str):
+            created_at = parse_datetime(created_at)
+        return timezone.localdate(created_at) if created_at else None
 
 class ExchangeRateViewSet(BaseReadWrite):
     queryset = ExchangeRate.objects.all()
     serializer_class = ExchangeRateSerializer
+    version_models = (ExchangeRate,)  # notify_rates_changed 가 올림 (bulk upsert 포함)
+    pagination_class = ExchangeRatePagination
     search_fields = ["base","quote"]
+    filter_fields = {
+        "base":  ("base", "upper", False),
+        "quote": ("quote", "upper", False),
+        "date":  ("date", "date", True),
+    }
+
+    @action(detail=False, methods=["get"], url_path="cache-stats", permission_classes=[IsOperator])
+    def cache_stats(self, request):
+        """운영자용: 2단 캐시 적중/미스 카운터 (이 워커 기준) — 환율 수집 결과(single-flight), 익명 응답 캐시."""
+        return Response({"fx_fetch": fetch_cache.stats(), "response": response_cache.stats()})
+
+    @action(detail=False, methods=["get"], url_path="provider-stats", permission_classes=[IsOperator])
+    def provider_stats(self, request):
+        """운영자용: 환율 프로바이더별 호출/오류율/지연/서킷 상태 (이 워커 기준) + 현재 호출 순서."""
+        return Response({
+            "order": {
+                "batch": [name for name, _ in batch_providers.ordered()],
+                "series": [name for name, _ in series_providers.ordered()],
+            },
+            # 일괄/기간은 같은 이름의 프로바이더 상태를 공유
+            "providers": {**batch_providers.stats(), **series_providers.stats()},
+        })
 
     @action(detail=False, methods=["get"], url_path="latest")
     def latest(self, request):
@@ -196,17 +451,31 @@ class ExchangeRateViewSet(BaseReadWrite):
         quote = (request.query_params.get("quote") or "KRW").upper()
         bases = [b.upper() for b in request.query_params.getlist("base") if b]
 
-        qs = ExchangeRate.objects.filter(quote=quote)
-        if bases:
-            qs = qs.filter(base__in=bases)
-
-        # base 오름차순, date/id 내림차순 → 파이썬에서 base별 첫 레코드만 채택 = 최신
-        qs = qs.order_by("base", "-date", "-id").values("base", "rate")
-
-        rates = {}
-        for row in qs:
-            b = row["base"].upper()
-            if b not in rates:
-                rates[b] = str(row["rate"])  # 문자열로 반환(소수/정밀도 보존)
-
-        return Response({"quote": quote, "rates": rates})
+        # 환율 엔진의 최신 행렬에서 O(1) 조회. 저장되지 않은 쌍은 역수/피벗 경유로 유도 → derived 에 표시
+        rates, derived = rate_engine.latest(quote, bases or None)
+        return Response({"quote": quote, "rates": rates, "derived": derived})
+
+
+class CatalogTreeView(APIView):
+    """
+    브랜드 → 모델 → 변형 전체 트리를 한 번에.
+    GET /api/catalog/tree/
+    - ETag = Brand/WatchModel/WatchVariant 버전 스탬프 → If-None-Match 일치 시 304 (트리 조회 없음)
+    - 트리는 버전 스탬프를 키로 캐시 → 세 모델 중 하나라도 저장/삭제되면 자동으로 새 키
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        version = versioning.stamp(*CATALOG_MODELS)
+        etag = f'"catalog-{version}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if etag_matches(etag, request.headers.get("If-None-Match")):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        cache_key = f"catalog_tree:{version}"
+        tree = cache.get(cache_key)
+        if tree is None:
+            tree = build_tree()
+            cache.set(cache_key, tree, None)
+        return Response({"version": version, "brands": tree}, headers=headers)
@@ -1,6 +1,7 @@
 # settings.py (배포용 안전 설정)
 
 import os
+import tempfile
 from pathlib import Path
 from datetime import timedelta
 from dotenv import load_dotenv
@@ -46,6 +47,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "api.middleware.CompressionMiddleware",  # /api/ 응답 gzip/brotli (정적 파일은 whitenoise)
     "corsheaders.middleware.CorsMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",  # 기본은 주석
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -127,8 +129,18 @@ REST_FRAMEWORK = {
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.AllowAny",),
+    "DEFAULT_RENDERER_CLASSES": (
+        "api.renderers.FastJSONRenderer",  # orjson
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
 }
 
+# API 응답 압축 (api/middleware.py): 이 크기(바이트) 이상인 JSON/CSV 응답만, brotli 는 설치된 경우에만 협상
+API_COMPRESS_PATHS = ("/api/",)
+API_COMPRESS_EXCLUDE_PATHS = ("/api/auth/",)  # 토큰 응답 (압축 길이로 비밀값 추측: BREACH)
+API_COMPRESS_MIN_BYTES = int(os.getenv("API_COMPRESS_MIN_BYTES", "1024"))
+API_COMPRESS_BROTLI_QUALITY = int(os.getenv("API_COMPRESS_BROTLI_QUALITY", "5"))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=15),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=14),
@@ -152,6 +164,49 @@ CSRF_COOKIE_SECURE = not DEBUG
 CSRF_COOKIE_SAMESITE = "None" if not DEBUG else "Lax"
 SESSION_COOKIE_SAMESITE = "None" if not DEBUG else "Lax"
 
+# ── 캐시 ────────────────────────────────────────────────────────────────────
+# default: 프로세스 로컬 / shared: 워커 간 공유 (api/cache.py TwoTierCache 의 2차 캐시)
+# 운영에서는 SHARED_CACHE_BACKEND=django.core.cache.backends.redis.RedisCache,
+# SHARED_CACHE_LOCATION=redis://127.0.0.1:6379/1 처럼 지정 (미지정이면 파일 캐시, manage.py check --deploy 가 경고)
+# 파일/로컬 메모리 캐시는 개발·테스트 전용: 파일 캐시 add() 는 프로세스 간 원자적이지 않아
+# 단일 실행(single-flight) 락이 깨지고, 로컬 메모리는 워커 간에 공유되지 않는다 (api/checks.py).
+SHARED_CACHE_BACKEND = os.getenv("SHARED_CACHE_BACKEND") or "django.core.cache.backends.filebased.FileBasedCache"
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "shared": {
+        "BACKEND": SHARED_CACHE_BACKEND,
+        "LOCATION": os.getenv("SHARED_CACHE_LOCATION", os.path.join(tempfile.gettempdir(), "watchdealer_cache")),
+    },
+}
+
+# 익명 GET 목록/단건 응답 캐시 (api/response_cache.py): 키에 모델 버전이 들어가므로 TTL 은 정리용
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "True").lower() == "true"
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "600"))
+
+# ── 시세 집계 ────────────────────────────────────────────────────────────────
+# 거래 일별 롤업(WatchTransactionDaily)의 정규화 통화
+ROLLUP_QUOTE = os.getenv("ROLLUP_QUOTE", "KRW")
+
+# 환율 엔진(api/services/fx_engine.py): 직접 환율이 없을 때 경유할 피벗 통화 (앞쪽 우선)
+FX_PIVOTS = os.getenv("FX_PIVOTS", "USD,KRW,EUR").split(",")
+
+# 환율 수집(manage.py fetch_rates): 프로바이더 주소 (로컬 스텁 서버로 바꿔 오프라인 테스트 가능)
+FX_PROVIDER_URLS = {
+    "exchangerate.host": os.getenv("FX_EXCHANGERATE_HOST_URL", "https://api.exchangerate.host"),
+    "frankfurter.app": os.getenv("FX_FRANKFURTER_URL", "https://api.frankfurter.app"),
+    "open.er-api.com": os.getenv("FX_ERAPI_URL", "https://open.er-api.com/v6"),
+}
+# 한 번의 호출로 모든 통화를 받아 교차 환율(quote/base)을 계산할 기준 통화
+FX_FETCH_ANCHOR = os.getenv("FX_FETCH_ANCHOR", "USD")
+# 동시 호출 스레드 수 (= HTTP 커넥션 풀 크기)
+FX_FETCH_WORKERS = int(os.getenv("FX_FETCH_WORKERS", "4"))
+# 프로바이더 서킷 브레이커: 연속 실패 N회면 차단, 초 후 시험 호출 / 첫 요청이 초 이상 걸리면 다음 프로바이더에 헤지 요청 (0=끔)
+FX_BREAKER_THRESHOLD = int(os.getenv("FX_BREAKER_THRESHOLD", "3"))
+FX_BREAKER_RESET = float(os.getenv("FX_BREAKER_RESET", "30"))
+FX_HEDGE_AFTER = float(os.getenv("FX_HEDGE_AFTER", "0"))
+
 # ── 비번 검증 ────────────────────────────────────────────────────────────────
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},